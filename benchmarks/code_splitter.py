@@ -0,0 +1,137 @@
+"""Benchmark CodeSplitter and DocumentChunker on a synthetic source tree.
+
+Usage: poetry run python benchmarks/code_splitter.py [--files 5000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import tree_sitter_languages
+from langchain_core.documents import Document
+
+from gpt_all_star.core.tools.document_chunker import CodeSplitter, DocumentChunker
+
+JS_TEMPLATE = """import React, {{ useState }} from "react";
+import {{ Box, Button, Text }} from "@chakra-ui/react";
+
+export function Component{index}({{ items }}) {{
+  const [count, setCount] = useState({index});
+{body}
+  return (
+    <Box p={{4}}>
+      <Text>{{count}}</Text>
+      <Button onClick={{() => setCount(count + 1)}}>Increment</Button>
+    </Box>
+  );
+}}
+"""
+PY_TEMPLATE = """class Service{index}:
+    def __init__(self, repository):
+        self.repository = repository
+
+{body}
+"""
+
+
+def create_tree(path: Path, files: int) -> list[Path]:
+    paths = []
+    for index in range(files):
+        if index % 2:
+            body = "\n".join(
+                f"  const value{i} = items.map((item) => item.id * {i});"
+                for i in range(index % 80 + 20)
+            )
+            file_path = path / f"src/components/{index % 50}/Component{index}.js"
+            content = JS_TEMPLATE.format(index=index, body=body)
+        else:
+            body = "\n\n".join(
+                f"    def method_{i}(self, value):\n        return self.repository.get(value + {i})"
+                for i in range(index % 40 + 10)
+            )
+            file_path = path / f"services/{index % 50}/service_{index}.py"
+            content = PY_TEMPLATE.format(index=index, body=body)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content, encoding="utf-8")
+        paths.append(file_path)
+    return paths
+
+
+def legacy_split_text(language: str, text: str, max_chars: int = 1500) -> list[str]:
+    """The previous implementation: a new parser per call and string concatenation."""
+
+    def chunk_node(node, last_end=0):
+        new_chunks = []
+        current_chunk = ""
+        for child in node.children:
+            if child.end_byte - child.start_byte > max_chars:
+                if len(current_chunk) > 0:
+                    new_chunks.append(current_chunk)
+                current_chunk = ""
+                new_chunks.extend(chunk_node(child, last_end))
+            elif len(current_chunk) + child.end_byte - child.start_byte > max_chars:
+                new_chunks.append(current_chunk)
+                current_chunk = text[last_end : child.end_byte]
+            else:
+                current_chunk += text[last_end : child.end_byte]
+            last_end = child.end_byte
+        if len(current_chunk) > 0:
+            new_chunks.append(current_chunk)
+        return new_chunks
+
+    parser = tree_sitter_languages.get_parser(language)
+    tree = parser.parse(bytes(text, "utf-8"))
+    return [chunk.strip() for chunk in chunk_node(tree.root_node)]
+
+
+def measure(name: str, function) -> None:
+    started = time.perf_counter()
+    chunks = function()
+    elapsed = time.perf_counter() - started
+    print(f"{name:<40} {elapsed:8.2f}s {chunks:8d} chunks")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = create_tree(Path(directory), args.files)
+        sources = [
+            ("python" if path.suffix == ".py" else "javascript", path.read_text())
+            for path in paths
+        ]
+        documents = [
+            Document(page_content=text, metadata={"filename": str(path)})
+            for path, (_, text) in zip(paths, sources)
+        ]
+        print(f"{len(paths)} files, {sum(len(text) for _, text in sources)} chars")
+
+        measure(
+            "legacy split_text",
+            lambda: sum(len(legacy_split_text(lang, text)) for lang, text in sources),
+        )
+        measure(
+            "split_text (no overlap)",
+            lambda: sum(
+                len(CodeSplitter(language=lang, chunk_lines_overlap=0).split_text(text))
+                for lang, text in sources
+            ),
+        )
+        measure(
+            "split_text (15 lines overlap)",
+            lambda: sum(
+                len(CodeSplitter(language=lang).split_text(text))
+                for lang, text in sources
+            ),
+        )
+        measure(
+            "DocumentChunker.chunk_documents",
+            lambda: len(DocumentChunker.chunk_documents(documents)),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import os
 import re
 from abc import ABC
@@ -7,7 +8,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
-from langchain.agents import AgentExecutor, create_tool_calling_agent
+from langchain.agents import create_tool_calling_agent
 from langchain_core.messages import BaseMessage
 from langchain_core.prompts.chat import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.prompts.prompt import PromptTemplate
@@ -16,15 +17,25 @@ from rich.panel import Panel
 from rich.table import Table
 
 from gpt_all_star.cli.console_terminal import ConsoleTerminal
+from gpt_all_star.core.agents.agent_executor import ConcurrentAgentExecutor
 from gpt_all_star.core.llm import LLM_TYPE, create_llm
 from gpt_all_star.core.message import Message
 from gpt_all_star.core.storage import Storages
+from gpt_all_star.core.tools.file_tool import (
+    EditFileTool,
+    GrepTool,
+    ReadFilesTool,
+    TreeTool,
+)
+from gpt_all_star.core.tools.llama_index_tool import (
+    embeddings_available,
+    llama_index_tool,
+)
 from gpt_all_star.core.tools.shell_tool import ShellTool
+from gpt_all_star.core.tools.symbol_tool import symbol_lookup_tool
 from gpt_all_star.helper.translator import create_translator
 from langchain_community.agent_toolkits import FileManagementToolkit
 
-# from gpt_all_star.core.tools.llama_index_tool import llama_index_tool
-
 
 class Agent(ABC):
     def __init__(
@@ -66,14 +77,36 @@ class Agent(ABC):
         file_tools = FileManagementToolkit(
             root_dir=str(working_directory),
             selected_tools=["read_file", "write_file", "list_directory", "file_delete"],
-        ).get_tools()
+        ).get_tools() + [
+            tool(root_dir=str(working_directory))
+            for tool in [EditFileTool, ReadFilesTool, TreeTool, GrepTool]
+        ]
         self.tools = (
             self.additional_tools
             + file_tools
-            + [ShellTool(verbose=self.debug_mode, root_dir=str(working_directory))]
+            + [
+                ShellTool(
+                    verbose=self.debug_mode,
+                    root_dir=str(working_directory),
+                    storages=self.storages,
+                )
+            ]
         )
+        if self.storages:
+            if embeddings_available():
+                self.tools.append(
+                    llama_index_tool(self.storages.app.path, self.storages.index_dir)
+                )
+            self.tools.append(symbol_lookup_tool(self.storages.symbol_index))
         self.executor = self._create_executor(self.tools)
 
+    def fork(self, storages: Storages) -> Agent:
+        """A copy of the agent working on `storages`, sharing its profile and LLM."""
+        agent = copy.copy(self)
+        agent.storages = storages
+        agent.messages = list(self.messages)
+        return agent
+
     def state(self, text: str) -> None:
         self.console.print(f"{self.name}: {text}", style=f"bold {self.color}")
 
@@ -144,7 +177,7 @@ class Agent(ABC):
     def _get_default_profile(self) -> AgentProfile:
         return AGENT_PROFILES[self.role]
 
-    def _create_executor(self, tools: list) -> AgentExecutor:
+    def _create_executor(self, tools: list) -> ConcurrentAgentExecutor:
         prompt = ChatPromptTemplate.from_messages(
             [
                 (
@@ -156,11 +189,15 @@ class Agent(ABC):
             ]
         )
         agent = create_tool_calling_agent(self._llm, tools, prompt)
-        return AgentExecutor(
+        return ConcurrentAgentExecutor(
             agent=agent,
             tools=tools,
             verbose=self.debug_mode,
             handle_parsing_errors=True,
+            max_iterations=int(os.getenv("AGENT_MAX_ITERATIONS", 15)),
+            max_execution_time=float(os.getenv("AGENT_MAX_EXECUTION_SECONDS", 600)),
+            max_tokens=int(os.getenv("AGENT_MAX_TOKENS", 200000)),
+            max_repeated_tool_calls=int(os.getenv("AGENT_MAX_REPEATED_TOOL_CALLS", 3)),
         )
 
 
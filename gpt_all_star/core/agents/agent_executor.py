@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Iterator, Optional, Union
+
+from langchain.agents import AgentExecutor
+from langchain_core.agents import AgentAction, AgentFinish, AgentStep
+from langchain_core.callbacks import CallbackManagerForChainRun
+from langchain_core.tools import BaseTool
+from pydantic import PrivateAttr
+
+from gpt_all_star.core.metrics import metrics
+from gpt_all_star.core.tools.file_tool import parse_unified_diff
+
+READ_TOOLS = {
+    "read_file": ["file_path"],
+    "read_files": ["file_paths"],
+    "list_directory": ["dir_path"],
+    "tree": ["dir_path"],
+    "grep": ["dir_path"],
+    "LlamaIndex": [],
+    "find_symbol": [],
+}
+WRITE_TOOLS = {
+    "write_file": ["file_path"],
+    "file_delete": ["file_path"],
+    "update_file": ["file_path"],
+    "edit_file": ["edits", "diff"],
+}
+SHELL_TOOLS = ["terminal"]
+EVERYTHING = "."
+
+
+class StopReason(str, Enum):
+    ITERATIONS = "iteration_budget"
+    TOKENS = "token_budget"
+    TIME = "time_budget"
+    LOOP = "repeated_tool_call"
+
+
+@dataclass
+class Budget:
+    """Usage of one executor invocation, checked before every LLM turn."""
+
+    started: float = field(default_factory=time.monotonic)
+    turns: int = 0
+    tokens: int = 0
+    counted_messages: set[int] = field(default_factory=set)
+
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(str(path).lstrip("/")).removeprefix("./") or EVERYTHING
+
+
+def _paths(tool_input: Any, keys: list[str]) -> set[str]:
+    if not isinstance(tool_input, dict):
+        return {_normalize(tool_input)} if keys else set()
+    paths = set()
+    for key in keys:
+        value = tool_input.get(key)
+        if key == "edits":
+            paths.update(
+                _normalize(edit["file_path"] if isinstance(edit, dict) else edit)
+                for edit in value or []
+            )
+        elif key == "diff":
+            for old_path, new_path, _ in parse_unified_diff(value or ""):
+                paths.update(_normalize(path) for path in [old_path, new_path] if path)
+        elif isinstance(value, list):
+            paths.update(_normalize(path) for path in value)
+        else:
+            paths.add(_normalize(value or EVERYTHING))
+    return paths
+
+
+def _overlaps(paths: set[str], others: set[str]) -> bool:
+    return any(
+        path == other
+        or EVERYTHING in (path, other)
+        or path.startswith(f"{other}/")
+        or other.startswith(f"{path}/")
+        for path in paths
+        for other in others
+    )
+
+
+class ToolCallAccess:
+    """Paths a tool call reads and writes, used to order calls of one agent turn."""
+
+    def __init__(self, action: AgentAction) -> None:
+        self.shell = action.tool in SHELL_TOOLS
+        self.unknown = not (
+            self.shell or action.tool in READ_TOOLS or action.tool in WRITE_TOOLS
+        )
+        self.reads = _paths(action.tool_input, READ_TOOLS.get(action.tool, []))
+        self.writes = _paths(action.tool_input, WRITE_TOOLS.get(action.tool, []))
+
+    def conflicts_with(self, other: ToolCallAccess) -> bool:
+        if self.unknown or other.unknown:
+            return True
+        if self.shell or other.shell:
+            # Shell commands may touch any file, so they only run alongside reads.
+            return bool(self.writes or other.writes)
+        return _overlaps(self.writes, other.reads | other.writes) or _overlaps(
+            other.writes, self.reads
+        )
+
+
+class ConcurrentAgentExecutor(AgentExecutor):
+    """AgentExecutor running the tool calls of one LLM turn in a thread pool.
+
+    A call waits for the earlier calls of the turn it conflicts with, so writes
+    to the same path keep their order, and at most `max_concurrent_shell_commands`
+    shell commands run at the same time.
+    """
+
+    max_workers: int = 4
+    max_concurrent_shell_commands: int = 2
+    max_tokens: Optional[int] = None
+    """Tokens reported by the LLM for one invocation before it is stopped."""
+    max_repeated_tool_calls: int = 3
+    """Identical tool calls with identical output before the invocation is stopped."""
+
+    _budgets: threading.local = PrivateAttr(default_factory=threading.local)
+    _futures: dict[int, Future] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _shell_semaphore: Optional[threading.Semaphore] = PrivateAttr(default=None)
+
+    def _call(
+        self,
+        inputs: dict[str, str],
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> dict[str, Any]:
+        self._budgets.current = Budget()
+        try:
+            return super()._call(inputs, run_manager)
+        finally:
+            self._budgets.current = None
+
+    def _should_continue(self, iterations: int, time_elapsed: float) -> bool:
+        if getattr(self._budgets, "current", None):
+            # Budgets are checked in _iter_next_step to stop with a reason.
+            return True
+        return super()._should_continue(iterations, time_elapsed)
+
+    def _exceeded_budget(
+        self, budget: Budget, intermediate_steps: list[tuple[AgentAction, str]]
+    ) -> Optional[tuple[StopReason, str]]:
+        if self.max_iterations is not None and budget.turns >= self.max_iterations:
+            return StopReason.ITERATIONS, f"{budget.turns} iterations were used"
+        if self.max_tokens is not None and budget.tokens >= self.max_tokens:
+            return StopReason.TOKENS, f"{budget.tokens} tokens were used"
+        elapsed = time.monotonic() - budget.started
+        if self.max_execution_time is not None and elapsed >= self.max_execution_time:
+            return StopReason.TIME, f"{elapsed:.0f} seconds were spent"
+        calls = Counter(
+            (
+                action.tool,
+                json.dumps(action.tool_input, sort_keys=True, default=str),
+                str(observation),
+            )
+            for action, observation in intermediate_steps
+        )
+        for (tool, tool_input, _), count in calls.items():
+            if count >= self.max_repeated_tool_calls:
+                return (
+                    StopReason.LOOP,
+                    f"`{tool}` was called {count} times with {tool_input} and returned the same output",
+                )
+        return None
+
+    def _iter_next_step(
+        self,
+        name_to_tool_map: dict[str, BaseTool],
+        color_mapping: dict[str, str],
+        inputs: dict[str, str],
+        intermediate_steps: list[tuple[AgentAction, str]],
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> Iterator[Union[AgentFinish, AgentAction, AgentStep]]:
+        budget: Optional[Budget] = getattr(self._budgets, "current", None)
+        if budget:
+            if exceeded := self._exceeded_budget(budget, intermediate_steps):
+                reason, detail = exceeded
+                metrics.increment(f"agent_executor.stopped.{reason.value}")
+                yield AgentFinish(
+                    {
+                        "output": f"Stopped before completing the task ({reason.value}): {detail}.",
+                        "stop_reason": reason.value,
+                    },
+                    "",
+                )
+                return
+            budget.turns += 1
+        if self._shell_semaphore is None:
+            self._shell_semaphore = threading.Semaphore(
+                self.max_concurrent_shell_commands
+            )
+        pool: Optional[ThreadPoolExecutor] = None
+        scheduled: list[tuple[ToolCallAccess, Future]] = []
+        durations: list[float] = []
+        started = 0.0
+        try:
+            for output in super()._iter_next_step(
+                name_to_tool_map,
+                color_mapping,
+                inputs,
+                intermediate_steps,
+                run_manager,
+            ):
+                if budget and isinstance(output, AgentAction):
+                    for message in getattr(output, "message_log", []):
+                        usage = getattr(message, "usage_metadata", None)
+                        if usage and id(message) not in budget.counted_messages:
+                            budget.counted_messages.add(id(message))
+                            budget.tokens += usage.get("total_tokens", 0)
+                if isinstance(output, AgentAction) and output.tool != "_Exception":
+                    # The parent yields every action of the turn before performing
+                    # any of them, so each one is started as soon as it is known.
+                    if pool is None:
+                        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+                        started = time.perf_counter()
+                    access = ToolCallAccess(output)
+                    dependencies = [
+                        future
+                        for other, future in scheduled
+                        if access.conflicts_with(other)
+                    ]
+                    future = pool.submit(
+                        self._perform_scheduled_action,
+                        access,
+                        dependencies,
+                        durations,
+                        name_to_tool_map,
+                        color_mapping,
+                        output,
+                        run_manager,
+                    )
+                    scheduled.append((access, future))
+                    with self._lock:
+                        self._futures[id(output)] = future
+                yield output
+        finally:
+            if pool:
+                pool.shutdown(wait=True)
+            with self._lock:
+                for future in [future for _, future in scheduled]:
+                    for key in [k for k, f in self._futures.items() if f is future]:
+                        del self._futures[key]
+            if len(scheduled) > 1:
+                elapsed = time.perf_counter() - started
+                metrics.increment("agent_executor.parallel_turns")
+                metrics.increment("agent_executor.parallel_tool_calls", len(scheduled))
+                metrics.increment(
+                    "agent_executor.overlap_seconds", max(sum(durations) - elapsed, 0)
+                )
+
+    def _perform_scheduled_action(
+        self,
+        access: ToolCallAccess,
+        dependencies: list[Future],
+        durations: list[float],
+        *args: Any,
+    ) -> AgentStep:
+        for dependency in dependencies:
+            dependency.exception()
+        started = time.perf_counter()
+        try:
+            if access.shell:
+                with self._shell_semaphore:
+                    return super()._perform_agent_action(*args)
+            return super()._perform_agent_action(*args)
+        finally:
+            durations.append(time.perf_counter() - started)
+
+    def _perform_agent_action(
+        self,
+        name_to_tool_map: dict[str, BaseTool],
+        color_mapping: dict[str, str],
+        agent_action: AgentAction,
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> AgentStep:
+        with self._lock:
+            future = self._futures.pop(id(agent_action), None)
+        if future is not None:
+            return future.result()
+        return super()._perform_agent_action(
+            name_to_tool_map, color_mapping, agent_action, run_manager
+        )
@@ -1,24 +1,43 @@
+import asyncio
 import os
 import random
-import signal
 import string
-import subprocess
-import threading
-import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Optional
 
-import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
 from gpt_all_star.core.agents.agent import Agent, AgentRole
+from gpt_all_star.core.output_buffer import (
+    ConsoleBatcher,
+    buffer_from_env,
+    failure_report,
+)
+from gpt_all_star.core.ports import get_port_registry, probe_http
+from gpt_all_star.core.process_supervisor import (
+    SupervisedProcess,
+    get_process_supervisor,
+)
 from gpt_all_star.core.storage import Storages
 from gpt_all_star.helper.config_loader import load_configuration
+from gpt_all_star.helper.paths import LOG_DIR
 from gpt_all_star.helper.translator import create_translator
 
 APP_TYPES = ["Client-Side Web Application", "Full-Stack Web Application"]
 
 
+def _run_sync(coroutine):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    # Called from a running event loop, which cannot be blocked or re-entered.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
 class Copilot(Agent):
     def __init__(
         self,
@@ -98,74 +117,117 @@ class Copilot(Agent):
             self._("You can press ctrl+c *once* to stop the execution."), style="red"
         )
 
-    def run_command(self, command: str, display: bool = True):
+    def run_command(
+        self, command: str, display: bool = True, port: Optional[int] = None
+    ):
+        """Blocking version of `arun_command`."""
+        return _run_sync(self.arun_command(command, display, port))
+
+    async def arun_command(
+        self, command: str, display: bool = True, port: Optional[int] = None
+    ):
+        """Run the app, passing a leased port in `PORT` unless `port` is given.
+
+        Output is read and the server probed on the event loop, cancelling the
+        call stops the app.
+        """
+        for decision in self.storages.prepare_dependencies():
+            self.state(decision)
+        registry = get_port_registry()
+        leased = port is None
+        if leased:
+            port = registry.lease()
+        log_name = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        outputs = {
+            name: buffer_from_env(
+                self.storages.root.path / LOG_DIR, f"{log_name}_run_{name}.log"
+            )
+            for name in ["stdout", "stderr"]
+        }
+        batcher = ConsoleBatcher(self.console, background=False)
+        renderer = asyncio.create_task(batcher.render())
+        process: Optional[SupervisedProcess] = None
+        readers: list[asyncio.Task] = []
+
+        async def read(name: str, style: str) -> None:
+            async for line in process.lines(name):
+                outputs[name].append(line.strip())
+                batcher.write(line.strip(), style)
+
         try:
-            process = subprocess.Popen(
+            supervisor = get_process_supervisor()
+            process = supervisor.spawn(
                 command,
-                shell=True,
                 cwd=self.storages.app.path,
-                text=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                preexec_fn=os.setsid,
+                env={**os.environ, "PORT": str(port)},
+                limits=supervisor.app_limits,
             )
-
-            stdout_lines = []
-            stderr_lines = []
-
-            def read_stdout():
-                for line in iter(process.stdout.readline, ""):
-                    stdout_lines.append(line.strip())
-                    self.console.print(f"{line.strip()}", style="green")
-
-            def read_stderr():
-                for line in iter(process.stderr.readline, ""):
-                    stderr_lines.append(line.strip())
-                    self.console.print(f"{line.strip()}", style="red")
-
-            stdout_thread = threading.Thread(target=read_stdout)
-            stderr_thread = threading.Thread(target=read_stderr)
-            stdout_thread.start()
-            stderr_thread.start()
-
-            if url := self._wait_for_server():
-                self._check_browser_errors(url)
+            if leased:
+                registry.attach(port, process.pid)
+            readers = [
+                asyncio.create_task(read("stdout", "green")),
+                asyncio.create_task(read("stderr", "red")),
+            ]
+
+            if url := await self._wait_for_server(port, process):
+                if decision := self.storages.save_dependencies():
+                    self.state(decision)
+                try:
+                    await asyncio.to_thread(self._check_browser_errors, url)
+                except Exception:
+                    await process.terminate_async()
+                    raise
                 if not display:
-                    os.killpg(process.pid, signal.SIGTERM)
-                    process.wait()
+                    await process.terminate_async()
                     return url
-
-            stdout_thread.join()
-            stderr_thread.join()
-            return_code = process.wait()
-
-            if return_code != 0:
+                self.state(self._("The application is running at %s") % url)
+            elif not display and process.poll() is None:
+                await process.terminate_async()
+                await asyncio.gather(*readers)
                 raise Exception(
                     {
-                        "stdout": "\n".join(stdout_lines),
-                        "stderr": "\n".join(stderr_lines),
+                        **failure_report(outputs),
+                        "server": f"No response on port {port}",
                     }
                 )
 
-            os.killpg(process.pid, signal.SIGTERM)
-            process.wait()
-        except KeyboardInterrupt:
-            os.killpg(process.pid, signal.SIGTERM)
-            process.wait()
-            self._handle_keyboard_interrupt()
-            raise KeyboardInterrupt
+            await asyncio.gather(*readers)
+            return_code = await process.wait_async()
 
-    def _wait_for_server(self) -> Optional[str]:
+            if return_code != 0:
+                await process.terminate_async()
+                raise Exception(failure_report(outputs))
+
+            if decision := self.storages.save_dependencies():
+                self.state(decision)
+
+            await process.terminate_async()
+        except asyncio.CancelledError:
+            if process:
+                await process.terminate_async()
+            self._handle_keyboard_interrupt()
+            raise
+        finally:
+            if leased:
+                registry.release(port)
+            if readers:
+                await asyncio.wait(readers, timeout=5)
+            for task in [*readers, renderer]:
+                task.cancel()
+            batcher.close()
+            for buffer in outputs.values():
+                buffer.close()
+
+    async def _wait_for_server(
+        self, port: int, process: Optional[SupervisedProcess] = None
+    ) -> Optional[str]:
         MAX_ATTEMPTS = 30
         for attempt in range(MAX_ATTEMPTS):
-            try:
-                url = "http://localhost:3000"
-                response = requests.get(url)
-                if response.status_code == 200:
-                    return url
-            except requests.ConnectionError:
-                pass
-            time.sleep(1)
+            if process is not None and process.poll() is not None:
+                break
+            if await probe_http(port):
+                return f"http://localhost:{port}"
+            await asyncio.sleep(1)
         self.state(self._("Unable to confirm server startup"))
         return None
 
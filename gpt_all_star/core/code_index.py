@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from gpt_all_star.core.tools.document_chunker import CodeSplitter, get_language
+from gpt_all_star.helper.paths import EXCLUDED_DIRS, EXCLUDED_FILES
+
+FALLBACK_CHUNK_LINES = 40
+
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*|\d+")
+CAMEL_CASE_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def source_files(path: Path) -> list[Path]:
+    files = []
+    for root, dirs, filenames in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+        files.extend(
+            Path(root) / filename
+            for filename in filenames
+            if filename not in EXCLUDED_FILES
+        )
+    return files
+
+
+def tokenize(text: str) -> list[str]:
+    """Split identifiers so `useTodoList`, `todo_list` and `todo-list` share terms."""
+    tokens = []
+    for identifier in IDENTIFIER_PATTERN.findall(text):
+        parts = [
+            part.lower()
+            for word in re.split(r"[_$]+", identifier)
+            for part in CAMEL_CASE_PATTERN.findall(word)
+        ]
+        tokens.extend(part for part in parts if len(part) > 1)
+        if len(parts) > 1:
+            tokens.append(identifier.lower())
+    return tokens
+
+
+@dataclass
+class Chunk:
+    path: str
+    start_line: int
+    end_line: int
+    text: str
+
+
+def chunk_source(path: str, text: str) -> list[Chunk]:
+    """Split a file with its AST when possible, otherwise in fixed line windows."""
+    if language := get_language(path):
+        try:
+            return [
+                Chunk(path, start_line, end_line, chunk)
+                for start_line, end_line, chunk in CodeSplitter(
+                    language=language.tree_sitter_name, chunk_lines_overlap=0
+                ).split_text_with_lines(text)
+            ]
+        except Exception:
+            pass
+
+    lines = text.splitlines()
+    return [
+        Chunk(
+            path,
+            start + 1,
+            min(start + FALLBACK_CHUNK_LINES, len(lines)),
+            "\n".join(lines[start : start + FALLBACK_CHUNK_LINES]),
+        )
+        for start in range(0, len(lines), FALLBACK_CHUNK_LINES)
+    ]
+
+
+class CodeIndex:
+    """BM25 inverted index over the chunks of a source tree, refreshed by file stat."""
+
+    def __init__(self, path: str | Path, k1: float = 1.2, b: float = 0.75) -> None:
+        self.path = Path(path).absolute()
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._files: dict[str, tuple[float, int]] = {}
+        self._chunks: dict[int, Chunk] = {}
+        self._chunk_ids_by_file: dict[str, list[int]] = defaultdict(list)
+        self._term_frequencies: dict[int, Counter] = {}
+        self._lengths: dict[int, int] = {}
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._total_length = 0
+        self._next_id = 0
+
+    def refresh(self) -> int:
+        with self._lock:
+            seen = set()
+            changed = 0
+            for file_path in source_files(self.path):
+                relative_path = str(file_path.relative_to(self.path))
+                seen.add(relative_path)
+                stat = file_path.stat()
+                signature = (stat.st_mtime, stat.st_size)
+                if self._files.get(relative_path) == signature:
+                    continue
+                try:
+                    text = file_path.read_text(encoding="utf-8")
+                except UnicodeDecodeError:
+                    continue
+                self._remove_file(relative_path)
+                self._add_file(relative_path, text)
+                self._files[relative_path] = signature
+                changed += 1
+            for relative_path in [path for path in self._files if path not in seen]:
+                self._remove_file(relative_path)
+                del self._files[relative_path]
+                changed += 1
+            return changed
+
+    def search(self, query: str, top_k: int = 8) -> list[tuple[float, Chunk]]:
+        self.refresh()
+        with self._lock:
+            if not self._chunks:
+                return []
+            average_length = self._total_length / len(self._chunks)
+            scores: dict[int, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1
+                    + (len(self._chunks) - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for chunk_id, frequency in postings.items():
+                    length = self._lengths[chunk_id]
+                    scores[chunk_id] += (
+                        idf
+                        * frequency
+                        * (self.k1 + 1)
+                        / (
+                            frequency
+                            + self.k1
+                            * (1 - self.b + self.b * length / (average_length or 1))
+                        )
+                    )
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            return [
+                (score, self._chunks[chunk_id]) for chunk_id, score in ranked[:top_k]
+            ]
+
+    def files(self) -> list[str]:
+        self.refresh()
+        with self._lock:
+            return sorted(self._files)
+
+    def _add_file(self, relative_path: str, text: str) -> None:
+        for chunk in chunk_source(relative_path, text):
+            chunk_id = self._next_id
+            self._next_id += 1
+            frequencies = Counter(tokenize(f"{relative_path}\n{chunk.text}"))
+            self._chunks[chunk_id] = chunk
+            self._chunk_ids_by_file[relative_path].append(chunk_id)
+            self._term_frequencies[chunk_id] = frequencies
+            self._lengths[chunk_id] = sum(frequencies.values())
+            self._total_length += self._lengths[chunk_id]
+            for term, frequency in frequencies.items():
+                self._postings[term][chunk_id] = frequency
+
+    def _remove_file(self, relative_path: str) -> None:
+        for chunk_id in self._chunk_ids_by_file.pop(relative_path, []):
+            frequencies = self._term_frequencies.pop(chunk_id)
+            self._total_length -= self._lengths.pop(chunk_id)
+            for term in frequencies:
+                del self._postings[term][chunk_id]
+                if not self._postings[term]:
+                    del self._postings[term]
+            del self._chunks[chunk_id]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from pathlib import Path
+
+CHARS_PER_TOKEN = 4
+MAX_SUMMARY_TOKENS = 1500
+HEAD_LINES = 15
+TAIL_LINES = 30
+MAX_ERROR_BLOCK_LINES = 8
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+ERROR_PATTERN = re.compile(
+    r"npm ERR!|npm error|\berror\b|Error:|ERROR in|Failed to compile|"
+    r"\bTS\d{4}\b|Module not found|Cannot find module|✖ \d+ problems?",
+    re.IGNORECASE,
+)
+NOISE_PATTERN = re.compile(r"^\s*(?:npm (?:ERR!|error)\s*)?$")
+
+
+def clean_lines(text: str) -> list[str]:
+    """Strip terminal escapes and collapse runs of identical lines."""
+    lines = []
+    previous = None
+    repeated = 0
+    for line in ANSI_PATTERN.sub("", text).replace("\r\n", "\n").split("\n"):
+        line = line.split("\r")[-1].rstrip()
+        if line == previous:
+            repeated += 1
+            continue
+        if repeated:
+            lines.append(f"(previous line repeated {repeated} more times)")
+        lines.append(line)
+        previous = line
+        repeated = 0
+    if repeated:
+        lines.append(f"(previous line repeated {repeated} more times)")
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def extract_error_blocks(lines: list[str]) -> list[str]:
+    """Error lines with the indented or adjacent lines that follow them, deduplicated."""
+    blocks: list[str] = []
+    index = 0
+    while index < len(lines):
+        if not ERROR_PATTERN.search(lines[index]) or NOISE_PATTERN.match(lines[index]):
+            index += 1
+            continue
+        block = [lines[index]]
+        index += 1
+        while (
+            index < len(lines)
+            and lines[index].strip()
+            and len(block) < MAX_ERROR_BLOCK_LINES
+            and (lines[index][:1].isspace() or not ERROR_PATTERN.search(lines[index]))
+        ):
+            block.append(lines[index])
+            index += 1
+        text = "\n".join(block)
+        if text not in blocks:
+            blocks.append(text)
+    return blocks
+
+
+def _cap(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[: max_chars - 20].rstrip() + "\n... (truncated)"
+
+
+def summarize_output(text: str, max_tokens: int = MAX_SUMMARY_TOKENS) -> str:
+    """Head and tail of a command output with its error blocks, within `max_tokens`."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    lines = clean_lines(text)
+    cleaned = "\n".join(lines)
+    if len(cleaned) <= max_chars:
+        return cleaned
+
+    sections = []
+    if errors := extract_error_blocks(lines):
+        sections.append("Errors:\n" + _cap("\n".join(errors), max_chars // 2))
+    budget = max_chars - sum(len(section) for section in sections)
+    omitted = len(lines) - HEAD_LINES - TAIL_LINES
+    if omitted <= 0:
+        return "\n".join([_cap(cleaned, budget), *sections])
+    head = "\n".join(lines[:HEAD_LINES])
+    tail = "\n".join(lines[-TAIL_LINES:])
+    return "\n".join(
+        [
+            _cap(head, budget // 3),
+            f"... ({omitted} lines omitted) ...",
+            *sections,
+            _cap(tail, budget * 2 // 3),
+        ]
+    )
+
+
+def save_log(directory: Path, command: str, stdout: str, stderr: str) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^\w.-]+", "_", command)[:40].strip("_") or "command"
+    path = directory / f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{name}.log"
+    path.write_text(
+        f"$ {command}\n\n[stdout]\n{stdout}\n[stderr]\n{stderr}\n", encoding="utf-8"
+    )
+    return path
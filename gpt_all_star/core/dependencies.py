@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+
+from gpt_all_star.core.metrics import metrics
+from gpt_all_star.helper.paths import DEPENDENCY_DIR
+
+MANIFEST_FILE = "package.json"
+LOCK_FILES = ["package-lock.json", "yarn.lock", "pnpm-lock.yaml"]
+DEPENDENCY_SECTIONS = ["dependencies", "devDependencies", "peerDependencies"]
+METADATA_FILE = "metadata.json"
+
+INSTALL_COMMAND_PATTERN = re.compile(
+    r"\b(?:npm|pnpm)\s+(?:install|i|ci)\b|\byarn(?:\s+install)?\s*(?:$|&&|;|\|)"
+)
+
+
+def is_install_command(commands: str | list[str]) -> bool:
+    command = " ".join(commands) if isinstance(commands, list) else str(commands)
+    return bool(INSTALL_COMMAND_PATTERN.search(command))
+
+
+def file_hash(path: Path) -> str | None:
+    if not path.is_file():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def dependency_hashes(path: Path) -> dict[str, str]:
+    hashes = {}
+    for name in [MANIFEST_FILE, *LOCK_FILES]:
+        if digest := file_hash(path / name):
+            hashes[name] = digest
+    return hashes
+
+
+def hashes_match(current: dict[str, str], candidate: dict[str, str]) -> bool:
+    """A lockfile only has to match when the current app already has one."""
+    if MANIFEST_FILE not in current:
+        return False
+    return all(candidate.get(name) == digest for name, digest in current.items())
+
+
+def link_tree(source: Path, destination: Path) -> int:
+    """Recreate `source` at `destination` with hard links, copying when linking fails."""
+    linked = 0
+    for root, dirs, files in os.walk(source):
+        relative = Path(root).relative_to(source)
+        target_dir = destination / relative
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for name in dirs + files:
+            source_path = Path(root) / name
+            if not source_path.is_symlink():
+                continue
+            os.symlink(os.readlink(source_path), target_dir / name)
+        dirs[:] = [d for d in dirs if not (Path(root) / d).is_symlink()]
+        for name in files:
+            source_path = Path(root) / name
+            if source_path.is_symlink():
+                continue
+            try:
+                os.link(source_path, target_dir / name)
+            except OSError:
+                shutil.copy2(source_path, target_dir / name)
+            linked += 1
+    return linked
+
+
+def tree_fingerprint(path: Path) -> str:
+    """Hash of the paths, sizes and modification times of the files under `path`."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = Path(root) / name
+            if file_path.is_symlink():
+                continue
+            stat = file_path.stat()
+            digest.update(
+                f"{file_path.relative_to(path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode()
+            )
+    return digest.hexdigest()
+
+
+def dependency_cache_key(path: Path) -> str | None:
+    """Hash of the dependency ranges and of the lockfiles, which pin what they resolve to."""
+    try:
+        manifest = json.loads((path / MANIFEST_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict):
+        return None
+    normalized = {
+        section: sorted((manifest.get(section) or {}).items())
+        for section in DEPENDENCY_SECTIONS
+    }
+    normalized["lockfiles"] = {
+        name: digest
+        for name, digest in dependency_hashes(path).items()
+        if name != MANIFEST_FILE
+    }
+    return hashlib.sha256(
+        json.dumps(normalized, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+class DependencyCache:
+    """Prepared dependency trees shared by every project in the workspace.
+
+    Entries are hard-linked into the apps, so a postinstall script or patch writing
+    to a file in place also changes the entry. Entries are fingerprinted when stored
+    and dropped when their files no longer match.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).absolute()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._pending: dict[str, tuple[str, bool, float]] = {}
+
+    def prepare(self, app_path: Path) -> str | None:
+        key = dependency_cache_key(app_path)
+        if key is None or (app_path / DEPENDENCY_DIR).exists():
+            return None
+
+        entry = self.path / key
+        hit = (entry / DEPENDENCY_DIR).is_dir()
+        if hit and not self._intact(entry):
+            shutil.rmtree(entry, ignore_errors=True)
+            metrics.increment("dependency_cache.invalidated")
+            hit = False
+        self._pending[str(app_path)] = (key, hit, time.time())
+        if not hit:
+            metrics.increment("dependency_cache.misses")
+            return f"Dependency cache miss ({key[:12]})."
+
+        linked = link_tree(entry / DEPENDENCY_DIR, app_path / DEPENDENCY_DIR)
+        metrics.increment("dependency_cache.hits")
+        return f"Dependency cache hit ({key[:12]}), linked {linked} files."
+
+    def save(self, app_path: Path) -> str | None:
+        key, hit, started = self._pending.pop(str(app_path), (None, False, None))
+        key = key or dependency_cache_key(app_path)
+        if key is None or not (app_path / DEPENDENCY_DIR).is_dir():
+            return None
+
+        entry = self.path / key
+        elapsed = time.time() - started if started else None
+        if hit:
+            install_seconds = self._metadata(entry).get("install_seconds")
+            if install_seconds is None or elapsed is None:
+                return None
+            saved = max(install_seconds - elapsed, 0.0)
+            metrics.increment("dependency_cache.seconds_saved", saved)
+            return f"Dependency cache saved {saved:.1f} seconds ({key[:12]})."
+
+        if entry.exists():
+            return None
+        staging = self.path / f"{key}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        link_tree(app_path / DEPENDENCY_DIR, staging / DEPENDENCY_DIR)
+        (staging / METADATA_FILE).write_text(
+            json.dumps(
+                {
+                    "install_seconds": elapsed,
+                    "fingerprint": tree_fingerprint(staging / DEPENDENCY_DIR),
+                }
+            ),
+            encoding="utf-8",
+        )
+        try:
+            staging.rename(entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return None
+        return f"Stored {DEPENDENCY_DIR} in the dependency cache ({key[:12]})."
+
+    def _intact(self, entry: Path) -> bool:
+        fingerprint = self._metadata(entry).get("fingerprint")
+        return fingerprint == tree_fingerprint(entry / DEPENDENCY_DIR)
+
+    @staticmethod
+    def _metadata(entry: Path) -> dict:
+        try:
+            return json.loads((entry / METADATA_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
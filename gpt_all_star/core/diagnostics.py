@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from gpt_all_star.core.command_output import (
+    ANSI_PATTERN,
+    clean_lines,
+    extract_error_blocks,
+)
+
+SOURCE_EXTENSIONS = r"(?:jsx?|tsx?|mjs|cjs|css|scss|json|html|vue|py)"
+PATH = rf"[\w@.\-/\\:]*?[\w@\-]+\.{SOURCE_EXTENSIONS}"
+
+# (source, pattern) pairs with named groups `file`, `line`, `column` and `message`.
+PATTERNS = [
+    (
+        "typescript",
+        re.compile(
+            rf"(?P<file>{PATH})(?:\((?P<line>\d+),(?P<column>\d+)\)|:(?P<line2>\d+):(?P<column2>\d+)) ?[:-] ?error (?P<message>TS\d+: .*)"
+        ),
+    ),
+    (
+        "babel",
+        re.compile(
+            rf"(?P<message>\w*Error): (?P<file>{PATH}): (?P<detail>.*?) \((?P<line>\d+):(?P<column>\d+)\)"
+        ),
+    ),
+    (
+        "vite",
+        re.compile(
+            rf"(?P<message>Failed to resolve import .*?) from \"(?P<file>{PATH})\""
+        ),
+    ),
+    (
+        "webpack",
+        re.compile(rf"ERROR in (?P<file>{PATH})(?: (?P<line>\d+):(?P<column>\d+))?"),
+    ),
+    (
+        "browser",
+        re.compile(
+            rf"https?://[^/\s]+/(?P<file>{PATH})(?:\?\S*)? (?P<line>\d+):(?P<column>\d+) (?P<message>.*)"
+        ),
+    ),
+    (
+        "stack",
+        re.compile(rf"at (?:.*? \()?(?P<file>{PATH}):(?P<line>\d+):(?P<column>\d+)\)?"),
+    ),
+]
+ESLINT_FILE_PATTERN = re.compile(rf"^(?P<file>{PATH})$")
+ESLINT_PROBLEM_PATTERN = re.compile(
+    r"^\s+(?:Line )?(?P<line>\d+):(?P<column>\d+):?\s+(?:(?:error|warning)\s+)?(?P<message>.+?)\s*$"
+)
+MESSAGE_PATTERN = re.compile(
+    r"Module not found: .*|Cannot find module .*|\w*Error: .*|"
+    r"npm (?:ERR!|error) (?:code \w+|missing script: .*|.*(?:Could not resolve|ERESOLVE|notarget).*)"
+)
+# Parts of an error message that change between runs of the same failure.
+VOLATILE_PATTERNS = [
+    (
+        re.compile(
+            r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?"
+        ),
+        "<time>",
+    ),
+    (re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:\s?[AP]M)?\b"), "<time>"),
+    (
+        re.compile(
+            r"(?:(?<=localhost)|(?<=127\.0\.0\.1)|(?<=0\.0\.0\.0)|(?<=\])):\d{2,5}\b"
+        ),
+        ":<port>",
+    ),
+    (re.compile(r"\bport \d{2,5}\b", re.IGNORECASE), "port <port>"),
+    (re.compile(r"\b0x[0-9a-f]+\b", re.IGNORECASE), "<address>"),
+    (re.compile(r"\?t=\d+"), ""),
+    (re.compile(r"\b\d+(?:\.\d+)?\s?m?s\b"), "<duration>"),
+    (re.compile(r"(?:/[\w@.\-]+)+/(?=[\w@\-]+\.\w+)"), ""),
+    (re.compile(r"[:(]\d+[:,]\d+\)?"), ""),
+]
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    source: str
+    message: str
+    file: Optional[str] = None
+    line: Optional[int] = None
+    column: Optional[int] = None
+
+    def __str__(self) -> str:
+        location = ""
+        if self.file:
+            location = f"./{self.file}"
+            if self.line:
+                location += f":{self.line}"
+                if self.column:
+                    location += f":{self.column}"
+            location += " "
+        return f"- {location}[{self.source}] {self.message}"
+
+
+def error_text(error: object) -> str:
+    """Text of an error raised by `Copilot.run_command`, whose argument is a dict of outputs."""
+    if isinstance(error, BaseException) and error.args:
+        error = error.args[0]
+    if isinstance(error, dict):
+        return "\n".join(f"[{key}]\n{value}" for key, value in error.items())
+    return str(error)
+
+
+class FileMapper:
+    """Map paths found in logs (absolute, relative, URLs) to files of the app."""
+
+    def __init__(self, app_path: Optional[Path], files: Iterable[str]) -> None:
+        self.app_path = str(Path(app_path).resolve()) if app_path else None
+        self.files = sorted(files)
+
+    def map(self, path: str) -> Optional[str]:
+        path = path.replace("\\", "/")
+        if self.app_path and path.startswith(f"{self.app_path}/"):
+            path = path[len(self.app_path) + 1 :]
+        path = os.path.normpath(path.lstrip("/")).removeprefix("./")
+        if path in self.files:
+            return path
+        candidates = [file for file in self.files if path.endswith(f"/{file}")]
+        candidates = candidates or [
+            file for file in self.files if file.endswith(f"/{path}")
+        ]
+        return max(candidates, key=len, default=None)
+
+
+def parse_diagnostics(
+    text: str, app_path: Optional[Path] = None, files: Iterable[str] = ()
+) -> list[Diagnostic]:
+    """Parse npm, webpack/vite, Babel, TypeScript, ESLint and browser errors."""
+    mapper = FileMapper(app_path, files)
+    lines = [line.rstrip() for line in ANSI_PATTERN.sub("", text).splitlines()]
+    diagnostics: list[Diagnostic] = []
+
+    def add(source: str, message: str, file=None, line=None, column=None) -> None:
+        diagnostic = Diagnostic(
+            source,
+            message.strip(),
+            mapper.map(file) if file else None,
+            int(line) if line else None,
+            int(column) if column else None,
+        )
+        if diagnostic not in diagnostics:
+            diagnostics.append(diagnostic)
+
+    eslint_file = None
+    for index, line in enumerate(lines):
+        if match := ESLINT_FILE_PATTERN.match(line.strip()):
+            eslint_file = match.group("file")
+            continue
+        if eslint_file and (match := ESLINT_PROBLEM_PATTERN.match(line)):
+            add(
+                "eslint",
+                match.group("message"),
+                eslint_file,
+                *match.group("line", "column"),
+            )
+            continue
+        if not line.strip():
+            eslint_file = None
+
+        for source, pattern in PATTERNS:
+            if not (match := pattern.search(line)):
+                continue
+            groups = match.groupdict()
+            message = groups.get("message") or ""
+            if groups.get("detail"):
+                message = f"{message}: {groups['detail']}"
+            if source == "stack":
+                if not mapper.map(groups["file"]):
+                    break
+                message = "in stack trace"
+            elif source == "webpack":
+                following = [text.strip() for text in lines[index + 1 : index + 4]]
+                message = next(filter(None, following), "Build error")
+            add(
+                source,
+                message,
+                groups["file"],
+                groups.get("line") or groups.get("line2"),
+                groups.get("column") or groups.get("column2"),
+            )
+            break
+        else:
+            if match := MESSAGE_PATTERN.search(line):
+                if not any(match.group(0).strip() in d.message for d in diagnostics):
+                    source = "npm" if match.group(0).startswith("npm") else "runtime"
+                    add(source, match.group(0))
+    return diagnostics
+
+
+def diagnosed_files(diagnostics: list[Diagnostic]) -> list[str]:
+    return list(dict.fromkeys(d.file for d in diagnostics if d.file))
+
+
+def normalize_error(text: str) -> str:
+    """Strip timestamps, ports, addresses, durations, directories and positions."""
+    for pattern, replacement in VOLATILE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def error_signature(text: str, diagnostics: Optional[list[Diagnostic]] = None) -> str:
+    """A stable identifier of a failure, equal for recurrences of the same error."""
+    if diagnostics:
+        parts = sorted(
+            {f"{d.source}|{d.file}|{normalize_error(d.message)}" for d in diagnostics}
+        )
+    else:
+        lines = clean_lines(text)
+        parts = sorted(
+            {normalize_error(block) for block in extract_error_blocks(lines)}
+        ) or [normalize_error("\n".join(lines[-20:]))]
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:12]
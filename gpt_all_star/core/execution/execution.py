@@ -1,6 +1,23 @@
-from gpt_all_star.core.agents.chain import Chain
+import os
+
 from gpt_all_star.core.agents.copilot import Copilot
-from gpt_all_star.core.message import Message
+from gpt_all_star.core.command_output import summarize_output
+from gpt_all_star.core.diagnostics import (
+    Diagnostic,
+    error_signature,
+    error_text,
+    parse_diagnostics,
+)
+from gpt_all_star.core.execution.healing_memory import (
+    HealingAttempt,
+    HealingMemory,
+    diff_snapshots,
+    snapshot,
+)
+from gpt_all_star.core.execution.run_command import resolve_run_command
+from gpt_all_star.core.execution.speculative_healing import SpeculativeHealing
+from gpt_all_star.core.metrics import metrics
+from gpt_all_star.core.preflight import PreflightError, blocking, run_preflight
 from gpt_all_star.core.steps.healing.healing import Healing
 from gpt_all_star.core.team import Team
 from gpt_all_star.helper.translator import create_translator
@@ -11,44 +28,144 @@ class Execution:
         self.team = team
         self.copilot = copilot
         self.working_directory = self.copilot.storages.app.path.absolute()
+        self.japanese_mode = japanese_mode
+        self.candidates = int(os.getenv("SPECULATIVE_HEALING_CANDIDATES", 1))
+        self.preflight = os.getenv("PREFLIGHT_CHECKS", "true").lower() == "true"
+        self._preflight_signature: str | None = None
         self._ = create_translator("ja" if japanese_mode else "en")
 
     def run(self) -> None:
-        command = (
-            Chain()
-            .create_command_to_execute_application_chain()
-            .invoke(
-                {
-                    "messages": [
-                        Message.create_human_message(
-                            f"""
-# Instructions
----
-Generate an command to execute the application.
-
-# Constraints
----
-- Check the current implementation and directory structure and be sure to launch the application.
-- If run.sh exists, it should be used first. To use it, move to the directory where run.sh exists, and then run `sh . /run.sh` after moving to the directory where run.sh exists.
-
-# Current Implementation
----
-{self.copilot.storages.current_source_code(debug_mode=self.copilot.debug_mode)}
-"""
-                        )
-                    ],
-                }
-            )
+        command = resolve_run_command(
+            self.copilot.storages, debug_mode=self.copilot.debug_mode
         )
-        self.copilot.caution(command["command"])
+        self.copilot.caution(command)
         MAX_ATTEMPTS = 5
+        memory = HealingMemory()
         for attempt in range(MAX_ATTEMPTS):
             self.copilot.state(self._("Attempt %d/%d") % (attempt + 1, MAX_ATTEMPTS))
+            advisories: list[Diagnostic] = []
             try:
-                self.copilot.run_command(command["command"])
+                advisories = self._check_before_running()
+                self.copilot.run_command(command)
                 return
             except KeyboardInterrupt:
                 break
             except Exception as e:
-                healing = Healing(copilot=self.copilot, error_message=e)
-                self.team.run(healing)
+                diagnostics = self._diagnostics(e)
+                signature = error_signature(error_text(e), diagnostics)
+                diagnostics += [d for d in advisories if d not in diagnostics]
+                if memory.should_escalate(signature):
+                    metrics.increment("execution.escalations")
+                    self.copilot.state(
+                        self._(
+                            "The same error persisted after %d attempts to fix it. Please check it manually."
+                        )
+                        % len(memory.failed_attempts(signature))
+                    )
+                    break
+                if self.candidates > 1:
+                    self._heal_speculatively(e, diagnostics, signature, memory, command)
+                else:
+                    self._heal(e, diagnostics, signature, memory)
+
+    def _diagnostics(self, error: Exception) -> list[Diagnostic]:
+        if diagnostics := getattr(error, "diagnostics", None):
+            return list(diagnostics)
+        storages = self.copilot.storages
+        return parse_diagnostics(
+            error_text(error), storages.app.path, storages.symbol_index.symbols()
+        )
+
+    def _check_before_running(self) -> list[Diagnostic]:
+        """Fail fast on problems found without starting the app and a browser.
+
+        Returns the findings that do not stop the app, to accompany its failure.
+        Problems a heal left unchanged may be false positives, so the app is run
+        despite them the second time.
+        """
+        if not self.preflight:
+            return []
+        diagnostics = run_preflight(self.copilot.storages)
+        if not (problems := blocking(diagnostics)):
+            self._preflight_signature = None
+            return diagnostics
+        signature = error_signature("", problems)
+        if signature == self._preflight_signature:
+            metrics.increment("execution.preflight_overridden")
+            self.copilot.state(
+                self._(
+                    "The same problems were found again, running the application anyway."
+                )
+            )
+            return diagnostics
+        self._preflight_signature = signature
+        metrics.increment("execution.preflight_failures")
+        self.copilot.state(
+            self._("Found %d problems before running the application.") % len(problems)
+        )
+        raise PreflightError(problems)
+
+    def _heal(
+        self,
+        error: Exception,
+        diagnostics: list[Diagnostic],
+        signature: str,
+        memory: HealingMemory,
+    ) -> None:
+        healing = Healing(
+            copilot=self.copilot, error_message=error, diagnostics=diagnostics
+        )
+        healing.previous_attempts = memory.describe(signature)
+        before = snapshot(self.copilot.storages.app)
+        self.team.run(healing)
+        metrics.increment("execution.healing_attempts")
+        memory.record(
+            HealingAttempt(
+                signature=signature,
+                error=summarize_output(error_text(error), max_tokens=300),
+                plan=self.team.last_plan,
+                diff=diff_snapshots(
+                    before,
+                    snapshot(self.copilot.storages.app),
+                    str(self.copilot.storages.app.path),
+                ),
+            )
+        )
+
+    def _heal_speculatively(
+        self,
+        error: Exception,
+        diagnostics: list[Diagnostic],
+        signature: str,
+        memory: HealingMemory,
+        command: str,
+    ) -> None:
+        self.copilot.state(self._("Trying %d fixes in parallel.") % self.candidates)
+        speculative_healing = SpeculativeHealing(
+            self.team,
+            self.copilot,
+            error,
+            command,
+            self.candidates,
+            previous_attempts=memory.describe(signature),
+            japanese_mode=self.japanese_mode,
+            preflight=self.preflight,
+            diagnostics=diagnostics,
+        )
+        winner = speculative_healing.run()
+        for candidate in speculative_healing.candidates:
+            if candidate.plan or candidate.diff:
+                metrics.increment("execution.healing_attempts")
+                memory.record(
+                    HealingAttempt(
+                        signature=signature,
+                        error=summarize_output(error_text(error), max_tokens=300),
+                        plan=candidate.plan,
+                        diff=candidate.diff,
+                    )
+                )
+        if winner:
+            self.copilot.state(
+                self._("Applied the fix of candidate %d (%s)")
+                % (winner.number, winner.approach)
+            )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import difflib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from gpt_all_star.core.storage import Storage
+
+MAX_DIFF_CHARS = 3000
+MAX_ATTEMPTS_PER_SIGNATURE = 2
+
+
+def snapshot(storage: Storage) -> dict[str, str]:
+    return {
+        str(path): content for path, content in storage.recursive_file_search().items()
+    }
+
+
+def diff_snapshots(before: dict[str, str], after: dict[str, str], root: str) -> str:
+    diffs = []
+    for path in sorted(set(before) | set(after)):
+        if before.get(path) == after.get(path):
+            continue
+        name = path.removeprefix(f"{root}/")
+        diffs.extend(
+            difflib.unified_diff(
+                before.get(path, "").splitlines(),
+                after.get(path, "").splitlines(),
+                f"a/{name}" if path in before else "/dev/null",
+                f"b/{name}" if path in after else "/dev/null",
+                lineterm="",
+            )
+        )
+    diff = "\n".join(diffs)
+    if len(diff) > MAX_DIFF_CHARS:
+        diff = diff[:MAX_DIFF_CHARS] + "\n... (diff truncated)"
+    return diff
+
+
+@dataclass
+class HealingAttempt:
+    signature: str
+    error: str
+    plan: list[dict] = field(default_factory=list)
+    diff: str = ""
+    timestamp: str = field(
+        default_factory=lambda: datetime.now().isoformat(timespec="seconds")
+    )
+
+    def describe(self, number: int) -> str:
+        plan = "\n".join(
+            f"- {json.dumps(task, ensure_ascii=False)}" for task in self.plan
+        )
+        return f"""### Attempt {number} ({self.timestamp})
+Error:
+```
+{self.error}
+```
+Plan:
+{plan or "N/A"}
+Changes:
+```diff
+{self.diff or "No file was changed."}
+```"""
+
+
+class HealingMemory:
+    """Healing attempts of one execution, keyed by the signature of the error they addressed."""
+
+    def __init__(self) -> None:
+        self.attempts: list[HealingAttempt] = []
+
+    def record(self, attempt: HealingAttempt) -> None:
+        self.attempts.append(attempt)
+
+    def failed_attempts(self, signature: str) -> list[HealingAttempt]:
+        return [a for a in self.attempts if a.signature == signature]
+
+    def should_escalate(self, signature: str) -> bool:
+        return len(self.failed_attempts(signature)) >= MAX_ATTEMPTS_PER_SIGNATURE
+
+    def describe(self, signature: str) -> str | None:
+        """Earlier attempts, those that addressed the same error first."""
+        if not self.attempts:
+            return None
+        same = self.failed_attempts(signature)
+        others = [a for a in self.attempts if a.signature != signature]
+        sections = []
+        if same:
+            sections.append(
+                "The following attempts already tried to fix this same error and failed. "
+                "Do not repeat them, take a different approach:\n"
+                + "\n".join(a.describe(i + 1) for i, a in enumerate(same))
+            )
+        if others:
+            sections.append(
+                "Earlier attempts fixed other errors with these changes:\n"
+                + "\n".join(a.describe(i + 1 + len(same)) for i, a in enumerate(others))
+            )
+        return "\n\n".join(sections)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+from gpt_all_star.core.agents.chain import Chain
+from gpt_all_star.core.dependencies import MANIFEST_FILE
+from gpt_all_star.core.message import Message
+from gpt_all_star.core.metrics import metrics
+from gpt_all_star.core.storage import Storages
+from gpt_all_star.helper.paths import EXCLUDED_DIRS, RUN_COMMAND_FILE
+
+CACHE_FILE = RUN_COMMAND_FILE
+RUN_SCRIPT = "run.sh"
+PROCFILE = "Procfile"
+# Files whose content decides how the app is started, the cache key of a command.
+MARKER_FILES = [
+    RUN_SCRIPT,
+    MANIFEST_FILE,
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    PROCFILE,
+    "manage.py",
+    "index.html",
+]
+PACKAGE_MANAGERS = [("pnpm-lock.yaml", "pnpm"), ("yarn.lock", "yarn")]
+START_SCRIPTS = ["start", "dev", "serve", "preview"]
+SKIPPED_DIRS = EXCLUDED_DIRS + ["dist"]
+PORT_OPTION_PATTERN = re.compile(r"--port\b")
+
+COMMAND_PROMPT = """
+# Instructions
+---
+Generate an command to execute the application.
+
+# Constraints
+---
+- Check the current implementation and directory structure and be sure to launch the application.
+- If run.sh exists, it should be used first. To use it, move to the directory where run.sh exists, and then run `sh . /run.sh` after moving to the directory where run.sh exists.
+
+# Current Implementation
+---
+{implementation}
+"""
+
+
+def _run_scripts(app_path: Path) -> list[Path]:
+    scripts = []
+    for root, dirs, files in os.walk(app_path):
+        dirs[:] = [d for d in dirs if d not in SKIPPED_DIRS]
+        if RUN_SCRIPT in files:
+            scripts.append((Path(root) / RUN_SCRIPT).relative_to(app_path))
+    return sorted(scripts)
+
+
+def package_manager(app_path: Path) -> str:
+    for lock_file, manager in PACKAGE_MANAGERS:
+        if (app_path / lock_file).is_file():
+            return manager
+    return "npm"
+
+
+def _script_command(manager: str, script: str, body: str) -> str:
+    if script == "start":
+        command = f"{manager} start"
+    elif manager == "npm":
+        command = f"npm run {script}"
+    else:
+        command = f"{manager} {script}"
+    if "vite" in body and not PORT_OPTION_PATTERN.search(body):
+        # Vite ignores PORT, the leased port is passed as an option instead.
+        command += " -- --port $PORT" if manager == "npm" else " --port $PORT"
+    return command
+
+
+def start_command(path: Path) -> Optional[tuple[str, str]]:
+    """Package manager and command of the start script of `path/package.json`."""
+    try:
+        manifest = json.loads((path / MANIFEST_FILE).read_text("utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict):
+        return None
+    scripts = manifest.get("scripts") or {}
+    manager = package_manager(path)
+    for script in START_SCRIPTS:
+        if script in scripts:
+            return manager, _script_command(manager, script, scripts[script])
+    return None
+
+
+def detect_run_command(app_path: Path) -> Optional[str]:
+    """The command starting the app, or None when only an LLM can tell."""
+    scripts = _run_scripts(app_path)
+    if Path(RUN_SCRIPT) in scripts:
+        return f"sh ./{RUN_SCRIPT}"
+    if len(scripts) == 1:
+        return f"cd {scripts[0].parent} && sh ./{RUN_SCRIPT}"
+    if len(scripts) > 1:
+        return None
+
+    if (app_path / PROCFILE).is_file():
+        for line in (app_path / PROCFILE).read_text("utf-8").splitlines():
+            process, _, command = line.partition(":")
+            if process.strip() == "web" and command.strip():
+                return command.strip()
+    if (app_path / MANIFEST_FILE).is_file():
+        if start := start_command(app_path):
+            manager, command = start
+            # Cheap when node_modules is up to date, which it usually is after a restore.
+            return f"{manager} install && {command}"
+        return None
+
+    if (app_path / "manage.py").is_file():
+        return "python3 manage.py runserver 0.0.0.0:$PORT"
+    if (app_path / "index.html").is_file():
+        return "python3 -m http.server $PORT"
+    return None
+
+
+def markers_hash(app_path: Path) -> str:
+    digest = hashlib.sha256()
+    for name in MARKER_FILES:
+        path = app_path / name
+        digest.update(name.encode())
+        digest.update(path.read_bytes() if path.is_file() else b"\0")
+    for script in _run_scripts(app_path):
+        digest.update(str(script).encode())
+        digest.update((app_path / script).read_bytes())
+    return digest.hexdigest()
+
+
+def infer_run_command(storages: Storages, debug_mode: bool = False) -> str:
+    return (
+        Chain()
+        .create_command_to_execute_application_chain()
+        .invoke(
+            {
+                "messages": [
+                    Message.create_human_message(
+                        COMMAND_PROMPT.format(
+                            implementation=storages.overview_source_code(
+                                debug_mode=debug_mode
+                            )
+                        )
+                    )
+                ],
+            }
+        )["command"]
+    )
+
+
+def resolve_run_command(storages: Storages, debug_mode: bool = False) -> str:
+    """Detect the command starting the app, asking the LLM only when detection fails.
+
+    Commands are cached in the project by the hash of the files they depend on.
+    """
+    cache_path = storages.root.path / CACHE_FILE
+    try:
+        cache = json.loads(cache_path.read_text("utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    key = markers_hash(storages.app.path)
+    if command := cache.get(key):
+        metrics.increment("run_command.cache_hits")
+        return command
+
+    if command := detect_run_command(storages.app.path):
+        metrics.increment("run_command.detected")
+    else:
+        metrics.increment("run_command.inferred")
+        command = infer_run_command(storages, debug_mode)
+    cache_path.write_text(json.dumps({key: command}, indent=2), encoding="utf-8")
+    return command
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Optional
+
+from gpt_all_star.core.agents.copilot import Copilot
+from gpt_all_star.core.diagnostics import Diagnostic
+from gpt_all_star.core.execution.healing_memory import diff_snapshots, snapshot
+from gpt_all_star.core.execution.workspace import Workspace
+from gpt_all_star.core.metrics import metrics
+from gpt_all_star.core.preflight import PreflightError, blocking, run_preflight
+from gpt_all_star.core.steps.healing.healing import Healing
+from gpt_all_star.core.team import Team
+
+# Given to the candidates in turn so their plans differ.
+APPROACHES = [
+    "Make the smallest change that fixes the error.",
+    "Fix the root cause of the error, even if several files have to change.",
+    "Check dependencies and imports first: missing packages in package.json, wrong paths and wrong export names.",
+    "Rewrite the failing code in the simplest way that still satisfies the specifications.",
+]
+
+
+@dataclass
+class Candidate:
+    number: int
+    approach: str
+    workspace: Workspace
+    copilot: Copilot
+    team: Team
+    plan: list[dict] = field(default_factory=list)
+    diff: str = ""
+    error: Optional[Exception] = None
+
+
+class SpeculativeHealing:
+    """Heal with several candidates at once, each in its own workspace.
+
+    The first candidate whose app starts and passes the browser checks is promoted
+    into the project and the others are discarded, so recovering takes about as long
+    as a single healing attempt.
+    """
+
+    def __init__(
+        self,
+        team: Team,
+        copilot: Copilot,
+        error_message: Exception,
+        command: str,
+        candidates: int,
+        previous_attempts: Optional[str] = None,
+        japanese_mode: bool = False,
+        preflight: bool = True,
+        diagnostics: Optional[list[Diagnostic]] = None,
+    ) -> None:
+        self.error_message = error_message
+        self.diagnostics = diagnostics
+        self.command = command
+        self.previous_attempts = previous_attempts
+        self.japanese_mode = japanese_mode
+        self.preflight = preflight
+        # Set once a candidate is promoted, the others stop after their current turn.
+        self._promoted = threading.Event()
+        self.candidates = []
+        for number in range(candidates):
+            workspace = Workspace(copilot.storages)
+            candidate_copilot = copilot.fork(workspace.storages)
+            candidate_team = team.fork(candidate_copilot)
+            candidate_team.cancelled = self._promoted
+            self.candidates.append(
+                Candidate(
+                    number=number + 1,
+                    approach=APPROACHES[number % len(APPROACHES)],
+                    workspace=workspace,
+                    copilot=candidate_copilot,
+                    team=candidate_team,
+                )
+            )
+
+    def run(self) -> Optional[Candidate]:
+        """Run the candidates and return the promoted one, if any passed."""
+        pool = ThreadPoolExecutor(max_workers=len(self.candidates))
+        futures = {
+            pool.submit(self._attempt, candidate): candidate
+            for candidate in self.candidates
+        }
+        winner = None
+        try:
+            for future in as_completed(futures):
+                candidate = futures[future]
+                if future.exception() is not None:
+                    candidate.error = future.exception()
+                elif future.result():
+                    self._promoted.set()
+                    candidate.workspace.promote()
+                    metrics.increment("speculative_healing.promoted")
+                    winner = candidate
+                    break
+        finally:
+            # Candidates still running stop after their current agent turn; their
+            # workspaces are only removed once nothing writes to them anymore.
+            self._promoted.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            for candidate in self.candidates:
+                candidate.workspace.discard()
+        if winner is None:
+            metrics.increment("speculative_healing.failed")
+        return winner
+
+    def _attempt(self, candidate: Candidate) -> bool:
+        if self._promoted.is_set():
+            return False
+        healing = Healing(
+            copilot=candidate.copilot,
+            error_message=self.error_message,
+            display=False,
+            japanese_mode=self.japanese_mode,
+            diagnostics=self.diagnostics,
+        )
+        healing.previous_attempts = self.previous_attempts
+        healing.approach = candidate.approach
+        before = snapshot(candidate.workspace.storages.app)
+        candidate.team.run(healing)
+        metrics.increment("speculative_healing.candidates")
+        candidate.plan = candidate.team.last_plan
+        candidate.diff = diff_snapshots(
+            before,
+            snapshot(candidate.workspace.storages.app),
+            str(candidate.workspace.path),
+        )
+        if self._promoted.is_set():
+            return False
+        if self.preflight and (
+            problems := blocking(run_preflight(candidate.workspace.storages))
+        ):
+            # Problems the candidate left unchanged may be false positives, the app decides.
+            if problems != getattr(self.error_message, "diagnostics", None):
+                candidate.error = PreflightError(problems)
+                return False
+        try:
+            candidate.copilot.run_command(self.command, display=False)
+        except Exception as e:
+            candidate.error = e
+            return False
+        return True
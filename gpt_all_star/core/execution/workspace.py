@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import dataclasses
+import filecmp
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from gpt_all_star.core.dependencies import (
+    DEPENDENCY_DIR,
+    dependency_hashes,
+    link_tree,
+)
+from gpt_all_star.core.storage import Storage, Storages
+from gpt_all_star.helper.paths import EXCLUDED_DIRS, INDEX_DIR, WORKSPACE_DIR
+
+# Left behind when a workspace is promoted, they belong to the run and not to the app.
+# node_modules of the app is linked instead of copied.
+SKIPPED_DIRS = [d for d in EXCLUDED_DIRS if d != DEPENDENCY_DIR]
+
+
+class Workspace:
+    """A private copy of the app a candidate can change and run without touching the project.
+
+    Source files are copied and `node_modules` is recreated with hard links, so a
+    workspace is cheap to create and dependencies are not installed again. The vector
+    index is copied next to the workspace, so searches see the workspace and only
+    its changes are embedded.
+    """
+
+    def __init__(self, storages: Storages) -> None:
+        self.source = storages.app.path
+        self.path = storages.root.path / WORKSPACE_DIR / uuid.uuid4().hex[:8]
+        self.index_dir = self.path.with_name(self.path.name + INDEX_DIR)
+        self._copy()
+        if storages.index_dir.is_dir():
+            shutil.copytree(storages.index_dir, self.index_dir)
+        self.storages = dataclasses.replace(
+            storages, app=Storage(self.path), index_dir=self.index_dir
+        )
+
+    def _copy(self) -> None:
+        for root, dirs, files in os.walk(self.source):
+            relative = Path(root).relative_to(self.source)
+            if relative == Path("."):
+                if (self.source / DEPENDENCY_DIR).is_dir():
+                    link_tree(self.source / DEPENDENCY_DIR, self.path / DEPENDENCY_DIR)
+            dirs[:] = [
+                d
+                for d in dirs
+                if d not in SKIPPED_DIRS
+                and not (relative == Path(".") and d == DEPENDENCY_DIR)
+            ]
+            (self.path / relative).mkdir(parents=True, exist_ok=True)
+            for name in files:
+                shutil.copy2(Path(root) / name, self.path / relative / name)
+
+    def _files(self, path: Path) -> set[str]:
+        files = set()
+        for root, dirs, filenames in os.walk(path):
+            relative = Path(root).relative_to(path)
+            dirs[:] = [
+                d
+                for d in dirs
+                if d not in SKIPPED_DIRS
+                and not (relative == Path(".") and d == DEPENDENCY_DIR)
+            ]
+            files.update(str(relative / name) for name in filenames)
+        return {os.path.normpath(file) for file in files}
+
+    def changes(self) -> tuple[list[str], list[str]]:
+        """Files written and files deleted in the workspace, relative to the app."""
+        original = self._files(self.source)
+        current = self._files(self.path)
+        written = [
+            file
+            for file in sorted(current)
+            if file not in original
+            or not filecmp.cmp(self.source / file, self.path / file, shallow=False)
+        ]
+        return written, sorted(original - current)
+
+    def promote(self) -> list[str]:
+        """Apply the changes of the workspace to the app and return the changed files."""
+        written, deleted = self.changes()
+        dependencies_changed = dependency_hashes(self.path) != dependency_hashes(
+            self.source
+        ) or (
+            (self.path / DEPENDENCY_DIR).is_dir()
+            and not (self.source / DEPENDENCY_DIR).is_dir()
+        )
+        for file in written:
+            (self.source / file).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.path / file, self.source / file)
+        for file in deleted:
+            (self.source / file).unlink(missing_ok=True)
+        if dependencies_changed and (self.path / DEPENDENCY_DIR).is_dir():
+            shutil.rmtree(self.source / DEPENDENCY_DIR, ignore_errors=True)
+            link_tree(self.path / DEPENDENCY_DIR, self.source / DEPENDENCY_DIR)
+        return written + deleted
+
+    def discard(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+        shutil.rmtree(self.index_dir, ignore_errors=True)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from gpt_all_star.core.metrics import metrics
+from gpt_all_star.helper.paths import EXCLUDED_DIRS, EXCLUDED_FILES
+
+
+class FileCache:
+    """Listing and contents of a source tree, re-read only when a directory or file stat changes."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).resolve()
+        self._lock = threading.Lock()
+        self._directories: dict[str, float] = {}
+        self._files: list[str] = []
+        self._contents: dict[str, tuple[tuple[float, int], str]] = {}
+
+    def files(self) -> list[tuple[str, int]]:
+        """Relative paths and sizes of the files in the tree."""
+        with self._lock:
+            if not self._listing_is_current():
+                self._walk()
+            files = []
+            for relative_path in self._files:
+                try:
+                    files.append(
+                        (relative_path, (self.path / relative_path).stat().st_size)
+                    )
+                except FileNotFoundError:
+                    continue
+            return files
+
+    def read(self, relative_path: str) -> str:
+        file_path = self.path / relative_path
+        stat = file_path.stat()
+        signature = (stat.st_mtime, stat.st_size)
+        with self._lock:
+            cached = self._contents.get(relative_path)
+            if cached and cached[0] == signature:
+                metrics.increment("file_cache.hits")
+                return cached[1]
+        metrics.increment("file_cache.misses")
+        content = file_path.read_text(encoding="utf-8")
+        with self._lock:
+            self._contents[relative_path] = (signature, content)
+        return content
+
+    def _listing_is_current(self) -> bool:
+        if not self._directories:
+            return False
+        for directory, mtime in self._directories.items():
+            try:
+                if os.stat(self.path / directory).st_mtime != mtime:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+
+    def _walk(self) -> None:
+        self._directories = {}
+        self._files = []
+        for root, dirs, filenames in os.walk(self.path):
+            dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+            relative_root = os.path.relpath(root, self.path)
+            self._directories[relative_root] = os.stat(root).st_mtime
+            self._files.extend(
+                os.path.normpath(os.path.join(relative_root, filename))
+                for filename in sorted(filenames)
+                if filename not in EXCLUDED_FILES
+            )
+        for relative_path in [p for p in self._contents if p not in self._files]:
+            del self._contents[relative_path]
+
+
+_caches: dict[str, FileCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_file_cache(path: str | Path) -> FileCache:
+    path = Path(path).resolve()
+    with _caches_lock:
+        if str(path) not in _caches:
+            _caches[str(path)] = FileCache(path)
+        return _caches[str(path)]
@@ -14,6 +14,8 @@ You do not need to proceed with any subsequent tasks.
 # Constraints
 ---
 - Please check the contents of the directories and files of the current implementation before executing the task.
+- Use `tree`, `grep` and `read_files` to inspect several files in a single step rather than reading them one by one.
+- To change part of an existing file, use `edit_file` with search/replace blocks or a unified diff instead of rewriting the whole file with `write_file`.
 
 # Current implementation
 ---
@@ -3,8 +3,14 @@ from enum import Enum
 
 import openai
 from langchain_anthropic import ChatAnthropic
+from langchain_core.embeddings import Embeddings
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_openai import AzureChatOpenAI, ChatOpenAI
+from langchain_openai import (
+    AzureChatOpenAI,
+    AzureOpenAIEmbeddings,
+    ChatOpenAI,
+    OpenAIEmbeddings,
+)
 
 
 class LLM_TYPE(str, Enum):
@@ -41,6 +47,27 @@ def create_llm(llm_name: LLM_TYPE) -> BaseChatModel:
         raise ValueError(f"Unsupported LLM type: {llm_name}")
 
 
+def create_embeddings(llm_name: LLM_TYPE) -> Embeddings:
+    if llm_name == LLM_TYPE.OPENAI:
+        return OpenAIEmbeddings(
+            model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+            base_url=os.getenv("OPENAI_API_BASE"),
+        )
+    elif llm_name == LLM_TYPE.AZURE:
+        return AzureOpenAIEmbeddings(
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            openai_api_version=os.getenv(
+                "AZURE_OPENAI_API_VERSION", "2024-05-01-preview"
+            ),
+            azure_deployment=os.getenv(
+                "AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME", "text-embedding-3-small"
+            ),
+        )
+    else:
+        raise ValueError(f"{llm_name.value} does not provide embeddings")
+
+
 def _create_chat_openai(
     model_name: str, temperature: float, base_url: str | None
 ) -> ChatOpenAI:
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Optional, TextIO
+
+from rich.text import Text
+
+from gpt_all_star.core.command_output import (
+    ERROR_PATTERN,
+    NOISE_PATTERN,
+    extract_error_blocks,
+)
+
+MAX_BUFFER_LINES = 2000
+MAX_BUFFER_BYTES = 1024 * 1024
+MAX_EVICTED_ERROR_LINES = 50
+ERROR_TAIL_LINES = 200
+RENDER_INTERVAL = 0.2
+
+
+class OutputBuffer:
+    """The last lines of an output stream, capped by line count and bytes.
+
+    Error lines pushed out of the buffer are kept apart, so a failure of a long
+    running process can still be explained from its tail. With `spill_path` every
+    line is also written to that file.
+    """
+
+    def __init__(
+        self,
+        max_lines: int = MAX_BUFFER_LINES,
+        max_bytes: int = MAX_BUFFER_BYTES,
+        spill_path: Optional[Path] = None,
+    ) -> None:
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.spill_path = spill_path
+        self.dropped = 0
+        self._lines: deque[str] = deque()
+        self._bytes = 0
+        self._evicted_errors: deque[str] = deque(maxlen=MAX_EVICTED_ERROR_LINES)
+        self._lock = threading.Lock()
+        self._spill: Optional[TextIO] = None
+        if spill_path:
+            spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = spill_path.open("a", encoding="utf-8")
+
+    def append(self, line: str) -> None:
+        with self._lock:
+            if self._spill:
+                self._spill.write(f"{line}\n")
+            self._lines.append(line)
+            self._bytes += len(line.encode("utf-8")) + 1
+            while self._lines and (
+                len(self._lines) > self.max_lines or self._bytes > self.max_bytes
+            ):
+                evicted = self._lines.popleft()
+                self._bytes -= len(evicted.encode("utf-8")) + 1
+                self.dropped += 1
+                if ERROR_PATTERN.search(evicted) and not NOISE_PATTERN.match(evicted):
+                    self._evicted_errors.append(evicted)
+
+    def lines(self) -> list[str]:
+        with self._lock:
+            return list(self._lines)
+
+    def tail(self, count: Optional[int] = None) -> str:
+        lines = self.lines()
+        dropped = self.dropped
+        if count is not None and len(lines) > count:
+            dropped += len(lines) - count
+            lines = lines[-count:]
+        if dropped:
+            lines = [f"... ({dropped} earlier lines dropped)", *lines]
+        return "\n".join(lines)
+
+    def errors(self) -> list[str]:
+        """Error lines pushed out of the buffer, then the error blocks still in it."""
+        with self._lock:
+            evicted = list(self._evicted_errors)
+        return list(dict.fromkeys(evicted + extract_error_blocks(self.lines())))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._spill:
+                self._spill.close()
+                self._spill = None
+
+
+class ConsoleBatcher:
+    """Render lines in batches instead of one print per line.
+
+    Without `background`, the owner renders by awaiting `render` on its event loop.
+    """
+
+    def __init__(
+        self, console, interval: float = RENDER_INTERVAL, background: bool = True
+    ) -> None:
+        self.console = console
+        self.interval = interval
+        self._pending: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(
+                target=self._render_periodically, daemon=True
+            )
+            self._thread.start()
+
+    def write(self, line: str, style: str) -> None:
+        with self._lock:
+            self._pending.append((line, style))
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        text = Text()
+        for index, (line, style) in enumerate(pending):
+            text.append(line + ("\n" if index < len(pending) - 1 else ""), style=style)
+        self.console.print(text)
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+
+    async def render(self) -> None:
+        while not self._closed.is_set():
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    def _render_periodically(self) -> None:
+        while not self._closed.wait(self.interval):
+            self.flush()
+
+
+def failure_report(outputs: dict[str, OutputBuffer]) -> dict[str, str]:
+    """Tails and extracted errors of the outputs, the argument of a run failure."""
+    report = {name: buffer.tail(ERROR_TAIL_LINES) for name, buffer in outputs.items()}
+    if errors := [error for buffer in outputs.values() for error in buffer.errors()]:
+        report["errors"] = "\n".join(dict.fromkeys(errors))
+    return report
+
+
+def buffer_from_env(log_dir: Path, name: str) -> OutputBuffer:
+    spill = os.getenv("RUN_OUTPUT_SPILL", "false").lower() == "true"
+    return OutputBuffer(
+        max_lines=int(os.getenv("RUN_OUTPUT_MAX_LINES", MAX_BUFFER_LINES)),
+        max_bytes=int(os.getenv("RUN_OUTPUT_MAX_BYTES", MAX_BUFFER_BYTES)),
+        spill_path=log_dir / name if spill else None,
+    )
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import threading
+from typing import Optional
+
+from gpt_all_star.core.metrics import metrics
+
+DEFAULT_PORT_RANGE = "3000-3999"
+# Default ports of common backends. The backend of a full-stack app keeps its own
+# port, so the frontend is leased one of these only when no other port is free.
+BACKEND_DEFAULT_PORTS = [3000, 3001, 4000, 5000, 5001, 8000, 8080]
+PROBE_TIMEOUT = 5
+
+
+class PortsExhaustedError(Exception):
+    pass
+
+
+def parse_port_range(text: str) -> range:
+    start, _, end = text.partition("-")
+    return range(int(start), int(end or start) + 1)
+
+
+def is_port_free(port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("localhost", port))
+        except OSError:
+            return False
+        return True
+
+
+async def probe_http(port: int, host: str = "localhost") -> bool:
+    """Whether an HTTP server on the port answers `/` with a success or a redirect."""
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), PROBE_TIMEOUT
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        writer.write(
+            f"GET / HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), PROBE_TIMEOUT)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        writer.close()
+    parts = status_line.split()
+    return len(parts) >= 2 and parts[1].isdigit() and 200 <= int(parts[1]) < 400
+
+
+def _group_exists(pgid: int) -> bool:
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PortRegistry:
+    """Ports leased to running apps, so apps executed at the same time do not collide.
+
+    A lease can be attached to the process group of the app; leases whose group
+    has exited are freed the next time a port is leased.
+    """
+
+    def __init__(self, ports: range) -> None:
+        self.ports = ports
+        self._lock = threading.Lock()
+        self._leases: dict[int, Optional[int]] = {}
+
+    def lease(self) -> int:
+        with self._lock:
+            self._reap()
+            for port in sorted(self.ports, key=lambda p: p in BACKEND_DEFAULT_PORTS):
+                if port not in self._leases and is_port_free(port):
+                    self._leases[port] = None
+                    metrics.increment("ports.leased")
+                    return port
+        raise PortsExhaustedError(
+            f"No free port in {self.ports.start}-{self.ports.stop - 1}"
+        )
+
+    def attach(self, port: int, pgid: int) -> None:
+        with self._lock:
+            if port in self._leases:
+                self._leases[port] = pgid
+
+    def release(self, port: int) -> None:
+        with self._lock:
+            self._leases.pop(port, None)
+
+    def leased(self) -> dict[int, Optional[int]]:
+        with self._lock:
+            self._reap()
+            return dict(self._leases)
+
+    def _reap(self) -> None:
+        for port, pgid in list(self._leases.items()):
+            if pgid is not None and not _group_exists(pgid):
+                del self._leases[port]
+                metrics.increment("ports.reaped")
+
+
+_registry: Optional[PortRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_port_registry() -> PortRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PortRegistry(
+                parse_port_range(os.getenv("APP_PORT_RANGE", DEFAULT_PORT_RANGE))
+            )
+        return _registry
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from gpt_all_star.core.dependencies import DEPENDENCY_SECTIONS, MANIFEST_FILE
+from gpt_all_star.core.diagnostics import Diagnostic
+from gpt_all_star.core.metrics import metrics
+from gpt_all_star.core.storage import Storages
+from gpt_all_star.core.symbol_index import RESOLVABLE_EXTENSIONS, FileSymbols
+
+JAVASCRIPT_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+# Prefixes of path aliases and subpath imports, resolved by the bundler config.
+ALIAS_PREFIXES = ("@/", "~/", "#")
+# Top-level names of `require('module').builtinModules`, subpaths like `fs/promises`
+# resolve to them.
+NODE_BUILTINS = {
+    "_http_agent",
+    "_http_client",
+    "_http_common",
+    "_http_incoming",
+    "_http_outgoing",
+    "_http_server",
+    "_stream_duplex",
+    "_stream_passthrough",
+    "_stream_readable",
+    "_stream_transform",
+    "_stream_wrap",
+    "_stream_writable",
+    "_tls_common",
+    "_tls_wrap",
+    "assert",
+    "async_hooks",
+    "buffer",
+    "child_process",
+    "cluster",
+    "console",
+    "constants",
+    "crypto",
+    "dgram",
+    "diagnostics_channel",
+    "dns",
+    "domain",
+    "events",
+    "fs",
+    "http",
+    "http2",
+    "https",
+    "inspector",
+    "module",
+    "net",
+    "os",
+    "path",
+    "perf_hooks",
+    "process",
+    "punycode",
+    "querystring",
+    "readline",
+    "repl",
+    "stream",
+    "string_decoder",
+    "sys",
+    "timers",
+    "tls",
+    "trace_events",
+    "tty",
+    "url",
+    "util",
+    "v8",
+    "vm",
+    "wasi",
+    "worker_threads",
+    "zlib",
+}
+# The bundled grammars reject some valid syntax, like import attributes, `using`
+# declarations or `accessor` fields, so syntax findings never stop the app from
+# starting; they accompany its failure instead.
+ADVISORY_SOURCES = ["syntax"]
+
+
+class PreflightError(Exception):
+    """Problems found before the app was started, raised like a run failure."""
+
+    def __init__(self, diagnostics: list[Diagnostic]) -> None:
+        super().__init__(
+            {"preflight": "\n".join(str(diagnostic) for diagnostic in diagnostics)}
+        )
+        self.diagnostics = diagnostics
+
+
+def blocking(diagnostics: list[Diagnostic]) -> list[Diagnostic]:
+    """Diagnostics that keep the app from being started."""
+    return [d for d in diagnostics if d.source not in ADVISORY_SOURCES]
+
+
+def package_name(source: str) -> Optional[str]:
+    """Package of a bare import, None for relative, builtin and aliased imports."""
+    if source.startswith((".", "/", *ALIAS_PREFIXES)) or ":" in source:
+        return None
+    parts = source.split("/")
+    name = "/".join(parts[:2]) if source.startswith("@") else parts[0]
+    if name in NODE_BUILTINS:
+        return None
+    return name
+
+
+def _declared_packages(app_path: Path, path: str, cache: dict) -> Optional[set[str]]:
+    """Packages declared by the nearest package.json of a file, None without one."""
+    directory = os.path.dirname(path)
+    while True:
+        if directory not in cache:
+            try:
+                manifest = json.loads(
+                    (app_path / directory / MANIFEST_FILE).read_text("utf-8")
+                )
+            except (OSError, ValueError):
+                manifest = None
+            cache[directory] = (
+                {
+                    name
+                    for section in DEPENDENCY_SECTIONS
+                    for name in manifest.get(section) or {}
+                }
+                if isinstance(manifest, dict)
+                else None
+            )
+        if cache[directory] is not None or not directory:
+            return cache[directory]
+        directory = os.path.dirname(directory)
+
+
+def _exists(app_path: Path, path: str, source: str) -> bool:
+    """Whether a relative import names a file the index does not parse, like an image."""
+    base = app_path / os.path.dirname(path) / source.split("?")[0]
+    return base.exists() or any(
+        base.with_name(base.name + extension).is_file()
+        for extension in RESOLVABLE_EXTENSIONS
+    )
+
+
+def check_file(
+    app_path: Path, symbols: FileSymbols, manifests: dict
+) -> list[Diagnostic]:
+    diagnostics = [
+        Diagnostic("syntax", message, symbols.path, line, column)
+        for line, column, message in symbols.syntax_errors
+    ]
+    if not symbols.path.endswith(JAVASCRIPT_EXTENSIONS):
+        return diagnostics
+
+    for item in symbols.imports:
+        if item.source.startswith("."):
+            if item.resolved is None and not _exists(
+                app_path, symbols.path, item.source
+            ):
+                diagnostics.append(
+                    Diagnostic(
+                        "import",
+                        f"Cannot resolve '{item.source}'",
+                        symbols.path,
+                        item.line,
+                    )
+                )
+        elif name := package_name(item.source):
+            declared = _declared_packages(app_path, symbols.path, manifests)
+            if declared is not None and name not in declared:
+                diagnostics.append(
+                    Diagnostic(
+                        "dependency",
+                        f"'{name}' is imported but not declared in {MANIFEST_FILE}",
+                        symbols.path,
+                        item.line,
+                    )
+                )
+
+    defaults = [e for e in symbols.exports if e.split(" ")[0] == "default"]
+    if len(defaults) > 1:
+        diagnostics.append(
+            Diagnostic(
+                "export",
+                f"{len(defaults)} default exports: {', '.join(defaults)}",
+                symbols.path,
+            )
+        )
+    return diagnostics
+
+
+def run_preflight(storages: Storages) -> list[Diagnostic]:
+    """Problems the app would fail on, found from the symbol index without running it.
+
+    Only files changed since the last refresh are parsed again, so a pass over an
+    unchanged tree costs little more than a stat of each file.
+    """
+    app_path = storages.app.path
+    manifests: dict = {}
+    diagnostics = [
+        diagnostic
+        for symbols in storages.symbol_index.symbols().values()
+        for diagnostic in check_file(app_path, symbols, manifests)
+    ]
+    metrics.increment("preflight.runs")
+    if diagnostics:
+        metrics.increment("preflight.problems", len(diagnostics))
+    return diagnostics
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from gpt_all_star.core.metrics import metrics
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.05
+TERMINATE_GRACE_SECONDS = 5
+MAX_LINE_BYTES = 1024 * 1024
+
+
+def _limit_from_env(name: str, default: int, scale: int = 1) -> Optional[int]:
+    value = int(os.getenv(name, default))
+    return value * scale if value > 0 else None
+
+
+@dataclass
+class ResourceLimits:
+    """rlimits applied to a command and inherited by every process it starts."""
+
+    cpu_seconds: Optional[int] = None
+    memory_bytes: Optional[int] = None
+    open_files: Optional[int] = None
+
+    @classmethod
+    def from_env(cls, app: bool = False) -> ResourceLimits:
+        """Limits of agent commands, or of the app when `app` is set.
+
+        The app is a long running server, so its CPU time is only limited when
+        APP_MAX_CPU_SECONDS is set.
+        """
+        return cls(
+            cpu_seconds=(
+                _limit_from_env("APP_MAX_CPU_SECONDS", 0)
+                if app
+                else _limit_from_env("PROCESS_MAX_CPU_SECONDS", 1800)
+            ),
+            memory_bytes=_limit_from_env("PROCESS_MAX_MEMORY_MB", 0, 1024 * 1024),
+            open_files=_limit_from_env("PROCESS_MAX_OPEN_FILES", 4096),
+        )
+
+    def shell_prefix(self) -> str:
+        """`ulimit` calls setting the soft limits, run by the shell before the command.
+
+        Setting them in the child with `preexec_fn` is not safe while other threads
+        run, and commands are started from several threads.
+        """
+        if resource is None:
+            return ""
+        prefix = ""
+        for option, limit, value in [
+            ("-t", resource.RLIMIT_CPU, self.cpu_seconds),
+            # ulimit takes the address space in kilobytes.
+            ("-v", resource.RLIMIT_AS, self.memory_bytes and self.memory_bytes // 1024),
+            ("-n", resource.RLIMIT_NOFILE, self.open_files),
+        ]:
+            if value is None:
+                continue
+            _, hard = resource.getrlimit(limit)
+            if hard != resource.RLIM_INFINITY:
+                value = min(
+                    value, hard // 1024 if limit == resource.RLIMIT_AS else hard
+                )
+            prefix += f"ulimit -S {option} {value}; "
+        return prefix
+
+
+@dataclass
+class ProcessUsage:
+    peak_rss_bytes: int
+    cpu_seconds: float
+    wall_seconds: float
+
+    def __str__(self) -> str:
+        return (
+            f"peak RSS {self.peak_rss_bytes / 1024 / 1024:.1f} MB, "
+            f"CPU {self.cpu_seconds:.1f}s, wall {self.wall_seconds:.1f}s"
+        )
+
+
+@dataclass
+class CompletedCommand:
+    returncode: Optional[int]
+    """None when the command was stopped on timeout."""
+    stdout: str
+    stderr: str
+    usage: Optional[ProcessUsage]
+
+
+class ProcessLostError(ChildProcessError):
+    """The process was reaped elsewhere, so its exit status is unknown."""
+
+
+class SupervisedProcess:
+    """A command running in its own process group, reaped with its resource usage."""
+
+    def __init__(self, popen: subprocess.Popen, command: str) -> None:
+        self.popen = popen
+        self.command = command
+        self.started = time.monotonic()
+        self.usage: Optional[ProcessUsage] = None
+        self.lost = False
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> int:
+        return self.popen.pid
+
+    @property
+    def stdout(self):
+        return self.popen.stdout
+
+    @property
+    def stderr(self):
+        return self.popen.stderr
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.popen.returncode
+
+    def poll(self) -> Optional[int]:
+        """The exit code, None while running; raises ProcessLostError when unknown."""
+        with self._lock:
+            if self.popen.returncode is None and not self.lost:
+                self._reap(os.WNOHANG)
+        if self.lost:
+            raise ProcessLostError(
+                f"The exit status of `{self.command}` is unknown, "
+                "the process was reaped elsewhere"
+            )
+        return self.popen.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.command, timeout)
+            time.sleep(POLL_INTERVAL)
+        return self.popen.returncode
+
+    async def wait_async(self, timeout: Optional[float] = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.command, timeout)
+            await asyncio.sleep(POLL_INTERVAL)
+        return self.popen.returncode
+
+    async def terminate_async(
+        self, grace: float = TERMINATE_GRACE_SECONDS
+    ) -> Optional[int]:
+        self._signal_group(signal.SIGTERM)
+        try:
+            return await self.wait_async(grace)
+        except subprocess.TimeoutExpired:
+            self._signal_group(signal.SIGKILL)
+            return await self.wait_async()
+        except ProcessLostError:
+            return None
+        finally:
+            self._signal_group(signal.SIGKILL)
+
+    async def lines(self, name: str) -> AsyncIterator[str]:
+        """Lines of `stdout` or `stderr`, read on the running event loop."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), getattr(self, name)
+        )
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The line overran the limit and was dropped, go on with what follows.
+                    line = await reader.read(MAX_LINE_BYTES)
+                if not line:
+                    return
+                yield line.decode("utf-8", errors="replace")
+        finally:
+            transport.close()
+
+    def terminate(self, grace: float = TERMINATE_GRACE_SECONDS) -> Optional[int]:
+        """Stop the whole process tree, killing it when it ignores SIGTERM.
+
+        Returns None when the exit status of the process is unknown.
+        """
+        self._signal_group(signal.SIGTERM)
+        try:
+            return self.wait(grace)
+        except subprocess.TimeoutExpired:
+            self._signal_group(signal.SIGKILL)
+            return self.wait()
+        except ProcessLostError:
+            return None
+        finally:
+            # Children that outlived the shell are still in the group.
+            self._signal_group(signal.SIGKILL)
+
+    def _signal_group(self, signum: int) -> None:
+        try:
+            os.killpg(self.pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _reap(self, options: int) -> None:
+        try:
+            pid, status, rusage = os.wait4(self.pid, options)
+        except ChildProcessError:
+            # Reaped elsewhere: neither the exit status nor the usage is known.
+            self.lost = True
+            metrics.increment("process.lost")
+            logger.warning(f"{self.command}: the process was reaped elsewhere")
+            return
+        if pid == 0:
+            return
+        self.popen.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        scale = 1 if sys.platform == "darwin" else 1024
+        self.usage = ProcessUsage(
+            peak_rss_bytes=rusage.ru_maxrss * scale,
+            cpu_seconds=rusage.ru_utime + rusage.ru_stime,
+            wall_seconds=time.monotonic() - self.started,
+        )
+        metrics.increment("process.commands")
+        metrics.increment("process.cpu_seconds", self.usage.cpu_seconds)
+        logger.info(f"{self.command}: {self.usage}")
+
+
+class ProcessSupervisor:
+    """Spawn shell commands with resource limits, each in its own process group."""
+
+    def __init__(
+        self,
+        limits: Optional[ResourceLimits] = None,
+        app_limits: Optional[ResourceLimits] = None,
+    ) -> None:
+        self.limits = limits or ResourceLimits.from_env()
+        self.app_limits = app_limits or ResourceLimits.from_env(app=True)
+        self._lock = threading.Lock()
+        self._running: set[SupervisedProcess] = set()
+
+    def spawn(
+        self,
+        command: str,
+        cwd: str | os.PathLike,
+        env: Optional[dict] = None,
+        limits: Optional[ResourceLimits] = None,
+    ) -> SupervisedProcess:
+        """Start a command, with `self.limits` unless other `limits` are given."""
+        limits = self.limits if limits is None else limits
+        popen = subprocess.Popen(
+            limits.shell_prefix() + command,
+            shell=True,
+            cwd=cwd,
+            env=env,
+            text=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        process = SupervisedProcess(popen, command)
+        with self._lock:
+            self._running = {
+                p for p in self._running if p.returncode is None and not p.lost
+            }
+            self._running.add(process)
+        return process
+
+    def run(
+        self,
+        command: str,
+        cwd: str | os.PathLike,
+        timeout: Optional[float] = None,
+        env: Optional[dict] = None,
+    ) -> CompletedCommand:
+        """Run a command to completion, stopping its process tree on timeout or cancel."""
+        process = self.spawn(command, cwd, env)
+        outputs = {"stdout": [], "stderr": []}
+
+        def drain(name: str) -> None:
+            outputs[name].append(getattr(process, name).read())
+
+        readers = [
+            threading.Thread(target=drain, args=(name,), daemon=True)
+            for name in outputs
+        ]
+        for reader in readers:
+            reader.start()
+        returncode = None
+        try:
+            returncode = process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            metrics.increment("process.timeouts")
+        finally:
+            if returncode is None:
+                process.terminate()
+            else:
+                process._signal_group(signal.SIGKILL)
+            for reader in readers:
+                reader.join()
+        return CompletedCommand(
+            returncode,
+            "".join(outputs["stdout"]),
+            "".join(outputs["stderr"]),
+            process.usage,
+        )
+
+    def running(self) -> list[SupervisedProcess]:
+        with self._lock:
+            return [p for p in self._running if not p.lost and p.poll() is None]
+
+    def terminate_all(self) -> None:
+        for process in self.running():
+            process.terminate()
+
+
+_supervisor: Optional[ProcessSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_process_supervisor() -> ProcessSupervisor:
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = ProcessSupervisor()
+        return _supervisor
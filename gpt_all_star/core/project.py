@@ -13,12 +13,15 @@ from gpt_all_star.core.agents.product_owner import ProductOwner
 from gpt_all_star.core.agents.project_manager import ProjectManager
 from gpt_all_star.core.agents.qa_engineer import QAEngineer
 from gpt_all_star.core.deployment.deployment import Deployment
+from gpt_all_star.core.dependencies import DependencyCache
 from gpt_all_star.core.execution.execution import Execution
+from gpt_all_star.core.metrics import metrics
 from gpt_all_star.core.steps.entrypoint.entrypoint import Entrypoint
 from gpt_all_star.core.steps.healing.healing import Healing
 from gpt_all_star.core.steps.steps import STEPS, StepType
 from gpt_all_star.core.storage import Storage, Storages
 from gpt_all_star.core.team import Team
+from gpt_all_star.helper.paths import ARCHIVE_DIR
 from gpt_all_star.helper.translator import create_translator
 
 
@@ -31,10 +34,12 @@ class Project:
         review_mode: bool = False,
         debug_mode: bool = False,
         plan_and_solve: bool = False,
+        clean_install: bool = False,
     ) -> None:
         self.copilot = Copilot(language="ja" if japanese_mode else "en")
         self.start_time = None
         self.plan_and_solve = plan_and_solve
+        self.clean_install = clean_install
         self._set_modes(japanese_mode, review_mode, debug_mode)
         self._ = create_translator("ja" if japanese_mode else "en")
         self._set_project_name(project_name)
@@ -59,7 +64,9 @@ class Project:
             root=Storage(project_path),
             docs=Storage(project_path / "docs"),
             app=Storage(project_path / "app"),
-            archive=Storage(project_path / ".archive"),
+            archive=Storage(project_path / ARCHIVE_DIR),
+            clean_install=self.clean_install,
+            dependency_cache=DependencyCache(project_path.parent / ".cache"),
         )
 
     def _set_copilot(self) -> None:
@@ -174,4 +181,6 @@ If you want to make any corrections, please enter them."""
             self.copilot.state(
                 self._("Project finished. Elapsed time: %.2f seconds.") % elapsed_time
             )
+        for name, value in metrics.snapshot().items():
+            self.copilot.state(f"{name}: {value:g}")
         self.copilot.finish(self.project_name)
@@ -12,6 +12,8 @@ from gpt_all_star.core.agents.engineer import Engineer
 from gpt_all_star.core.agents.product_owner import ProductOwner
 from gpt_all_star.core.agents.project_manager import ProjectManager
 from gpt_all_star.core.agents.qa_engineer import QAEngineer
+from gpt_all_star.core.dependencies import DependencyCache
+from gpt_all_star.core.execution.run_command import resolve_run_command
 from gpt_all_star.core.message import Message
 from gpt_all_star.core.steps.healing.healing import Healing
 from gpt_all_star.core.steps.specification.specification import Specification
@@ -21,6 +23,7 @@ from gpt_all_star.helper.git import Git
 from gpt_all_star.helper.multi_agent_collaboration_graph import (
     MultiAgentCollaborationGraph,
 )
+from gpt_all_star.helper.paths import ARCHIVE_DIR
 from gpt_all_star.helper.translator import create_translator
 
 
@@ -62,7 +65,8 @@ class Respond:
             root=Storage(project_path),
             docs=Storage(project_path / "docs"),
             app=Storage(project_path / "app"),
-            archive=Storage(project_path / ".archive"),
+            archive=Storage(project_path / ARCHIVE_DIR),
+            dependency_cache=DependencyCache(project_path.parent / ".cache"),
         )
 
     def _set_copilot(self) -> None:
@@ -166,32 +170,11 @@ The format should follow Conventional Commits.
             )
 
     def execute(self) -> None:
-        command = (
-            Chain()
-            .create_command_to_execute_application_chain()
-            .invoke(
-                {
-                    "messages": [
-                        Message.create_human_message(
-                            f"""
-# Instructions
----
-Generate an command to execute the application.
-
-# Constraints
----
-- Check the current implementation and directory structure and be sure to launch the application.
-- If run.sh exists, it should be used first. To use it, move to the directory where run.sh exists, and then run `sh . /run.sh` after moving to the directory where run.sh exists.
-
-# Current Implementation
----
-{self.copilot.storages.current_source_code(debug_mode=self.copilot.debug_mode)}
-"""
-                        )
-                    ],
-                }
+        command = {
+            "command": resolve_run_command(
+                self.copilot.storages, debug_mode=self.copilot.debug_mode
             )
-        )
+        }
         yield {
             "messages": [
                 Message.create_human_message(
@@ -289,6 +272,16 @@ Generate an command to execute the application.
             if step.__class__ is Specification:
                 step.instructions = message
                 step.app_type = self._("Client-Side Web Application")
+            if step.fast_path():
+                yield {
+                    "messages": [
+                        Message.create_human_message(
+                            message=self._("%s completed without agents.")
+                            % step.__class__.__name__
+                        )
+                    ],
+                }
+                continue
             for agent in self.agents.to_array():
                 agent.set_executor(step.working_directory)
             supervisor_name = (
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from typing import Any
+
+from gpt_all_star.core.tools.document_chunker import get_language, get_parser
+
+ELISION = "..."
+LONG_LITERAL_CHARS = 120
+LONG_EXPRESSION_BODY_CHARS = 40
+FALLBACK_MAX_LINES = 80
+
+FUNCTION_TYPES = [
+    "function_declaration",
+    "generator_function_declaration",
+    "function",
+    "function_expression",
+    "generator_function",
+    "arrow_function",
+    "method_definition",
+    "function_definition",
+]
+BLOCK_TYPES = ["statement_block", "block"]
+LITERAL_TYPES = [
+    "string",
+    "template_string",
+    "array",
+    "object",
+    "list",
+    "dictionary",
+    "set",
+    "tuple",
+    "concatenated_string",
+]
+KEPT_ASSIGNMENTS = ["propTypes"]
+
+
+def _kept_assignment(node: Any) -> bool:
+    """Object literals assigned to `Component.propTypes` describe the API surface."""
+    parent = node.parent
+    if parent is None or parent.type != "assignment_expression":
+        return False
+    left = parent.child_by_field_name("left")
+    return left is not None and any(
+        left.text.decode("utf-8", errors="ignore").endswith(f".{name}")
+        for name in KEPT_ASSIGNMENTS
+    )
+
+
+def _elisions(root: Any) -> list[tuple[int, int, str]]:
+    elisions = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.type in FUNCTION_TYPES:
+            body = node.child_by_field_name("body")
+            if body is not None and (
+                body.type in BLOCK_TYPES
+                or body.end_byte - body.start_byte > LONG_EXPRESSION_BODY_CHARS
+            ):
+                replacement = "{ ... }" if body.type == "statement_block" else ELISION
+                elisions.append((body.start_byte, body.end_byte, replacement))
+                continue
+        elif (
+            node.type == "rule_set"
+            and (block := node.child_by_field_name("block") or node.children[-1])
+            and block.type == "block"
+        ):
+            elisions.append((block.start_byte, block.end_byte, "{ ... }"))
+            continue
+        elif (
+            node.type in LITERAL_TYPES
+            and node.end_byte - node.start_byte > LONG_LITERAL_CHARS
+            and not _kept_assignment(node)
+        ):
+            opening = node.text[:1].decode("utf-8", errors="ignore")
+            closing = node.text[-1:].decode("utf-8", errors="ignore")
+            if node.type in ["string", "template_string", "concatenated_string"]:
+                elisions.append(
+                    (
+                        node.start_byte + LONG_LITERAL_CHARS // 2,
+                        node.end_byte - 1,
+                        ELISION,
+                    )
+                )
+            else:
+                elisions.append(
+                    (node.start_byte, node.end_byte, f"{opening}{ELISION}{closing}")
+                )
+            continue
+        stack.extend(reversed(node.children))
+    return elisions
+
+
+def _fallback(text: str) -> str:
+    lines = text.splitlines()
+    if len(lines) <= FALLBACK_MAX_LINES:
+        return text
+    return "\n".join(
+        lines[:FALLBACK_MAX_LINES]
+        + [f"{ELISION} ({len(lines) - FALLBACK_MAX_LINES} more lines)"]
+    )
+
+
+def skeletonize(path: str, text: str) -> str:
+    """Keep imports, exports, signatures and types of a file and elide bodies and long literals.
+
+    Files without a tree-sitter grammar, or that fail to parse, keep their first lines only.
+    """
+    language = get_language(path)
+    if language is None or language.tree_sitter_name == "html":
+        return _fallback(text)
+    source = text.encode("utf-8")
+    try:
+        tree = get_parser(language.tree_sitter_name).parse(source)
+    except Exception:
+        return _fallback(text)
+    if tree.root_node.has_error:
+        return _fallback(text)
+
+    parts = []
+    last_end = 0
+    for start, end, replacement in sorted(_elisions(tree.root_node)):
+        if start < last_end:
+            continue
+        parts.append(source[last_end:start])
+        parts.append(replacement.encode("utf-8"))
+        last_end = end
+    parts.append(source[last_end:])
+    return b"".join(parts).decode("utf-8", errors="ignore")
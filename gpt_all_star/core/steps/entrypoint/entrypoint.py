@@ -1,5 +1,12 @@
+import os
+
 from gpt_all_star.core.agents.copilot import Copilot
+from gpt_all_star.core.metrics import metrics
 from gpt_all_star.core.steps.entrypoint.planning_prompt import planning_prompt_template
+from gpt_all_star.core.steps.entrypoint.run_script_template import (
+    build_run_script,
+    is_valid_shell,
+)
 from gpt_all_star.core.steps.step import Step
 
 
@@ -12,7 +19,7 @@ class Entrypoint(Step):
 
     def assign_prompt(self) -> str:
         assign_prompt = planning_prompt_template.format(
-            current_source_code=self.copilot.storages.current_source_code(
+            current_source_code=self.copilot.storages.overview_source_code(
                 debug_mode=self.copilot.debug_mode
             ),
         )
@@ -20,7 +27,7 @@ class Entrypoint(Step):
 
     def planning_prompt(self) -> str:
         planning_prompt = planning_prompt_template.format(
-            current_source_code=self.copilot.storages.current_source_code(
+            current_source_code=self.copilot.storages.overview_source_code(
                 debug_mode=self.copilot.debug_mode
             ),
         )
@@ -29,6 +36,20 @@ class Entrypoint(Step):
     def additional_tasks(self) -> list:
         return []
 
+    def fast_path(self) -> bool:
+        if os.getenv("ENTRYPOINT_TEMPLATES", "true").lower() != "true":
+            return False
+        if not (template := build_run_script(self.copilot.storages.app.path)):
+            return False
+        layout, script = template
+        if not is_valid_shell(script):
+            metrics.increment("entrypoint.invalid_templates")
+            return False
+        self.copilot.storages.app["run.sh"] = script
+        metrics.increment("entrypoint.templates")
+        self.copilot.state(self._("Created run.sh from the %s template.") % layout)
+        return True
+
     def callback(self) -> bool:
         self.copilot.output_files(exclude_dirs=self.exclude_dirs)
         return True
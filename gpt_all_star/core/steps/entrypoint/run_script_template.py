@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from gpt_all_star.core.dependencies import MANIFEST_FILE
+from gpt_all_star.core.execution.run_command import start_command
+
+BACKEND_DIRS = ["backend", "server", "api"]
+FRONTEND_DIRS = ["frontend", "client", "web"]
+
+HEADER = """#!/bin/sh
+set -e
+cd "$(dirname "$0")"
+export PORT="${PORT:-3000}"
+# Keep create-react-app from opening a browser.
+export BROWSER=none
+"""
+
+
+def _find_dir(app_path: Path, names: list[str]) -> Optional[Path]:
+    for name in names:
+        if (app_path / name / MANIFEST_FILE).is_file():
+            return app_path / name
+    return None
+
+
+def build_run_script(app_path: Path) -> Optional[tuple[str, str]]:
+    """Layout name and `run.sh` of a standard Node.js layout, None for other layouts."""
+    backend = _find_dir(app_path, BACKEND_DIRS)
+    frontend = _find_dir(app_path, FRONTEND_DIRS)
+    if frontend is None and (app_path / MANIFEST_FILE).is_file():
+        frontend = app_path
+    if frontend is None or not (start := start_command(frontend)):
+        return None
+    manager, command = start
+    frontend_dir = frontend.relative_to(app_path)
+
+    if backend is None:
+        return (
+            "client-side",
+            f"""{HEADER}
+cd "{frontend_dir}"
+{manager} install
+exec {command}
+""",
+        )
+
+    if not (backend_start := start_command(backend)):
+        return None
+    backend_manager, backend_command = backend_start
+    backend_dir = backend.relative_to(app_path)
+    return (
+        "full-stack",
+        f"""{HEADER}
+# PORT belongs to the frontend. The backend keeps its own default port, which the
+# frontend's proxy and API URLs are written for.
+(cd "{backend_dir}" && {backend_manager} install && env -u PORT {backend_command}) &
+trap 'kill 0' EXIT INT TERM
+
+cd "{frontend_dir}"
+{manager} install
+{command}
+""",
+    )
+
+
+def is_valid_shell(script: str) -> bool:
+    """Whether `sh -n` parses the script, without running it."""
+    with tempfile.NamedTemporaryFile("w", suffix=".sh") as file:
+        file.write(script)
+        file.flush()
+        result = subprocess.run(["sh", "-n", file.name], capture_output=True)
+    return result.returncode == 0
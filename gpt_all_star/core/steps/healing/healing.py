@@ -1,4 +1,11 @@
 from gpt_all_star.core.agents.copilot import Copilot
+from gpt_all_star.core.command_output import summarize_output
+from gpt_all_star.core.diagnostics import (
+    Diagnostic,
+    diagnosed_files,
+    error_text,
+    parse_diagnostics,
+)
 from gpt_all_star.core.steps.healing.planning_prompt import planning_prompt_template
 from gpt_all_star.core.steps.step import Step
 
@@ -10,26 +17,29 @@ class Healing(Step):
         error_message: str,
         display: bool = True,
         japanese_mode: bool = False,
+        diagnostics: list[Diagnostic] | None = None,
     ) -> None:
         super().__init__(copilot, display, japanese_mode)
         self.error_message = error_message
+        self.previous_attempts: str | None = None
+        self.approach: str | None = None
         self.working_directory = self.copilot.storages.app.path.absolute()
+        self.diagnostics = diagnostics or parse_diagnostics(
+            error_text(error_message),
+            self.copilot.storages.app.path,
+            self.copilot.storages.symbol_index.symbols(),
+        )
 
     def assign_prompt(self) -> str:
-        assign_prompt = planning_prompt_template.format(
-            error=self.error_message,
-            current_source_code=self.copilot.storages.current_source_code(
-                debug_mode=self.copilot.debug_mode
-            ),
-        )
-        return assign_prompt
+        return self.planning_prompt()
 
     def planning_prompt(self) -> str:
         planning_prompt = planning_prompt_template.format(
-            error=self.error_message,
-            current_source_code=self.copilot.storages.current_source_code(
-                debug_mode=self.copilot.debug_mode
-            ),
+            error=summarize_output(error_text(self.error_message)),
+            diagnostics="\n".join(str(d) for d in self.diagnostics) or "N/A",
+            previous_attempts=self.previous_attempts or "N/A",
+            approach=self.approach or "N/A",
+            current_source_code=self._source_code(),
         )
         return planning_prompt
 
@@ -42,3 +52,13 @@ class Healing(Step):
 
     def improvement_prompt(self) -> str:
         return ""
+
+    def _source_code(self) -> str:
+        storages = self.copilot.storages
+        if files := diagnosed_files(self.diagnostics):
+            return storages.neighbourhood_source_code(
+                files, debug_mode=self.copilot.debug_mode
+            )
+        return storages.relevant_source_code(
+            error_text(self.error_message), debug_mode=self.copilot.debug_mode
+        )
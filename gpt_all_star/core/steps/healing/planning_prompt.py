@@ -15,6 +15,16 @@ Understand the exact error wording and be sure to correct it.
 {error}
 ```
 
+## Diagnostics
+Files and lines the error points to, fix these first.
+{diagnostics}
+
+## Previous attempts
+{previous_attempts}
+
+## Approach
+{approach}
+
 # Current implementation
 ---
 {current_source_code}
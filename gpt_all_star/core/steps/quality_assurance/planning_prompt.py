@@ -14,6 +14,11 @@ Review current implementation and develop a detailed plan to correct areas that
 ---
 {current_source_code}
 
+# Previous findings
+---
+Findings of earlier reviews in the files to review, check whether they are resolved.
+{previous_findings}
+
 # Requirements
 ---
 
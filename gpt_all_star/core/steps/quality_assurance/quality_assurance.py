@@ -1,10 +1,14 @@
+import os
+
 from gpt_all_star.core.agents.copilot import Copilot
+from gpt_all_star.core.metrics import metrics
 from gpt_all_star.core.steps.quality_assurance.improvement_prompt import (
     improvement_prompt_template,
 )
 from gpt_all_star.core.steps.quality_assurance.planning_prompt import (
     planning_prompt_template,
 )
+from gpt_all_star.core.steps.quality_assurance.review_manifest import ReviewManifest
 from gpt_all_star.core.steps.step import Step
 
 
@@ -14,23 +18,29 @@ class QualityAssurance(Step):
     ) -> None:
         super().__init__(copilot, display, japanese_mode)
         self.working_directory = self.copilot.storages.app.path.absolute()
+        self.incremental = os.getenv("QA_INCREMENTAL_REVIEW", "true").lower() == "true"
+        self.manifest = ReviewManifest.load(self.copilot.storages)
+        self.review_scope: list[str] | None = None
+        self.reviewing = False
 
     def assign_prompt(self) -> str:
-        assign_prompt = planning_prompt_template.format(
-            current_source_code=self.copilot.storages.current_source_code(
-                debug_mode=self.copilot.debug_mode
-            ),
-            specifications=self.copilot.storages.docs.get("specifications.md", "N/A"),
-            technologies=self.copilot.storages.docs.get("technologies.md", "N/A"),
-            ui_design=self.copilot.storages.docs.get("ui_design.html", "N/A"),
-        )
-        return assign_prompt
+        return self.planning_prompt()
 
     def planning_prompt(self) -> str:
-        planning_prompt = planning_prompt_template.format(
-            current_source_code=self.copilot.storages.current_source_code(
+        self.reviewing = True
+        if self.review_scope:
+            current_source_code = self.copilot.storages.neighbourhood_source_code(
+                self.review_scope, debug_mode=self.copilot.debug_mode
+            )
+            previous_findings = self.manifest.describe(self.review_scope)
+        else:
+            current_source_code = self.copilot.storages.overview_source_code(
                 debug_mode=self.copilot.debug_mode
-            ),
+            )
+            previous_findings = ""
+        planning_prompt = planning_prompt_template.format(
+            current_source_code=current_source_code,
+            previous_findings=previous_findings or "N/A",
             specifications=self.copilot.storages.docs.get("specifications.md", "N/A"),
             technologies=self.copilot.storages.docs.get("technologies.md", "N/A"),
             ui_design=self.copilot.storages.docs.get("ui_design.html", "N/A"),
@@ -40,8 +50,28 @@ class QualityAssurance(Step):
     def additional_tasks(self) -> list:
         return []
 
+    def fast_path(self) -> bool:
+        if not self.incremental:
+            return False
+        self.review_scope = self.manifest.review_scope(self.copilot.storages)
+        if self.review_scope is None:
+            return False
+        if not self.review_scope:
+            metrics.increment("quality_assurance.skipped")
+            self.copilot.state(self._("No files changed since the last review."))
+            return True
+        metrics.increment("quality_assurance.incremental")
+        metrics.increment("quality_assurance.reviewed_files", len(self.review_scope))
+        return False
+
     def callback(self) -> bool:
         self.copilot.output_files(exclude_dirs=self.exclude_dirs)
+        if self.reviewing:
+            self.manifest.record(
+                self.copilot.storages,
+                reviewed=self.review_scope,
+                plan=self.plan,
+            )
         return True
 
     def improvement_prompt(self) -> str:
@@ -50,8 +80,8 @@ class QualityAssurance(Step):
         )
         improvement_prompt = improvement_prompt_template.format(
             request=request,
-            current_source_code=self.copilot.storages.current_source_code(
-                debug_mode=self.copilot.debug_mode
+            current_source_code=self.copilot.storages.relevant_source_code(
+                request, debug_mode=self.copilot.debug_mode, target=request
             ),
         )
         return improvement_prompt
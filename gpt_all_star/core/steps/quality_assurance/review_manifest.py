@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from gpt_all_star.core.code_index import source_files
+from gpt_all_star.core.storage import Storages
+from gpt_all_star.helper.paths import QA_MANIFEST_FILE
+
+MANIFEST_FILE = QA_MANIFEST_FILE
+MAX_FINDING_LENGTH = 300
+
+
+def file_hashes(storages: Storages) -> dict[str, str]:
+    """Content hash of every file of the app, by path relative to the app."""
+    hashes = {}
+    for file_path in source_files(storages.app.path):
+        try:
+            content = file_path.read_bytes()
+        except OSError:
+            continue
+        path = str(file_path.relative_to(storages.app.path))
+        hashes[path] = hashlib.sha256(content).hexdigest()
+    return hashes
+
+
+def task_files(task: dict, storages: Storages) -> list[str]:
+    """Files of the app a planned task is about."""
+    if filename := task.get("filename"):
+        path = os.path.normpath(
+            os.path.join(task.get("working_directory") or ".", filename)
+        )
+        return [path]
+    return storages.symbol_index.mentioned_files(task.get("context", ""))
+
+
+@dataclass
+class ReviewManifest:
+    """Hashes of the files as they were last reviewed, and what the review found in each."""
+
+    path: Path
+    hashes: dict[str, str] = field(default_factory=dict)
+    findings: dict[str, list[str]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, storages: Storages) -> ReviewManifest:
+        path = storages.root.path / MANIFEST_FILE
+        try:
+            data = json.loads(path.read_text("utf-8"))
+        except (OSError, ValueError):
+            return cls(path)
+        return cls(path, data.get("hashes", {}), data.get("findings", {}))
+
+    def changed_files(self, hashes: dict[str, str]) -> list[str]:
+        """Files added, modified or deleted since the last review."""
+        return sorted(
+            path
+            for path in hashes.keys() | self.hashes.keys()
+            if self.hashes.get(path) != hashes.get(path)
+        )
+
+    def review_scope(self, storages: Storages) -> list[str] | None:
+        """Changed files and their direct importers, None when nothing was reviewed yet."""
+        if not self.hashes:
+            return None
+        hashes = file_hashes(storages)
+        scope = set(changed := self.changed_files(hashes))
+        for path in changed:
+            scope |= storages.symbol_index.importers_of(path)
+        return sorted(path for path in scope if path in hashes)
+
+    def describe(self, paths: list[str]) -> str:
+        return "\n".join(
+            f"- ./{path}: {finding}"
+            for path in paths
+            for finding in self.findings.get(path, [])
+        )
+
+    def record(
+        self, storages: Storages, reviewed: list[str] | None, plan: list[dict]
+    ) -> None:
+        """Store the current hashes and replace the findings of the reviewed files.
+
+        `reviewed` is None after a review of the whole app.
+        """
+        hashes = file_hashes(storages)
+        findings = {
+            path: entries
+            for path, entries in self.findings.items()
+            if path in hashes and reviewed is not None and path not in reviewed
+        }
+        for task in plan:
+            finding = " ".join(str(task.get("context", "")).split())
+            for path in task_files(task, storages):
+                if path in hashes:
+                    findings.setdefault(path, []).append(finding[:MAX_FINDING_LENGTH])
+        self.hashes = hashes
+        self.findings = findings
+        self.path.write_text(
+            json.dumps({"hashes": hashes, "findings": findings}, indent=2),
+            encoding="utf-8",
+        )
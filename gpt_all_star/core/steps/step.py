@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 
 from gpt_all_star.core.agents.copilot import Copilot
 from gpt_all_star.core.implementation_prompt import implementation_prompt_template
+from gpt_all_star.helper.paths import EXCLUDED_DIRS
 from gpt_all_star.helper.translator import create_translator
 
 
@@ -12,9 +13,10 @@ class Step(ABC):
         self.copilot = copilot
         self.working_directory = self.copilot.storages.root.path.absolute()
         self.plan_and_solve = False
-        self.exclude_dirs = [".archive", "node_modules", "build"]
+        self.exclude_dirs = list(EXCLUDED_DIRS)
         self.display = display
         self.improvement_request = None
+        self.plan: list[dict] = []
 
         if self.display:
             self.copilot.console.section(f"STEP: {self.__class__.__name__}")
@@ -37,14 +39,18 @@ class Step(ABC):
         return implementation_prompt_template.format(
             task=task,
             context=context,
-            implementation=self.copilot.storages.current_source_code(
-                debug_mode=self.copilot.debug_mode
+            implementation=self.copilot.storages.relevant_source_code(
+                f"{task}\n{context}", debug_mode=self.copilot.debug_mode, target=task
             ),
             specifications=self.copilot.storages.docs.get("specifications.md", "N/A"),
             technologies=self.copilot.storages.docs.get("technologies.md", "N/A"),
             ui_design=self.copilot.storages.docs.get("ui_design.html", "N/A"),
         )
 
+    def fast_path(self) -> bool:
+        """Complete the step without agents when possible, returning whether it did."""
+        return False
+
     @abstractmethod
     def callback(self) -> bool:
         pass
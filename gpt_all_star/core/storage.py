@@ -2,13 +2,40 @@ from __future__ import annotations
 
 import os
 import shutil
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from gpt_all_star.core.code_index import CodeIndex
+from gpt_all_star.core.dependencies import (
+    DEPENDENCY_DIR,
+    MANIFEST_FILE,
+    DependencyCache,
+    dependency_hashes,
+    hashes_match,
+    link_tree,
+)
+from gpt_all_star.core.skeleton import skeletonize
+from gpt_all_star.core.symbol_index import SymbolIndex
+from gpt_all_star.helper.paths import (
+    ARCHIVE_DIR,
+    EXCLUDED_DIRS,
+    EXCLUDED_FILES,
+    INDEX_DIR,
+)
 from gpt_all_star.helper.text_parser import format_file_to_input
 
+FULL_SOURCE_CODE_LIMIT = 24000
+RELEVANT_CHUNKS = 8
+
+
+def _format_skeleton(file_name: str, file_content: str) -> str:
+    return format_file_to_input(
+        f"{file_name} (skeleton, bodies and long literals are elided)",
+        skeletonize(file_name, file_content),
+    )
+
 
 class Storage:
     def __init__(self, path: str | Path):
@@ -55,17 +82,14 @@ class Storage:
     ) -> dict[str, str]:
         if files_dict is None:
             files_dict = {}
-        excluded_files = ["package-lock.json", "yarn.lock"]
-        excluded_dirs = ["node_modules", ".git", ".archive", ".idea", "build"]
-
         for item in (path or self.path).iterdir():
-            if item.is_file() and item.name not in excluded_files:
+            if item.is_file() and item.name not in EXCLUDED_FILES:
                 try:
                     file_content = item.read_text(encoding="utf-8")
                 except UnicodeDecodeError:
                     continue
                 files_dict[str(item)] = file_content
-            elif item.is_dir() and item.name not in excluded_dirs:
+            elif item.is_dir() and item.name not in EXCLUDED_DIRS:
                 self.recursive_file_search(item, files_dict)
         return files_dict
 
@@ -76,6 +100,28 @@ class Storages:
     docs: Storage
     app: Storage
     archive: Storage
+    clean_install: bool = False
+    dependency_cache: DependencyCache | None = None
+    index_dir: Path | None = None
+    """Where the vector index of the app is persisted, `root/.llama_index` by default."""
+    _code_index: CodeIndex | None = field(default=None, init=False, repr=False)
+    _symbol_index: SymbolIndex | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.index_dir is None:
+            self.index_dir = self.root.path / INDEX_DIR
+
+    @property
+    def code_index(self) -> CodeIndex:
+        if self._code_index is None:
+            self._code_index = CodeIndex(self.app.path)
+        return self._code_index
+
+    @property
+    def symbol_index(self) -> SymbolIndex:
+        if self._symbol_index is None:
+            self._symbol_index = SymbolIndex(self.app.path)
+        return self._symbol_index
 
     def archive_storage(self) -> None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -85,12 +131,48 @@ class Storages:
             os.makedirs(destination)
 
         for item in os.listdir(self.root.path):
-            if item != ".archive":
+            # The vector index survives runs, it only re-embeds what changed.
+            if item not in [ARCHIVE_DIR, INDEX_DIR]:
                 shutil.move(os.path.join(self.root.path, item), destination)
         self.docs.path.mkdir(parents=True, exist_ok=True)
         self.app.path.mkdir(parents=True, exist_ok=True)
 
-    def current_source_code(self, debug_mode: bool = False) -> str:
+    def restore_dependencies(self) -> str | None:
+        target = self.app.path / DEPENDENCY_DIR
+        if target.exists():
+            return None
+        current = dependency_hashes(self.app.path)
+        if MANIFEST_FILE not in current:
+            return None
+        if self.clean_install:
+            return f"Clean install requested, {DEPENDENCY_DIR} will not be restored."
+
+        for snapshot in sorted(self.archive.path.iterdir(), reverse=True):
+            archived_app = snapshot / "app"
+            if not (archived_app / DEPENDENCY_DIR).is_dir():
+                continue
+            if hashes_match(current, dependency_hashes(archived_app)):
+                linked = link_tree(archived_app / DEPENDENCY_DIR, target)
+                return f"Restored {DEPENDENCY_DIR} ({linked} files) from archive {snapshot.name}."
+        return f"No archived {DEPENDENCY_DIR} matches {MANIFEST_FILE}."
+
+    def prepare_dependencies(self) -> list[str]:
+        decisions = []
+        if decision := self.restore_dependencies():
+            decisions.append(decision)
+        if self.dependency_cache and not self.clean_install:
+            if decision := self.dependency_cache.prepare(self.app.path):
+                decisions.append(decision)
+        return decisions
+
+    def save_dependencies(self) -> str | None:
+        if self.dependency_cache and not self.clean_install:
+            return self.dependency_cache.save(self.app.path)
+        return None
+
+    def current_source_code(
+        self, debug_mode: bool = False, skeleton: bool = False
+    ) -> str:
         source_code_contents = []
         for (
             filename,
@@ -98,8 +180,79 @@ class Storages:
         ) in self.app.recursive_file_search().items():
             if debug_mode:
                 print(f"Adding file {filename} to the prompt...")
-            formatted_code = format_file_to_input(
+            format_file = _format_skeleton if skeleton else format_file_to_input
+            formatted_code = format_file(
                 f"./{os.path.relpath(filename, self.app.path)}", file_content
             )
             source_code_contents.append(formatted_code)
         return "\n".join(source_code_contents) if source_code_contents else "N/A"
+
+    def overview_source_code(self, debug_mode: bool = False) -> str:
+        """The whole app, as skeletons when it is too large to show in full."""
+        source_code = self.current_source_code(debug_mode=debug_mode)
+        if len(source_code) <= FULL_SOURCE_CODE_LIMIT:
+            return source_code
+        if debug_mode:
+            print("Adding skeletons of the source code to the prompt...")
+        return f"""The application is too large to show in full, so its files are shown as skeletons. Read files when needed.
+{self.current_source_code(skeleton=True)}"""
+
+    def relevant_source_code(
+        self,
+        query: str,
+        top_k: int = RELEVANT_CHUNKS,
+        debug_mode: bool = False,
+        target: str | None = None,
+    ) -> str:
+        if target and (targets := self.symbol_index.mentioned_files(target)):
+            return self.neighbourhood_source_code(targets, debug_mode=debug_mode)
+
+        source_code = self.current_source_code()
+        if len(source_code) <= FULL_SOURCE_CODE_LIMIT:
+            if debug_mode:
+                print("Adding the whole source code to the prompt...")
+            return source_code
+
+        results = self.code_index.search(query, top_k=top_k)
+        if not results:
+            return source_code
+        outline = self.symbol_index.outline()
+        chunks = []
+        for _, chunk in results:
+            if debug_mode:
+                print(f"Adding {chunk.path}:{chunk.start_line} to the prompt...")
+            chunks.append(
+                format_file_to_input(
+                    f"./{chunk.path} (lines {chunk.start_line}-{chunk.end_line})",
+                    chunk.text,
+                )
+            )
+        return f"""Files in the application:
+{outline}
+
+Only the parts most relevant to the task are shown. Read other files when needed.
+{"".join(chunks)}"""
+
+    def neighbourhood_source_code(
+        self, targets: list[str], debug_mode: bool = False
+    ) -> str:
+        neighbours = self.symbol_index.neighbourhood(targets)
+        others = [
+            path for path in self.symbol_index.symbols() if path not in neighbours
+        ]
+        files = []
+        for path in neighbours:
+            try:
+                content = self.app[path]
+            except (KeyError, UnicodeDecodeError):
+                continue
+            if debug_mode:
+                print(f"Adding file {path} to the prompt...")
+            format_file = format_file_to_input if path in targets else _format_skeleton
+            files.append(format_file(f"./{path}", content))
+        outline = self.symbol_index.outline(others) if others else "N/A"
+        return f"""Other files in the application:
+{outline}
+
+Only the target files, the files they import, the files importing them and the entry files are shown, all but the target files as skeletons. Read other files when needed.
+{"".join(files)}"""
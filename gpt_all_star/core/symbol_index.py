@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from gpt_all_star.core.code_index import source_files
+from gpt_all_star.core.tools.document_chunker import get_language, get_parser
+
+JAVASCRIPT_LANGUAGES = ["javascript", "typescript", "tsx"]
+RESOLVABLE_EXTENSIONS = [
+    ".js",
+    ".jsx",
+    ".ts",
+    ".tsx",
+    ".mjs",
+    ".cjs",
+    ".css",
+    ".json",
+    ".py",
+]
+ENTRY_FILES = ["package.json", "index.html"]
+ENTRY_NAMES = ["app", "index", "main", "router", "routes"]
+ENTRY_DIRS = ["", "src"]
+MAX_SYNTAX_ERRORS = 5
+PATH_PATTERN = re.compile(r"[\w@.\-/\[\]]*[\w\-\]]\.[A-Za-z0-9]+")
+DECLARATION_TYPES = [
+    "function_declaration",
+    "generator_function_declaration",
+    "class_declaration",
+    "interface_declaration",
+    "type_alias_declaration",
+    "enum_declaration",
+    "function_definition",
+    "class_definition",
+]
+
+
+@dataclass
+class Import:
+    source: str
+    names: list[str]
+    line: int
+    resolved: str | None = None
+
+
+@dataclass
+class FileSymbols:
+    path: str
+    definitions: dict[str, int] = field(default_factory=dict)
+    exports: list[str] = field(default_factory=list)
+    imports: list[Import] = field(default_factory=list)
+    components: dict[str, int] = field(default_factory=dict)
+    routes: dict[str, int] = field(default_factory=dict)
+    syntax_errors: list[tuple[int, int, str]] = field(default_factory=list)
+    """Line, column and description of the parse errors."""
+
+    def outline(self) -> str:
+        parts = []
+        if self.exports:
+            parts.append(f"exports {', '.join(self.exports)}")
+        local_imports = [
+            f"./{i.resolved}" if i.resolved else i.source
+            for i in self.imports
+            if i.source.startswith(".")
+        ]
+        if local_imports:
+            parts.append(f"imports {', '.join(local_imports)}")
+        if self.components:
+            parts.append(f"renders {', '.join(self.components)}")
+        if self.routes:
+            parts.append(f"routes {', '.join(self.routes)}")
+        return f"./{self.path}" + (f": {'; '.join(parts)}" if parts else "")
+
+
+def _resolution_candidates(path: str, source: str) -> list[str]:
+    """Files a relative import of the file at `path` may name, in resolution order."""
+    if not source.startswith("."):
+        return []
+    base = os.path.normpath(os.path.join(os.path.dirname(path), source))
+    candidates = [base]
+    candidates += [base + extension for extension in RESOLVABLE_EXTENSIONS]
+    candidates += [
+        os.path.join(base, "index" + extension) for extension in RESOLVABLE_EXTENSIONS
+    ]
+    return candidates
+
+
+def _text(node: Any) -> str:
+    return node.text.decode("utf-8", errors="ignore")
+
+
+def _string_value(node: Any) -> str:
+    return _text(node).strip("'\"`")
+
+
+def _line(node: Any) -> int:
+    return node.start_point[0] + 1
+
+
+def _declared_names(node: Any) -> list[str]:
+    if node.type in DECLARATION_TYPES:
+        name = node.child_by_field_name("name")
+        return [_text(name)] if name else []
+    if node.type in ["lexical_declaration", "variable_declaration"]:
+        return [
+            _text(declarator.child_by_field_name("name"))
+            for declarator in node.children
+            if declarator.type == "variable_declarator"
+            and declarator.child_by_field_name("name")
+        ]
+    return []
+
+
+def _extract_javascript(symbols: FileSymbols, root: Any) -> None:
+    for node in root.children:
+        for name in _declared_names(node):
+            symbols.definitions[name] = _line(node)
+        if node.type == "import_statement":
+            source = node.child_by_field_name("source")
+            names = []
+            for clause in node.children:
+                if clause.type != "import_clause":
+                    continue
+                for child in clause.children:
+                    if child.type == "identifier":
+                        names.append(_text(child))
+                    elif child.type == "namespace_import":
+                        names.extend(
+                            _text(c) for c in child.children if c.type == "identifier"
+                        )
+                    elif child.type == "named_imports":
+                        for specifier in child.children:
+                            if specifier.type == "import_specifier":
+                                alias = specifier.child_by_field_name("alias")
+                                name = specifier.child_by_field_name("name")
+                                names.append(_text(alias or name))
+            if source:
+                symbols.imports.append(
+                    Import(_string_value(source), names, _line(node))
+                )
+        elif node.type == "export_statement":
+            is_default = any(child.type == "default" for child in node.children)
+            declaration = node.child_by_field_name("declaration")
+            value = node.child_by_field_name("value")
+            source = node.child_by_field_name("source")
+            if declaration:
+                names = _declared_names(declaration)
+                for name in names:
+                    symbols.definitions[name] = _line(declaration)
+                symbols.exports.extend(
+                    f"default ({name})" if is_default else name for name in names
+                )
+            elif is_default:
+                name = _text(value) if value and value.type == "identifier" else ""
+                symbols.exports.append(f"default ({name})" if name else "default")
+            names = []
+            for clause in node.children:
+                if clause.type != "export_clause":
+                    continue
+                for specifier in clause.children:
+                    if specifier.type == "export_specifier":
+                        alias = specifier.child_by_field_name("alias")
+                        name = specifier.child_by_field_name("name")
+                        names.append(_text(alias or name))
+            symbols.exports.extend(names)
+            if source:
+                symbols.imports.append(
+                    Import(_string_value(source), names, _line(node))
+                )
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        stack.extend(reversed(node.children))
+        if node.type == "call_expression":
+            function = node.child_by_field_name("function")
+            arguments = node.child_by_field_name("arguments")
+            if (
+                function
+                and arguments
+                and (function.type == "import" or _text(function) == "require")
+            ):
+                strings = [c for c in arguments.children if c.type == "string"]
+                if strings:
+                    symbols.imports.append(
+                        Import(_string_value(strings[0]), [], _line(node))
+                    )
+        elif node.type in ["jsx_opening_element", "jsx_self_closing_element"]:
+            name = node.child_by_field_name("name")
+            if name is None or not _text(name)[:1].isupper():
+                continue
+            symbols.components.setdefault(_text(name), _line(node))
+            if _text(name) != "Route":
+                continue
+            for attribute in node.children:
+                if attribute.type != "jsx_attribute" or not attribute.children:
+                    continue
+                if _text(attribute.children[0]) == "path":
+                    values = [c for c in attribute.children if c.type == "string"]
+                    if values:
+                        symbols.routes[_string_value(values[0])] = _line(node)
+
+
+def _extract_python(symbols: FileSymbols, root: Any) -> None:
+    for node in root.children:
+        if node.type == "decorated_definition":
+            node = node.child_by_field_name("definition") or node
+        for name in _declared_names(node):
+            symbols.definitions[name] = _line(node)
+            if not name.startswith("_"):
+                symbols.exports.append(name)
+        if node.type == "import_statement":
+            for child in node.children:
+                if child.type in ["dotted_name", "aliased_import"]:
+                    symbols.imports.append(Import(_text(child), [], _line(node)))
+        elif node.type == "import_from_statement":
+            module = node.child_by_field_name("module_name")
+            names = [
+                _text(child)
+                for child in node.children_by_field_name("name")
+                if child is not None
+            ]
+            if module:
+                symbols.imports.append(Import(_text(module), names, _line(node)))
+
+
+def _syntax_errors(root: Any) -> list[tuple[int, int, str]]:
+    errors = []
+    stack = [root]
+    while stack and len(errors) < MAX_SYNTAX_ERRORS:
+        node = stack.pop()
+        if not node.has_error:
+            continue
+        if node.is_missing:
+            description = f"Missing `{node.type}`"
+        elif node.type == "ERROR":
+            description = (
+                f"Unexpected `{_text(node).splitlines()[0][:40]}`"
+                if node.text
+                else "Syntax error"
+            )
+        else:
+            stack.extend(reversed(node.children))
+            continue
+        errors.append((_line(node), node.start_point[1] + 1, description))
+    return errors
+
+
+def extract_symbols(path: str, text: str) -> FileSymbols:
+    symbols = FileSymbols(path)
+    language = get_language(path)
+    if language is None:
+        return symbols
+    if language.tree_sitter_name in JAVASCRIPT_LANGUAGES:
+        extract = _extract_javascript
+    elif language.tree_sitter_name == "python":
+        extract = _extract_python
+    else:
+        return symbols
+    try:
+        tree = get_parser(language.tree_sitter_name).parse(text.encode("utf-8"))
+    except Exception:
+        return symbols
+    extract(symbols, tree.root_node)
+    if tree.root_node.has_error:
+        symbols.syntax_errors = _syntax_errors(tree.root_node)
+    return symbols
+
+
+class SymbolIndex:
+    """Exported symbols, imports and component usage of every file in a source tree."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).absolute()
+        self._lock = threading.Lock()
+        self._files: dict[str, tuple[float, int]] = {}
+        self._symbols: dict[str, FileSymbols] = {}
+
+    def refresh(self) -> int:
+        with self._lock:
+            seen = set()
+            changed = 0
+            for file_path in source_files(self.path):
+                relative_path = str(file_path.relative_to(self.path))
+                seen.add(relative_path)
+                stat = file_path.stat()
+                signature = (stat.st_mtime, stat.st_size)
+                if self._files.get(relative_path) == signature:
+                    continue
+                try:
+                    text = file_path.read_text(encoding="utf-8")
+                except UnicodeDecodeError:
+                    continue
+                self._symbols[relative_path] = extract_symbols(relative_path, text)
+                self._files[relative_path] = signature
+                changed += 1
+            for relative_path in [path for path in self._files if path not in seen]:
+                del self._files[relative_path]
+                del self._symbols[relative_path]
+                changed += 1
+            if changed:
+                for symbols in self._symbols.values():
+                    for item in symbols.imports:
+                        item.resolved = self._resolve(symbols.path, item.source)
+            return changed
+
+    def symbols(self) -> dict[str, FileSymbols]:
+        self.refresh()
+        with self._lock:
+            return dict(self._symbols)
+
+    def imports_of(self, path: str) -> set[str]:
+        symbols = self.symbols().get(path)
+        if symbols is None:
+            return set()
+        return {item.resolved for item in symbols.imports if item.resolved}
+
+    def importers_of(self, path: str) -> set[str]:
+        """Files importing the path, also after it was deleted and left them unresolved."""
+        return {
+            symbols.path
+            for symbols in self.symbols().values()
+            if any(
+                item.resolved == path
+                or (
+                    item.resolved is None
+                    and path in _resolution_candidates(symbols.path, item.source)
+                )
+                for item in symbols.imports
+            )
+        }
+
+    def outline(self, paths: list[str] | None = None) -> str:
+        return "\n".join(
+            f"- {symbols.outline()}"
+            for path, symbols in sorted(self.symbols().items())
+            if paths is None or path in paths
+        )
+
+    def entry_files(self) -> list[str]:
+        return [
+            path
+            for path, symbols in sorted(self.symbols().items())
+            if path in ENTRY_FILES
+            or symbols.routes
+            or (
+                os.path.dirname(path) in ENTRY_DIRS
+                and os.path.splitext(os.path.basename(path))[0].lower() in ENTRY_NAMES
+            )
+        ]
+
+    def mentioned_files(self, text: str) -> list[str]:
+        """Files of the tree referred to in `text` by relative path or unique file name."""
+        symbols = self.symbols()
+        files = []
+        for mention in PATH_PATTERN.findall(text):
+            path = os.path.normpath(mention.lstrip("/")).removeprefix("./")
+            if path not in symbols:
+                candidates = [
+                    candidate
+                    for candidate in symbols
+                    if candidate.endswith(f"/{path}")
+                    or os.path.basename(candidate) == path
+                ]
+                if len(candidates) != 1:
+                    continue
+                path = candidates[0]
+            if path not in files:
+                files.append(path)
+        return files
+
+    def neighbourhood(self, paths: list[str]) -> list[str]:
+        """`paths`, the files they import, the files importing them and the entry files."""
+        symbols = self.symbols()
+        neighbours = [path for path in paths if path in symbols]
+        for path in list(neighbours):
+            neighbours += sorted(
+                item.resolved for item in symbols[path].imports if item.resolved
+            )
+            neighbours += sorted(
+                importer.path
+                for importer in symbols.values()
+                if any(item.resolved == path for item in importer.imports)
+            )
+        neighbours += self.entry_files()
+        return list(dict.fromkeys(neighbours))
+
+    def find(self, name: str) -> str:
+        name = name.strip().strip("'\"`").removeprefix("<").removesuffix(">")
+        name = name.removesuffix("/").strip()
+        if not name:
+            return "Please provide a symbol name."
+        lowered = name.lower()
+        definitions, importers, usages, routes = [], [], [], []
+        for path, symbols in sorted(self.symbols().items()):
+            for definition, line in symbols.definitions.items():
+                if definition.lower() == lowered:
+                    exported = any(
+                        definition == e or f"({definition})" in e
+                        for e in symbols.exports
+                    )
+                    state = "exported" if exported else "not exported"
+                    definitions.append(f"./{path}:{line} ({state})")
+            for item in symbols.imports:
+                if any(imported.lower() == lowered for imported in item.names):
+                    source = f"./{item.resolved}" if item.resolved else item.source
+                    importers.append(f"./{path}:{item.line} from {source}")
+            for component, line in symbols.components.items():
+                if component.lower() == lowered:
+                    usages.append(f"./{path}:{line}")
+            for route, line in symbols.routes.items():
+                if route.lower() == lowered:
+                    routes.append(f"./{path}:{line}")
+
+        if not (definitions or importers or usages or routes):
+            candidates = sorted(
+                {
+                    definition
+                    for symbols in self.symbols().values()
+                    for definition in symbols.definitions
+                    if lowered in definition.lower()
+                }
+            )
+            if candidates:
+                return f"`{name}` was not found. Similar symbols: {', '.join(candidates[:20])}"
+            return f"`{name}` was not found in the application."
+
+        sections = [
+            ("Defined in", definitions),
+            ("Imported by", importers),
+            ("Rendered in", usages),
+            ("Route declared in", routes),
+        ]
+        return "\n".join(
+            f"{title}:\n" + "\n".join(f"- {entry}" for entry in entries)
+            for title, entries in sections
+            if entries
+        )
+
+    def _resolve(self, path: str, source: str) -> str | None:
+        for candidate in _resolution_candidates(path, source):
+            if candidate in self._symbols:
+                return candidate
+        return None
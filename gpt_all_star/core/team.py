@@ -1,4 +1,10 @@
+from __future__ import annotations
+
+import contextlib
+import copy
 import json
+import os
+import threading
 from typing import Optional
 
 from langgraph.pregel import GraphRecursionError
@@ -11,6 +17,7 @@ from gpt_all_star.core.agents.agents import Agents
 from gpt_all_star.core.agents.chain import ACTIONS, Chain
 from gpt_all_star.core.agents.copilot import Copilot
 from gpt_all_star.core.message import Message
+from gpt_all_star.core.metrics import metrics
 from gpt_all_star.core.steps.development.replanning_prompt import replanning_template
 from gpt_all_star.core.steps.step import Step
 from gpt_all_star.helper.config_loader import load_configuration
@@ -37,6 +44,10 @@ class Team:
         self.console = self.copilot.console.console
         self._graph: Optional[MultiAgentCollaborationGraph] = None
         self.supervisor = None
+        self.last_plan: list[dict] = []
+        self.show_status = True
+        # When set, the running step stops after the current agent turn.
+        self.cancelled: Optional[threading.Event] = None
         self._ = create_translator("ja" if japanese_mode else "en")
         self._initialize_team()
 
@@ -46,6 +57,40 @@ class Team:
         self.copilot.state(self._("Ok, we have a team now!"))
         self._display_team_members()
 
+    def fork(self, copilot: Copilot) -> Team:
+        """A copy of the team working on `copilot.storages`, without the introductions.
+
+        Forks can run steps at the same time as the original team.
+        """
+        team = copy.copy(self)
+        team.copilot = copilot
+        team.agents = Agents(
+            **{
+                role: agent.fork(copilot.storages)
+                for role, agent in vars(self.agents).items()
+            }
+        )
+        team._graph = None
+        team.supervisor = None
+        team.last_plan = []
+        team.show_status = False
+        team.cancelled = None
+        return team
+
+    def _status(self) -> contextlib.AbstractContextManager:
+        if not self.show_status:
+            # Rich allows a single live display per console.
+            return contextlib.nullcontext()
+        return Status(
+            "[bold white]running...(Have a cup of coffee and relax.)[/bold white]",
+            console=self.console,
+            spinner="runner",
+            speed=0.5,
+        )
+
+    def _is_cancelled(self) -> bool:
+        return self.cancelled is not None and self.cancelled.is_set()
+
     def _assign_supervisor(self, assign_prompt: str | None):
         supervisor_name = (
             Chain()
@@ -62,8 +107,12 @@ class Team:
         try:
             for output in self._graph.workflow.stream(
                 {"messages": messages},
-                config={"recursion_limit": 50},
+                config={
+                    "recursion_limit": int(os.getenv("SUPERVISOR_RECURSION_LIMIT", 50))
+                },
             ):
+                if self._is_cancelled():
+                    break
                 for key, value in output.items():
                     if key == SUPERVISOR_NAME or key == "__end__":
                         if self.supervisor.debug_mode:
@@ -83,6 +132,7 @@ class Team:
 """
                             )
         except GraphRecursionError:
+            metrics.increment("team.recursion_limit_reached")
             if self.supervisor.debug_mode:
                 print("Recursion limit reached")
 
@@ -95,12 +145,7 @@ class Team:
         self.agents.set_executors(step.working_directory)
         self._assign_supervisor(assign_prompt)
 
-        with Status(
-            "[bold white]running...(Have a cup of coffee and relax.)[/bold white]",
-            console=self.console,
-            spinner="runner",
-            speed=0.5,
-        ):
+        with self._status():
             self.supervisor.state(self._("Planning tasks."))
             tasks = (
                 Chain()
@@ -115,6 +160,8 @@ class Team:
             )
             for task in additional_tasks:
                 tasks["plan"].append(task)
+            self.last_plan = list(tasks["plan"])
+            step.plan = self.last_plan
 
             if self.supervisor.debug_mode:
                 self.supervisor.console.print(
@@ -127,6 +174,9 @@ class Team:
             original_tasks_count = len(tasks["plan"])
             count = 1
             while len(tasks["plan"]) > 0:
+                if self._is_cancelled():
+                    metrics.increment("team.cancelled")
+                    break
                 task = tasks["plan"][0]
                 working_directory = task.get("working_directory", "")
                 file_name = task.get("filename", "")
@@ -179,7 +229,7 @@ Context: %s
                                         replanning_template.format(
                                             original_plan=tasks,
                                             completed_plan=completed_plan,
-                                            implementation=self.copilot.storages.current_source_code(),
+                                            implementation=self.copilot.storages.overview_source_code(),
                                             specifications=self.copilot.storages.docs.get(
                                                 "specifications.md", "N/A"
                                             ),
@@ -213,12 +263,7 @@ Context: %s
         self.agents.set_executors(step.working_directory)
         self._assign_supervisor(improvement_prompt)
 
-        with Status(
-            "[bold white]running...(Have a cup of coffee and relax.)[/bold white]",
-            console=self.console,
-            spinner="runner",
-            speed=0.5,
-        ):
+        with self._status():
             self.supervisor.state(self._("Planning tasks."))
             tasks = (
                 Chain()
@@ -275,7 +320,8 @@ Context: %s
                 tasks["plan"].pop(0)
 
     def run(self, step: Step) -> bool:
-        self._run(step)
+        if not step.fast_path():
+            self._run(step)
 
         return step.callback()
 
@@ -1,12 +1,30 @@
+import bisect
+import os
+import re
+import threading
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, NamedTuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import tree_sitter_languages
 from langchain_core.documents import Document
 from langchain_text_splitters import TextSplitter
 
 
+_parsers = threading.local()
+
+
+def get_parser(language: str) -> Any:
+    """Return a cached tree-sitter parser; parsers are not shared across threads."""
+    cache = getattr(_parsers, "cache", None)
+    if cache is None:
+        cache = _parsers.cache = {}
+    if language not in cache:
+        cache[language] = tree_sitter_languages.get_parser(language)
+    return cache[language]
+
+
 class CodeSplitter(TextSplitter):
     """Split code using a AST parser."""
 
@@ -25,34 +43,50 @@ class CodeSplitter(TextSplitter):
         self.chunk_lines_overlap = chunk_lines_overlap
         self.max_chars = max_chars
 
-    def _chunk_node(self, node: Any, text: str, last_end: int = 0) -> List[str]:
-        new_chunks = []
-        current_chunk = ""
+    def _chunk_node(
+        self, node: Any, source: bytes, last_end: int = 0
+    ) -> List[Tuple[int, int]]:
+        spans = []
+        start = last_end
         for child in node.children:
             if child.end_byte - child.start_byte > self.max_chars:
                 # Child is too big, recursively chunk the child
-                if len(current_chunk) > 0:
-                    new_chunks.append(current_chunk)
-                current_chunk = ""
-                new_chunks.extend(self._chunk_node(child, text, last_end))
+                if last_end > start:
+                    spans.append((start, last_end))
+                if child.children:
+                    spans.extend(self._chunk_node(child, source, last_end))
+                else:
+                    spans.extend(self._chunk_lines(source, last_end, child.end_byte))
+                start = child.end_byte
             elif (
-                len(current_chunk) + child.end_byte - child.start_byte > self.max_chars
-            ):
+                last_end - start
+            ) + child.end_byte - child.start_byte > self.max_chars:
                 # Child would make the current chunk too big, so start a new chunk
-                new_chunks.append(current_chunk)
-                current_chunk = text[last_end : child.end_byte]
-            else:
-                current_chunk += text[last_end : child.end_byte]
+                spans.append((start, last_end))
+                start = last_end
             last_end = child.end_byte
-        if len(current_chunk) > 0:
-            new_chunks.append(current_chunk)
-        return new_chunks
-
-    def split_text(self, text: str) -> List[str]:
-        """Split incoming code and return chunks using the AST."""
-
+        if last_end > start:
+            spans.append((start, last_end))
+        return spans
+
+    def _chunk_lines(
+        self, source: bytes, start: int, end: int
+    ) -> List[Tuple[int, int]]:
+        spans = []
+        while start < end:
+            chunk_end = start
+            for _ in range(self.chunk_lines):
+                chunk_end = source.find(b"\n", chunk_end, end) + 1
+                if chunk_end == 0:
+                    chunk_end = end
+                    break
+            spans.append((start, chunk_end))
+            start = chunk_end
+        return spans
+
+    def _parse(self, source: bytes) -> Any:
         try:
-            parser = tree_sitter_languages.get_parser(self.language)
+            parser = get_parser(self.language)
         except Exception as e:
             print(
                 f"Could not get parser for language {self.language}. Check "
@@ -61,14 +95,62 @@ class CodeSplitter(TextSplitter):
             )
             raise e
 
-        tree = parser.parse(bytes(text, "utf-8"))
+        tree = parser.parse(source)
+        if tree.root_node.children and tree.root_node.children[0].type == "ERROR":
+            raise ValueError(f"Could not parse code with language {self.language}.")
+        return tree
+
+    def split_text_with_lines(self, text: str) -> List[Tuple[int, int, str]]:
+        """Split incoming code and return (start line, end line, chunk) using the AST."""
+        source = text.encode("utf-8")
+        tree = self._parse(source)
+        line_starts = [0] + [match.end() for match in re.finditer(b"\n", source)]
+
+        chunks = []
+        for start, end in self._chunk_node(tree.root_node, source):
+            while start < end and source[start] in b" \t\r\n":
+                start += 1
+            while end > start and source[end - 1] in b" \t\r\n":
+                end -= 1
+            if start == end:
+                continue
+            start_line = bisect.bisect_right(line_starts, start) - 1
+            end_line = bisect.bisect_right(line_starts, end - 1) - 1
+            if chunks and self.chunk_lines_overlap > 0:
+                start_line = max(start_line - self.chunk_lines_overlap, 0)
+                start = min(start, line_starts[start_line])
+            chunks.append(
+                (
+                    start_line + 1,
+                    end_line + 1,
+                    source[start:end].decode("utf-8", errors="ignore"),
+                )
+            )
+        return chunks
 
-        if not tree.root_node.children or tree.root_node.children[0].type != "ERROR":
-            chunks = [chunk.strip() for chunk in self._chunk_node(tree.root_node, text)]
+    def split_text(self, text: str) -> List[str]:
+        """Split incoming code and return chunks using the AST."""
+        return [chunk for _, _, chunk in self.split_text_with_lines(text)]
 
-            return chunks
-        else:
-            raise ValueError(f"Could not parse code with language {self.language}.")
+
+class Language(NamedTuple):
+    name: str
+    extensions: List[str]
+    tree_sitter_name: str
+
+
+LANGUAGES = [
+    Language("Python", [".py"], "python"),
+    Language("JavaScript", [".js", ".mjs", ".cjs", ".jsx"], "javascript"),
+    Language("TypeScript", [".ts", ".mts", ".cts"], "typescript"),
+    Language("TSX", [".tsx"], "tsx"),
+    Language("CSS", [".css"], "css"),
+    Language("HTML", [".html", ".htm"], "html"),
+    Language("Bash", [".sh"], "bash"),
+]
+LANGUAGES_BY_EXTENSION = {
+    extension: language for language in LANGUAGES for extension in language.extensions
+}
 
 
 class SortedDocuments(NamedTuple):
@@ -76,21 +158,40 @@ class SortedDocuments(NamedTuple):
     other: List[Document]
 
 
+PARALLEL_DOCUMENTS_THRESHOLD = 500
+DOCUMENTS_PER_BATCH = 100
+
+
+def _split_documents(language: str, documents: List[Document]) -> List[Document]:
+    code_splitter = CodeSplitter(
+        language=language.lower(),
+        chunk_lines=40,
+        chunk_lines_overlap=15,
+        max_chars=1500,
+    )
+    return code_splitter.split_documents(documents)
+
+
 class DocumentChunker:
+    @staticmethod
     def chunk_documents(documents: List[Document]) -> List[Document]:
         chunked_documents = []
 
         sorted_documents = _sort_documents_by_programming_language_or_other(documents)
 
-        for language, language_documents in sorted_documents.by_language.items():
-            code_splitter = CodeSplitter(
-                language=language.lower(),
-                chunk_lines=40,
-                chunk_lines_overlap=15,
-                max_chars=1500,
-            )
-
-            chunked_documents.extend(code_splitter.split_documents(language_documents))
+        batches = [
+            (language, language_documents[i : i + DOCUMENTS_PER_BATCH])
+            for language, language_documents in sorted_documents.by_language.items()
+            for i in range(0, len(language_documents), DOCUMENTS_PER_BATCH)
+        ]
+        workers = os.cpu_count() or 1
+        if batches and len(documents) >= PARALLEL_DOCUMENTS_THRESHOLD and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for chunks in executor.map(_split_documents, *zip(*batches)):
+                    chunked_documents.extend(chunks)
+        else:
+            for language, language_documents in batches:
+                chunked_documents.extend(_split_documents(language, language_documents))
 
         # for now only include code files!
         # chunked_documents.extend(sorted_documents.other)
@@ -98,7 +199,10 @@ class DocumentChunker:
         return chunked_documents
 
 
-@staticmethod
+def get_language(filename: str) -> Optional[Language]:
+    return LANGUAGES_BY_EXTENSION.get(Path(filename).suffix.lower())
+
+
 def _sort_documents_by_programming_language_or_other(
     documents: List[Document],
 ) -> SortedDocuments:
@@ -106,30 +210,15 @@ def _sort_documents_by_programming_language_or_other(
     other_docs = []
 
     for doc in documents:
-        filename = str(doc.metadata.get("filename"))
-        extension = Path(filename).suffix
-        language_found = False
-
-        for lang in [
-            {"name": "Python", "extensions": [".py"], "tree_sitter_name": "python"},
-            {
-                "name": "JavaScript",
-                "extensions": [".js", ".mjs"],
-                "tree_sitter_name": "javascript",
-            },
-        ]:
-            if extension in lang["extensions"]:
-                doc.metadata["is_code"] = True
-                doc.metadata["code_language"] = lang["name"]
-                doc.metadata["code_language_tree_sitter_name"] = lang[
-                    "tree_sitter_name"
-                ]
-                docs_to_split[lang["tree_sitter_name"]].append(doc)
-                language_found = True
-                break
-
-        if not language_found:
-            doc.metadata["isCode"] = False
+        lang = get_language(str(doc.metadata.get("filename")))
+        if lang is None:
+            doc.metadata["is_code"] = False
             other_docs.append(doc)
+            continue
+
+        doc.metadata["is_code"] = True
+        doc.metadata["code_language"] = lang.name
+        doc.metadata["code_language_tree_sitter_name"] = lang.tree_sitter_name
+        docs_to_split[lang.tree_sitter_name].append(doc)
 
     return SortedDocuments(by_language=dict(docs_to_split), other=other_docs)
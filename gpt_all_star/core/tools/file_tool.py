@@ -1,4 +1,8 @@
+import difflib
+import os
+import re
 import warnings
+from pathlib import Path
 from typing import Optional, Type
 
 from langchain_community.tools.file_management.utils import (
@@ -10,6 +14,9 @@ from langchain_core.callbacks.manager import CallbackManagerForToolRun
 from pydantic import BaseModel, Field
 from langchain_core.tools import BaseTool
 
+from gpt_all_star.core.file_cache import get_file_cache
+from gpt_all_star.helper.text_parser import format_file_to_input
+
 
 class UpdateFileInput(BaseModel):
     """Input for UpdateFileTool."""
@@ -67,3 +74,442 @@ class UpdateFileTool(BaseFileToolMixin, BaseTool):
             return f"Document edited and saved to {file_path}"
         except Exception as e:
             return "Error: " + str(e)
+
+
+FUZZY_MATCH_THRESHOLD = 0.9
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
+
+class EditConflictError(ValueError):
+    """Raised when an edit cannot be located unambiguously in the file."""
+
+
+class SearchReplaceEdit(BaseModel):
+    file_path: str = Field(..., description="name of file")
+    search: str = Field(
+        "",
+        description="Exact lines to be replaced, including enough surrounding lines to be unique. Leave empty to create a new file.",
+    )
+    replace: str = Field("", description="Lines to put in place of `search`.")
+
+
+class EditFileInput(BaseModel):
+    """Input for EditFileTool."""
+
+    edits: list[SearchReplaceEdit] = Field(
+        default_factory=list, description="Search/replace blocks to apply in order."
+    )
+    diff: Optional[str] = Field(
+        None,
+        description="A unified diff (`--- a/path`, `+++ b/path`, `@@` hunks), may span several files.",
+    )
+
+
+def _indentation(lines: list[str]) -> str:
+    for line in lines:
+        if line.strip():
+            return line[: len(line) - len(line.lstrip())]
+    return ""
+
+
+def _reindent(lines: list[str], source: str, target: str) -> list[str]:
+    if source == target:
+        return lines
+    return [
+        target + line[len(source) :] if line.startswith(source) else line
+        for line in lines
+    ]
+
+
+def _find_block(
+    lines: list[str], block: list[str], hint: Optional[int] = None
+) -> tuple[int, bool]:
+    """Locate `block` in `lines`, tolerating whitespace differences and small typos.
+
+    Returns the index of the first line and whether indentation was ignored.
+    """
+    size = len(block)
+    windows = range(len(lines) - size + 1)
+    for normalize, reindented in [
+        (lambda line: line, False),
+        (str.rstrip, False),
+        (str.strip, True),
+    ]:
+        expected = [normalize(line) for line in block]
+        matches = [
+            start
+            for start in windows
+            if [normalize(line) for line in lines[start : start + size]] == expected
+        ]
+        if len(matches) == 1 or (matches and hint is not None):
+            return min(matches, key=lambda start: abs(start - (hint or 0))), reindented
+        if matches:
+            raise EditConflictError(
+                f"the block matches {len(matches)} locations (lines {', '.join(str(m + 1) for m in matches[:10])}); include more surrounding lines"
+            )
+
+    expected = "\n".join(line.strip() for line in block)
+    scored = sorted(
+        (
+            (
+                difflib.SequenceMatcher(
+                    None,
+                    "\n".join(line.strip() for line in lines[start : start + size]),
+                    expected,
+                ).ratio(),
+                start,
+            )
+            for start in windows
+        ),
+        reverse=True,
+    )
+    if scored and scored[0][0] >= FUZZY_MATCH_THRESHOLD:
+        if len(scored) > 1 and scored[1][0] == scored[0][0] and hint is None:
+            raise EditConflictError(
+                f"the block is similar to several locations (lines {scored[0][1] + 1} and {scored[1][1] + 1}); include more surrounding lines"
+            )
+        return scored[0][1], True
+    closest = "\n".join(lines[scored[0][1] : scored[0][1] + size]) if scored else "N/A"
+    raise EditConflictError(
+        f"the block was not found. The closest lines in the file are:\n{closest}"
+    )
+
+
+def _replace_block(
+    lines: list[str], search: list[str], replace: list[str], hint: Optional[int] = None
+) -> tuple[list[str], int]:
+    if not search:
+        position = len(lines) if hint is None else min(hint, len(lines))
+        return lines[:position] + replace + lines[position:], position + len(replace)
+    start, reindented = _find_block(lines, search, hint)
+    if reindented:
+        replace = _reindent(
+            replace,
+            _indentation(search),
+            _indentation(lines[start : start + len(search)]),
+        )
+    return (
+        lines[:start] + replace + lines[start + len(search) :],
+        start + len(replace),
+    )
+
+
+def _diff_path(header: str) -> Optional[str]:
+    path = header[4:].split("\t")[0].strip()
+    if path == "/dev/null":
+        return None
+    if path.startswith(("a/", "b/")):
+        path = path[2:]
+    return path
+
+
+def parse_unified_diff(diff: str) -> list[tuple[Optional[str], Optional[str], list]]:
+    """Split a unified diff into (old path, new path, hunks) with hunks as (line, old, new)."""
+    files = []
+    lines = diff.splitlines()
+    index = 0
+    while index < len(lines):
+        if not (
+            lines[index].startswith("--- ")
+            and index + 1 < len(lines)
+            and lines[index + 1].startswith("+++ ")
+        ):
+            index += 1
+            continue
+        old_path, new_path = _diff_path(lines[index]), _diff_path(lines[index + 1])
+        hunks = []
+        index += 2
+        while index < len(lines) and not lines[index].startswith("--- "):
+            header = HUNK_HEADER_PATTERN.match(lines[index])
+            index += 1
+            if not header:
+                continue
+            old, new = [], []
+            while index < len(lines) and not lines[index].startswith(("@@", "--- ")):
+                line = lines[index]
+                if line.startswith("-"):
+                    old.append(line[1:])
+                elif line.startswith("+"):
+                    new.append(line[1:])
+                elif not line.startswith("\\"):
+                    old.append(line[1:])
+                    new.append(line[1:])
+                index += 1
+            hunks.append((int(header.group(1)), old, new))
+        files.append((old_path, new_path, hunks))
+    return files
+
+
+class EditFileTool(BaseFileToolMixin, BaseTool):
+    name: str = "edit_file"
+    """Name of tool."""
+
+    args_schema: Type[BaseModel] = EditFileInput
+    """Schema for input arguments."""
+
+    description: str = (
+        "Edit existing files with search/replace blocks or a unified diff instead of rewriting them. "
+        "All edits are applied atomically: if any block cannot be located, no file is changed."
+    )
+    """Description of tool."""
+
+    def _run(
+        self,
+        edits: Optional[list] = None,
+        diff: Optional[str] = None,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        """Tool that applies edits to several files or none of them."""
+        contents: dict[str, Optional[list[str]]] = {}
+        paths: dict[str, Path] = {}
+
+        def load(file_path: str) -> Optional[list[str]]:
+            if file_path not in contents:
+                paths[file_path] = self.get_relative_path(file_path)
+                contents[file_path] = (
+                    paths[file_path].read_text(encoding="utf-8").splitlines()
+                    if paths[file_path].is_file()
+                    else None
+                )
+            return contents[file_path]
+
+        try:
+            for edit in edits or []:
+                if isinstance(edit, dict):
+                    edit = SearchReplaceEdit(**edit)
+                lines = load(edit.file_path)
+                search = edit.search.splitlines()
+                if lines is None and search:
+                    raise EditConflictError(f"{edit.file_path} does not exist")
+                try:
+                    contents[edit.file_path], _ = _replace_block(
+                        lines or [], search, edit.replace.splitlines()
+                    )
+                except EditConflictError as e:
+                    # Fall back to a plain substring for blocks within a line.
+                    text = "\n".join(lines or [])
+                    if text.count(edit.search) != 1:
+                        raise EditConflictError(f"{edit.file_path}: {e}") from e
+                    contents[edit.file_path] = text.replace(
+                        edit.search, edit.replace
+                    ).splitlines()
+
+            for old_path, new_path, hunks in parse_unified_diff(diff or ""):
+                if new_path is None:
+                    if load(old_path) is None:
+                        raise EditConflictError(f"{old_path} does not exist")
+                    contents[old_path] = None
+                    continue
+                lines = load(old_path) if old_path else None
+                if old_path is None and load(new_path) is not None:
+                    raise EditConflictError(f"{new_path} already exists")
+                lines = list(lines or [])
+                offset = 0
+                for line_number, old, new in hunks:
+                    hint = max(line_number - 1 + offset, 0)
+                    try:
+                        lines, end = _replace_block(lines, old, new, hint)
+                    except EditConflictError as e:
+                        raise EditConflictError(
+                            f"{new_path}: hunk at line {line_number}: {e}"
+                        ) from e
+                    offset = end - (line_number - 1 + len(old))
+                if old_path and old_path != new_path:
+                    contents[old_path] = None
+                load(new_path)
+                contents[new_path] = lines
+        except FileValidationError as e:
+            return f"Error: {e}"
+        except (EditConflictError, UnicodeDecodeError) as e:
+            return f"Error: no file was changed, {e}"
+
+        if not contents:
+            return "Error: no edits were given."
+        try:
+            self._write_atomically(
+                {paths[file_path]: lines for file_path, lines in contents.items()}
+            )
+        except OSError as e:
+            return f"Error: no file was changed, {e}"
+        return "\n".join(
+            f"{'Deleted' if lines is None else 'Edited'} {file_path}"
+            for file_path, lines in contents.items()
+        )
+
+    @staticmethod
+    def _write_atomically(contents: dict[Path, Optional[list[str]]]) -> None:
+        originals = {
+            path: path.read_bytes() if path.is_file() else None for path in contents
+        }
+        written = []
+        try:
+            for path, lines in contents.items():
+                written.append(path)
+                if lines is None:
+                    path.unlink(missing_ok=True)
+                    continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                temporary_path = path.with_name(f".{path.name}.tmp")
+                temporary_path.write_text(
+                    "\n".join(lines) + "\n" if lines else "", encoding="utf-8"
+                )
+                os.replace(temporary_path, path)
+        except OSError:
+            for path in written:
+                if originals[path] is None:
+                    path.unlink(missing_ok=True)
+                else:
+                    path.write_bytes(originals[path])
+            raise
+
+
+class ReadFilesInput(BaseModel):
+    """Input for ReadFilesTool."""
+
+    file_paths: list[str] = Field(..., description="names of files to read")
+
+
+class ReadFilesTool(BaseFileToolMixin, BaseTool):
+    name: str = "read_files"
+    """Name of tool."""
+
+    args_schema: Type[BaseModel] = ReadFilesInput
+    """Schema for input arguments."""
+
+    description: str = "Read several files at once."
+    """Description of tool."""
+
+    def _run(
+        self,
+        file_paths: list[str],
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        cache = get_file_cache(self.root_dir or ".")
+        outputs = []
+        for file_path in file_paths:
+            try:
+                relative_path = self.get_relative_path(file_path).relative_to(
+                    cache.path
+                )
+                outputs.append(
+                    format_file_to_input(file_path, cache.read(str(relative_path)))
+                )
+            except FileValidationError:
+                outputs.append(
+                    INVALID_PATH_TEMPLATE.format(arg_name="file_path", value=file_path)
+                )
+            except (OSError, UnicodeDecodeError) as e:
+                outputs.append(f"Error: {file_path}: {e}")
+        return "\n".join(outputs)
+
+
+class TreeInput(BaseModel):
+    """Input for TreeTool."""
+
+    dir_path: str = Field(".", description="subdirectory to list")
+
+
+class TreeTool(BaseFileToolMixin, BaseTool):
+    name: str = "tree"
+    """Name of tool."""
+
+    args_schema: Type[BaseModel] = TreeInput
+    """Schema for input arguments."""
+
+    description: str = "List all files under a directory recursively with their sizes."
+    """Description of tool."""
+
+    def _run(
+        self,
+        dir_path: str = ".",
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        cache = get_file_cache(self.root_dir or ".")
+        try:
+            prefix = str(self.get_relative_path(dir_path).relative_to(cache.path))
+        except FileValidationError:
+            return INVALID_PATH_TEMPLATE.format(arg_name="dir_path", value=dir_path)
+        lines = []
+        directories: set[str] = set()
+        for relative_path, size in cache.files():
+            if prefix != "." and not relative_path.startswith(f"{prefix}/"):
+                continue
+            parts = Path(relative_path).parts
+            for depth in range(len(parts) - 1):
+                directory = "/".join(parts[: depth + 1])
+                if directory not in directories:
+                    directories.add(directory)
+                    lines.append(f"{'  ' * depth}{parts[depth]}/")
+            lines.append(f"{'  ' * (len(parts) - 1)}{parts[-1]} ({size} bytes)")
+        return "\n".join(lines) if lines else f"No files found in {dir_path}"
+
+
+class GrepInput(BaseModel):
+    """Input for GrepTool."""
+
+    pattern: str = Field(..., description="Python regular expression to search for")
+    dir_path: str = Field(".", description="subdirectory to search in")
+    context: int = Field(2, description="number of lines to show around each match")
+
+
+class GrepTool(BaseFileToolMixin, BaseTool):
+    name: str = "grep"
+    """Name of tool."""
+
+    args_schema: Type[BaseModel] = GrepInput
+    """Schema for input arguments."""
+
+    description: str = "Search the contents of all files for a regular expression and show the matching lines with context."
+    """Description of tool."""
+
+    max_matches: int = 50
+    """Maximum number of matches to return."""
+
+    def _run(
+        self,
+        pattern: str,
+        dir_path: str = ".",
+        context: int = 2,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        cache = get_file_cache(self.root_dir or ".")
+        try:
+            regex = re.compile(pattern)
+            prefix = str(self.get_relative_path(dir_path).relative_to(cache.path))
+        except re.error as e:
+            return f"Error: invalid pattern {pattern!r}: {e}"
+        except FileValidationError:
+            return INVALID_PATH_TEMPLATE.format(arg_name="dir_path", value=dir_path)
+
+        blocks = []
+        matches = 0
+        truncated = False
+        for relative_path, _ in cache.files():
+            if prefix != "." and not relative_path.startswith(f"{prefix}/"):
+                continue
+            try:
+                lines = cache.read(relative_path).splitlines()
+            except (OSError, UnicodeDecodeError):
+                continue
+            numbers = [n for n, line in enumerate(lines) if regex.search(line)]
+            if matches + len(numbers) > self.max_matches:
+                numbers = numbers[: self.max_matches - matches]
+                truncated = True
+            matches += len(numbers)
+            shown = -1
+            for number in numbers:
+                start = max(number - context, shown + 1)
+                if blocks and (shown < 0 or start > shown + 1):
+                    blocks.append("--")
+                for index in range(start, min(number + context + 1, len(lines))):
+                    separator = ":" if regex.search(lines[index]) else "-"
+                    blocks.append(
+                        f"{relative_path}{separator}{index + 1}{separator} {lines[index]}"
+                    )
+                    shown = index
+            if truncated:
+                blocks.append(
+                    f"... more than {self.max_matches} matches, narrow the pattern"
+                )
+                break
+        return "\n".join(blocks) if blocks else f"No matches for {pattern!r}"
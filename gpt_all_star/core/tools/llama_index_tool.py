@@ -1,36 +1,230 @@
+import hashlib
+import importlib.util
+import json
+import os
+import threading
 from pathlib import Path
+from typing import Any
+
+from langchain_core.documents import Document as LangchainDocument
+from langchain_core.embeddings import Embeddings
+from langchain_core.tools import Tool
+from llama_index.core import StorageContext, load_index_from_storage
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.embeddings import resolve_embed_model
 from llama_index.core.indices import VectorStoreIndex
-from llama_index.core.readers import SimpleDirectoryReader
-from llama_index.core.schema import Document
+from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+from pydantic import PrivateAttr
 
+from gpt_all_star.core.llm import LLM_TYPE, create_embeddings
 from gpt_all_star.core.tools.document_chunker import DocumentChunker
-from langchain_core.tools import Tool
+from gpt_all_star.helper.paths import EXCLUDED_DIRS, INDEX_DIR
+from gpt_all_star.helper.text_parser import format_file_to_input
 
+LOCAL_EMBEDDINGS_MODULE = "llama_index.embeddings.huggingface"
+MANIFEST_FILE = "manifest.json"
+SIMILARITY_TOP_K = 5
 
-def llama_index_tool(path: Path) -> Tool:
-    def name_metadata_store(filename: str) -> dict:
-        return {"filename": filename}
 
-    def update_documents_and_query(query: str) -> str:
-        excluded_file_globs = ["./.archive/**/*", "./node_modules/**/*"]
-        documents = SimpleDirectoryReader(
-            input_dir=str(path.absolute()),
-            recursive=True,
-            exclude=excluded_file_globs,
-            file_metadata=name_metadata_store,
-        ).load_data()
-        print(f"Loaded {len(documents)} documents")
-
-        chunked_langchain_documents = DocumentChunker.chunk_documents(
-            [doc.to_langchain_format() for doc in documents]
+class EndpointEmbedding(BaseEmbedding):
+    """LlamaIndex embedding model backed by the LangChain embeddings of an endpoint."""
+
+    _embeddings: Any = PrivateAttr()
+
+    def __init__(self, embeddings: Embeddings, **kwargs: Any) -> None:
+        super().__init__(model_name=type(embeddings).__name__, **kwargs)
+        self._embeddings = embeddings
+
+    def _get_query_embedding(self, query: str) -> list[float]:
+        return self._embeddings.embed_query(query)
+
+    async def _aget_query_embedding(self, query: str) -> list[float]:
+        return await self._embeddings.aembed_query(query)
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        return self._embeddings.embed_documents([text])[0]
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        return self._embeddings.embed_documents(texts)
+
+
+def _embed_model_name() -> str:
+    """LLAMA_INDEX_EMBED_MODEL, with `default` resolved for the configured ENDPOINT."""
+    name = os.getenv("LLAMA_INDEX_EMBED_MODEL", "default")
+    if name == "default" and LLM_TYPE[os.getenv("ENDPOINT", default="OPENAI")] == (
+        LLM_TYPE.ANTHROPIC
+    ):
+        # Anthropic has no embedding API, embed offline instead.
+        return "local"
+    return name
+
+
+def embeddings_available() -> bool:
+    """Whether `create_embed_model` can build a backend, without building it.
+
+    Offline embeddings need the optional llama-index-embeddings-huggingface package.
+    """
+    if not _embed_model_name().startswith("local"):
+        return True
+    try:
+        return importlib.util.find_spec(LOCAL_EMBEDDINGS_MODULE) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def create_embed_model() -> BaseEmbedding:
+    """LLAMA_INDEX_EMBED_MODEL, or by default the embeddings of the configured ENDPOINT."""
+    name = _embed_model_name()
+    if name != "default":
+        return resolve_embed_model(name)
+    return EndpointEmbedding(
+        create_embeddings(LLM_TYPE[os.getenv("ENDPOINT", default="OPENAI")])
+    )
+
+
+class PersistentCodeIndex:
+    """Vector index persisted to disk that only re-embeds files whose content changed."""
+
+    def __init__(
+        self,
+        path: Path,
+        persist_dir: Path,
+        embed_model: BaseEmbedding | None = None,
+    ) -> None:
+        self.path = Path(path).absolute()
+        self.persist_dir = Path(persist_dir).absolute()
+        self.embed_model = embed_model
+        self._lock = threading.Lock()
+        self._index: VectorStoreIndex | None = None
+        self._manifest: dict[str, dict] = {}
+
+    def query(self, query: str) -> str:
+        with self._lock:
+            self.refresh()
+            nodes = self._index.as_retriever(
+                similarity_top_k=SIMILARITY_TOP_K
+            ).retrieve(query)
+        if not nodes:
+            return "No matching source code found."
+        return "\n".join(
+            format_file_to_input(
+                node.metadata.get("filename", ""), node.get_content().strip()
+            )
+            for node in nodes
+        )
+
+    def refresh(self) -> int:
+        if self._index is None:
+            self._load()
+
+        current = {}
+        changed = []
+        for file_path in self._source_files():
+            relative_path = str(file_path.relative_to(self.path))
+            stat = file_path.stat()
+            entry = self._manifest.get(relative_path, {})
+            if (
+                entry.get("mtime") == stat.st_mtime
+                and entry.get("size") == stat.st_size
+            ):
+                current[relative_path] = entry
+                continue
+            digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+            current[relative_path] = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "hash": digest,
+            }
+            if entry.get("hash") != digest:
+                changed.append(relative_path)
+
+        removed = [path for path in self._manifest if path not in current]
+        for relative_path in changed + removed:
+            if relative_path in self._manifest:
+                self._index.delete_ref_doc(relative_path, delete_from_docstore=True)
+        for relative_path in changed:
+            self._index.insert_nodes(self._chunk_file(relative_path))
+
+        if changed or removed or current != self._manifest:
+            self._manifest = current
+            self._persist()
+        return len(changed) + len(removed)
+
+    def _load(self) -> None:
+        if self.embed_model is None:
+            self.embed_model = create_embed_model()
+        embed_model = self.embed_model
+        manifest_path = self.persist_dir / MANIFEST_FILE
+        if manifest_path.is_file():
+            storage_context = StorageContext.from_defaults(
+                persist_dir=str(self.persist_dir)
+            )
+            self._index = load_index_from_storage(
+                storage_context, embed_model=embed_model
+            )
+            self._manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        else:
+            self._index = VectorStoreIndex(nodes=[], embed_model=embed_model)
+            self._manifest = {}
+
+    def _persist(self) -> None:
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
+        self._index.storage_context.persist(persist_dir=str(self.persist_dir))
+        (self.persist_dir / MANIFEST_FILE).write_text(
+            json.dumps(self._manifest), encoding="utf-8"
         )
-        chunked_documents = [
-            Document.from_langchain_format(doc) for doc in chunked_langchain_documents
+
+    def _source_files(self) -> list[Path]:
+        files = []
+        for root, dirs, filenames in os.walk(self.path):
+            dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+            files.extend(Path(root) / filename for filename in filenames)
+        return sorted(files)
+
+    def _chunk_file(self, relative_path: str) -> list[TextNode]:
+        file_path = self.path / relative_path
+        try:
+            content = file_path.read_text(encoding="utf-8")
+            chunks = DocumentChunker.chunk_documents(
+                [
+                    LangchainDocument(
+                        page_content=content, metadata={"filename": str(file_path)}
+                    )
+                ]
+            )
+        except (UnicodeDecodeError, ValueError):
+            return []
+        return [
+            TextNode(
+                text=chunk.page_content,
+                metadata={"filename": f"./{relative_path}"},
+                relationships={
+                    NodeRelationship.SOURCE: RelatedNodeInfo(node_id=relative_path)
+                },
+            )
+            for chunk in chunks
         ]
 
-        index = VectorStoreIndex.from_documents(documents=chunked_documents)
 
-        return str(index.as_query_engine().query(query))
+_indexes: dict[tuple[str, str], PersistentCodeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_code_index(path: Path, persist_dir: Path | None = None) -> PersistentCodeIndex:
+    persist_dir = Path(persist_dir or Path(path) / INDEX_DIR).absolute()
+    key = (str(Path(path).absolute()), str(persist_dir))
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = PersistentCodeIndex(path, persist_dir)
+        return _indexes[key]
+
+
+def llama_index_tool(path: Path, persist_dir: Path | None = None) -> Tool:
+    def update_documents_and_query(query: str) -> str:
+        try:
+            return get_code_index(path, persist_dir).query(query)
+        except Exception as e:
+            return f"Error: {e}"
 
     return Tool(
         name="LlamaIndex",
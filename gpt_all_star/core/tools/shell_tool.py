@@ -1,13 +1,23 @@
 import logging
 import platform
-import subprocess
 import warnings
+from pathlib import Path
 from typing import Optional, Type, Union
 
 from langchain_core.callbacks import CallbackManagerForToolRun
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field, model_validator
 
+from gpt_all_star.core.command_output import (
+    clean_lines,
+    save_log,
+    summarize_output,
+)
+from gpt_all_star.core.dependencies import is_install_command
+from gpt_all_star.core.process_supervisor import get_process_supervisor
+from gpt_all_star.core.storage import Storages
+from gpt_all_star.helper.paths import LOG_DIR
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +75,9 @@ class ShellTool(BaseTool):
     verbose: bool = False
     """If True, print the stdout."""
 
+    storages: Optional[Storages] = None
+    """If specified, dependencies are restored or cached around install commands."""
+
     def _run(
         self,
         commands: Union[str, list[str]],
@@ -92,12 +105,28 @@ class ShellTool(BaseTool):
                     logger.info("Invalid input. User aborted command execution.")
                     return None
 
-            return self._execute_commands(commands, timeout)
+            if not (self.storages and is_install_command(commands)):
+                return self._format_output(
+                    commands, *self._execute_commands(commands, timeout)
+                )
+
+            for decision in self.storages.prepare_dependencies():
+                self._log(decision)
+            returncode, stdout, stderr = self._execute_commands(commands, timeout)
+            if returncode == 0:
+                if decision := self.storages.save_dependencies():
+                    self._log(decision)
+            return self._format_output(commands, returncode, stdout, stderr)
 
         except Exception as e:
             logger.error(f"Error during command execution: {e}")
             return None
 
+    def _log(self, message: str) -> None:
+        logger.info(message)
+        if self.verbose:
+            print(message)
+
     def _is_command_not_allowed(
         self, commands: Union[str, list[str]], not_allowed_commands: list[str]
     ) -> bool:
@@ -118,32 +147,46 @@ class ShellTool(BaseTool):
 
     def _execute_commands(
         self, commands: Union[str, list[str]], timeout: int
-    ) -> Optional[str]:
-        """Execute commands and return the output."""
-        import time
-
-        process = subprocess.Popen(
-            commands,
-            shell=True,
-            cwd=self.root_dir,
-            text=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        start_time = time.time()
-        while True:
-            if process.poll() is not None:
-                stdout, stderr = process.communicate()
-                if process.returncode != 0:
-                    if self.verbose:
-                        logger.error(f"Error during command execution: {stdout}")
-                    return None
-                if self.verbose:
-                    print(stdout)
-                # time_count = time.time() - start_time
-                # print(f"Time count: {time_count}")
-                return stdout
-            if time.time() - start_time > timeout:
-                process.terminate()
-                logger.info("Command execution timed out.")
-                return None
+    ) -> tuple[Optional[int], str, str]:
+        """Execute commands and return the exit code (None on timeout), stdout and stderr."""
+        command = " && ".join(commands) if isinstance(commands, list) else commands
+        result = get_process_supervisor().run(command, self.root_dir, timeout)
+        if result.returncode is None:
+            logger.info("Command execution timed out.")
+        elif result.returncode != 0 and self.verbose:
+            logger.error(
+                f"Error during command execution: {result.stderr or result.stdout}"
+            )
+        elif self.verbose:
+            print(result.stdout)
+        if self.verbose and result.usage:
+            print(f"Resource usage: {result.usage}")
+        return result.returncode, result.stdout, result.stderr
+
+    def _format_output(
+        self,
+        commands: Union[str, list[str]],
+        returncode: Optional[int],
+        stdout: str,
+        stderr: str,
+    ) -> str:
+        """Summarize the output, keeping the full log on disk when anything is left out."""
+        output = stdout if returncode == 0 else f"{stdout}\n{stderr}"
+        summary = summarize_output(output)
+        cleaned = "\n".join(clean_lines(output))
+        if returncode == 0 and summary == cleaned:
+            # Nothing was left out, at most terminal escapes and repeated lines.
+            return stdout if cleaned == stdout.rstrip() else cleaned
+
+        command = " && ".join(commands) if isinstance(commands, list) else commands
+        log_dir = (
+            self.storages.root.path if self.storages else Path(self.root_dir)
+        ) / LOG_DIR
+        log_path = save_log(log_dir, command, stdout, stderr)
+        if returncode is None:
+            status = "Command timed out."
+        elif returncode != 0:
+            status = f"Command failed with exit code {returncode}."
+        else:
+            status = "Command succeeded, the output was shortened."
+        return f"{status}\n{summary}\nFull log: {log_path}"
@@ -0,0 +1,22 @@
+from langchain_core.tools import Tool
+
+from gpt_all_star.core.symbol_index import SymbolIndex
+
+
+def symbol_lookup_tool(symbol_index: SymbolIndex) -> Tool:
+    def find_symbol(name: str) -> str:
+        try:
+            return symbol_index.find(name)
+        except Exception as e:
+            return f"Error: {e}"
+
+    return Tool(
+        name="find_symbol",
+        func=find_symbol,
+        description=(
+            "Find where a component, hook, function or route path is defined, "
+            "exported, imported and rendered in the application in a single call. "
+            "Input is the symbol name (e.g. `TodoList`, `useTodos`) or route path."
+        ),
+        return_direct=False,
+    )
@@ -5,6 +5,8 @@ import git
 import requests
 from github import Github
 
+from gpt_all_star.helper.paths import ARTIFACT_FILES, EXCLUDED_DIRS
+
 
 class Git:
     def __init__(self, repo_path: Path) -> None:
@@ -20,12 +22,14 @@ class Git:
         return f"https://github.com/{os.getenv('GITHUB_ORG')}/{self.repo_path.name}"
 
     def files(self):
-        excluded_dirs = ["node_modules", ".git", ".archive", ".idea", "build"]
+        excluded = EXCLUDED_DIRS + ARTIFACT_FILES
         return [
             str(file)
             for file in self.repo_path.rglob("*")
             if file.is_file()
-            and not any(excluded_dir in str(file) for excluded_dir in excluded_dirs)
+            and not any(
+                part in excluded for part in file.relative_to(self.repo_path).parts
+            )
         ]
 
     def diffs(self):
@@ -0,0 +1,26 @@
+"""Names of the directories and files written next to the source code of the app.
+
+Anything walking the project or the app skips them, they are never part of the app.
+"""
+
+ARCHIVE_DIR = ".archive"
+DEPENDENCY_DIR = "node_modules"
+INDEX_DIR = ".llama_index"
+LOG_DIR = ".logs"
+WORKSPACE_DIR = ".workspaces"
+
+EXCLUDED_DIRS = [
+    DEPENDENCY_DIR,
+    ".git",
+    ARCHIVE_DIR,
+    ".idea",
+    "build",
+    INDEX_DIR,
+    LOG_DIR,
+    WORKSPACE_DIR,
+]
+EXCLUDED_FILES = ["package-lock.json", "yarn.lock"]
+
+RUN_COMMAND_FILE = ".run_command.json"
+QA_MANIFEST_FILE = ".qa_manifest.json"
+ARTIFACT_FILES = [RUN_COMMAND_FILE, QA_MANIFEST_FILE]
@@ -55,13 +55,24 @@ def main(
         "--plan_and_solve",
         help="Plan-and-Solve Prompting",
     ),
+    clean_install: bool = typer.Option(
+        False,
+        "--clean_install",
+        help="Do not restore dependencies from previous results",
+    ),
 ) -> None:
     load_dotenv()
     console = ConsoleTerminal()
     console.title(COMMAND_NAME)
 
     project = Project(
-        step, project_name, japanese_mode, review_mode, debug_mode, plan_and_solve
+        step,
+        project_name,
+        japanese_mode,
+        review_mode,
+        debug_mode,
+        plan_and_solve,
+        clean_install,
     )
     project.start()
     project.finish()
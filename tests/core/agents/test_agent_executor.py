@@ -0,0 +1,161 @@
+import threading
+import time
+
+from langchain_core.agents import AgentAction, AgentFinish
+from langchain.agents.agent import BaseMultiActionAgent
+from langchain.agents.output_parsers.tools import ToolAgentAction
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+
+from gpt_all_star.core.agents.agent_executor import (
+    ConcurrentAgentExecutor,
+    ToolCallAccess,
+)
+from gpt_all_star.core.metrics import metrics
+
+
+class ScriptedAgent(BaseMultiActionAgent):
+    turns: list
+
+    @property
+    def input_keys(self):
+        return ["input"]
+
+    def plan(self, intermediate_steps, callbacks=None, **kwargs):
+        return self.turns[1 if intermediate_steps else 0]
+
+    async def aplan(self, intermediate_steps, callbacks=None, **kwargs):
+        raise NotImplementedError
+
+
+def _executor(turn, tools):
+    agent = ScriptedAgent(turns=[turn, AgentFinish({"output": "done"}, "")])
+    return ConcurrentAgentExecutor(agent=agent, tools=tools)
+
+
+def test_tool_calls_of_one_turn_run_concurrently():
+    running = []
+    lock = threading.Lock()
+    peak = []
+
+    def read_file(file_path: str) -> str:
+        with lock:
+            running.append(file_path)
+            peak.append(len(running))
+        time.sleep(0.2)
+        with lock:
+            running.remove(file_path)
+        return file_path
+
+    metrics.reset()
+    tool = StructuredTool.from_function(read_file, name="read_file", description="")
+    turn = [
+        AgentAction("read_file", {"file_path": f"src/{i}.js"}, "") for i in range(3)
+    ]
+
+    started = time.perf_counter()
+    result = _executor(turn, [tool]).invoke({"input": ""})
+
+    assert result["output"] == "done"
+    assert time.perf_counter() - started < 0.5
+    assert max(peak) == 3
+    assert metrics.get("agent_executor.parallel_tool_calls") == 3
+    assert metrics.get("agent_executor.overlap_seconds") > 0.2
+
+
+def test_writes_to_the_same_path_keep_their_order():
+    written = []
+
+    def write_file(file_path: str, text: str) -> str:
+        time.sleep(0.1 if text == "first" else 0)
+        written.append(text)
+        return "ok"
+
+    tool = StructuredTool.from_function(write_file, name="write_file", description="")
+    turn = [
+        AgentAction("write_file", {"file_path": "src/App.jsx", "text": "first"}, ""),
+        AgentAction("write_file", {"file_path": "./src/App.jsx", "text": "second"}, ""),
+    ]
+
+    _executor(turn, [tool]).invoke({"input": ""})
+
+    assert written == ["first", "second"]
+
+
+def test_tool_call_conflicts():
+    def access(tool, tool_input):
+        return ToolCallAccess(AgentAction(tool, tool_input, ""))
+
+    write = access("write_file", {"file_path": "src/App.jsx", "text": ""})
+    assert write.conflicts_with(access("list_directory", {"dir_path": "src"}))
+    assert not write.conflicts_with(access("read_file", {"file_path": "src/index.js"}))
+    assert write.conflicts_with(access("terminal", {"commands": ["npm test"]}))
+    assert not access("terminal", "ls").conflicts_with(access("tree", {}))
+    assert write.conflicts_with(access("unknown_tool", {}))
+
+
+class LoopingAgent(BaseMultiActionAgent):
+    action: AgentAction
+
+    @property
+    def input_keys(self):
+        return ["input"]
+
+    def plan(self, intermediate_steps, callbacks=None, **kwargs):
+        return [self.action.model_copy(deep=True)]
+
+    async def aplan(self, intermediate_steps, callbacks=None, **kwargs):
+        raise NotImplementedError
+
+
+def _read_file_tool(output=lambda file_path: "same content"):
+    return StructuredTool.from_function(
+        lambda file_path: output(file_path), name="read_file", description=""
+    )
+
+
+def test_repeated_tool_calls_stop_the_executor():
+    metrics.reset()
+    agent = LoopingAgent(action=AgentAction("read_file", {"file_path": "a.js"}, ""))
+    executor = ConcurrentAgentExecutor(agent=agent, tools=[_read_file_tool()])
+
+    result = executor.invoke({"input": ""})
+
+    assert result["stop_reason"] == "repeated_tool_call"
+    assert "`read_file` was called 3 times" in result["output"]
+    assert metrics.get("agent_executor.stopped.repeated_tool_call") == 1
+
+
+def test_iteration_and_token_budgets():
+    counter = iter(range(100))
+    tool = _read_file_tool(lambda file_path: str(next(counter)))
+    agent = LoopingAgent(action=AgentAction("read_file", {"file_path": "a.js"}, ""))
+
+    result = ConcurrentAgentExecutor(
+        agent=agent, tools=[tool], max_iterations=4
+    ).invoke({"input": ""})
+    assert result["stop_reason"] == "iteration_budget"
+    assert result["output"].endswith("4 iterations were used.")
+
+    action = ToolAgentAction(
+        tool="read_file",
+        tool_input={"file_path": "a.js"},
+        log="",
+        message_log=[
+            AIMessage(
+                "",
+                usage_metadata={
+                    "input_tokens": 900,
+                    "output_tokens": 100,
+                    "total_tokens": 1000,
+                },
+            )
+        ],
+        tool_call_id="call",
+    )
+    agent = LoopingAgent(action=action)
+    result = ConcurrentAgentExecutor(agent=agent, tools=[tool], max_tokens=2500).invoke(
+        {"input": ""}
+    )
+    assert result["stop_reason"] == "token_budget"
+    assert result["output"].endswith("3000 tokens were used.")
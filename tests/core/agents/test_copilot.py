@@ -0,0 +1,62 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+from gpt_all_star.cli.console_terminal import ConsoleTerminal
+from gpt_all_star.core.agents.copilot import Copilot
+from gpt_all_star.core.storage import Storage, Storages
+
+
+@pytest.fixture
+def copilot(tmp_path, monkeypatch):
+    copilot = Copilot.__new__(Copilot)
+    copilot.storages = Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(tmp_path / "app"),
+        archive=Storage(tmp_path / ".archive"),
+    )
+    copilot.console = ConsoleTerminal()
+    copilot.name = "Copilot"
+    copilot.color = "white"
+    copilot._ = lambda text: text
+    monkeypatch.setattr(copilot, "_check_browser_errors", lambda url: None)
+    return copilot
+
+
+def test_run_command_returns_url_of_server_on_leased_port(copilot):
+    url = copilot.run_command(
+        f"{sys.executable} -m http.server $PORT --bind 127.0.0.1", display=False
+    )
+
+    assert url.startswith("http://localhost:")
+
+
+def test_run_command_raises_with_extracted_errors(copilot):
+    with pytest.raises(Exception) as error:
+        copilot.run_command("echo starting; echo 'Error: boom' >&2; exit 1")
+
+    assert error.value.args[0] == {
+        "stdout": "starting",
+        "stderr": "Error: boom",
+        "errors": "Error: boom",
+    }
+
+
+def test_cancelling_arun_command_stops_the_app(copilot, tmp_path):
+    async def run():
+        task = asyncio.create_task(
+            copilot.arun_command("echo $$ > pid; exec sleep 30", display=False)
+        )
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    pid = int((tmp_path / "app" / "pid").read_text())
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
@@ -0,0 +1,60 @@
+from gpt_all_star.core.execution import execution as execution_module
+from gpt_all_star.core.execution.execution import Execution
+from gpt_all_star.core.storage import Storage, Storages
+
+
+class FakeConsole:
+    def __init__(self):
+        self.sections = []
+
+    def section(self, title):
+        self.sections.append(title)
+
+
+class FakeCopilot:
+    def __init__(self, storages):
+        self.storages = storages
+        self.console = FakeConsole()
+        self.debug_mode = False
+
+    def caution(self, command):
+        pass
+
+    def state(self, text):
+        pass
+
+    def run_command(self, command):
+        raise Exception({"stderr": "Error: boom"})
+
+
+class FakeTeam:
+    def __init__(self):
+        self.healings = []
+        self.last_plan = []
+
+    def run(self, healing):
+        self.healings.append(healing)
+
+
+def test_escalated_failures_do_not_start_a_healing_step(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        execution_module, "resolve_run_command", lambda *args, **kwargs: "npm start"
+    )
+    storages = Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(tmp_path / "app"),
+        archive=Storage(tmp_path / ".archive"),
+    )
+    execution = Execution.__new__(Execution)
+    execution.team = FakeTeam()
+    execution.copilot = FakeCopilot(storages)
+    execution.candidates = 1
+    execution.preflight = False
+    execution._preflight_signature = None
+    execution._ = lambda message: message
+
+    execution.run()
+
+    assert len(execution.team.healings) == 2
+    assert execution.copilot.console.sections == ["STEP: Healing"] * 2
@@ -0,0 +1,44 @@
+from gpt_all_star.core.execution.healing_memory import (
+    HealingAttempt,
+    HealingMemory,
+    diff_snapshots,
+)
+
+
+def test_diff_snapshots():
+    before = {"/app/src/App.jsx": "a\nb\n", "/app/src/old.js": "x\n"}
+    after = {"/app/src/App.jsx": "a\nc\n", "/app/src/new.js": "y\n"}
+
+    diff = diff_snapshots(before, after, "/app")
+
+    assert "--- a/src/App.jsx\n+++ b/src/App.jsx" in diff
+    assert "-b\n+c" in diff
+    assert "--- /dev/null\n+++ b/src/new.js" in diff
+    assert "--- a/src/old.js\n+++ /dev/null" in diff
+
+
+def test_memory_describes_failed_attempts_and_escalates():
+    memory = HealingMemory()
+    assert memory.describe("abc") is None
+
+    memory.record(
+        HealingAttempt(
+            "abc", "SyntaxError", [{"action": "Edit"}], "-b\n+c", "2024-01-01T00:00:00"
+        )
+    )
+    memory.record(HealingAttempt("def", "Module not found"))
+
+    description = memory.describe("abc")
+    assert description.startswith(
+        "The following attempts already tried to fix this same error and failed."
+    )
+    assert (
+        '### Attempt 1 (2024-01-01T00:00:00)\nError:\n```\nSyntaxError\n```\nPlan:\n- {"action": "Edit"}'
+        in description
+    )
+    assert "Earlier attempts fixed other errors" in description
+    assert "No file was changed." in description
+    assert not memory.should_escalate("abc")
+
+    memory.record(HealingAttempt("abc", "SyntaxError"))
+    assert memory.should_escalate("abc")
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from gpt_all_star.core.execution import run_command
+from gpt_all_star.core.execution.run_command import (
+    detect_run_command,
+    resolve_run_command,
+)
+from gpt_all_star.core.storage import Storage, Storages
+
+
+def _write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.mark.parametrize(
+    "files, expected",
+    [
+        ({"run.sh": "npm start", "package.json": "{}"}, "sh ./run.sh"),
+        ({"frontend/run.sh": ""}, "cd frontend && sh ./run.sh"),
+        ({"a/run.sh": "", "b/run.sh": ""}, None),
+        ({"Procfile": "web: node server.js\n"}, "node server.js"),
+        (
+            {"package.json": json.dumps({"scripts": {"start": "react-scripts start"}})},
+            "npm install && npm start",
+        ),
+        (
+            {
+                "package.json": json.dumps({"scripts": {"dev": "vite"}}),
+                "yarn.lock": "",
+            },
+            "yarn install && yarn dev --port $PORT",
+        ),
+        (
+            {"package.json": json.dumps({"scripts": {"dev": "vite --port 4000"}})},
+            "npm install && npm run dev",
+        ),
+        ({"package.json": json.dumps({"scripts": {"test": "jest"}})}, None),
+        ({"index.html": "<html></html>"}, "python3 -m http.server $PORT"),
+        ({"src/App.jsx": ""}, None),
+    ],
+)
+def test_detect_run_command(tmp_path, files, expected):
+    for name, content in files.items():
+        _write(tmp_path / name, content)
+
+    assert detect_run_command(tmp_path) == expected
+
+
+def test_resolve_run_command_caches_by_marker_files(tmp_path, monkeypatch):
+    storages = Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(tmp_path / "app"),
+        archive=Storage(tmp_path / ".archive"),
+    )
+    storages.app["server.py"] = "print('hello')"
+    inferred = []
+
+    def infer(storages, debug_mode):
+        inferred.append(True)
+        return "python3 server.py"
+
+    monkeypatch.setattr(run_command, "infer_run_command", infer)
+
+    assert resolve_run_command(storages) == "python3 server.py"
+    storages.app["server.py"] = "print('changed')"
+    assert resolve_run_command(storages) == "python3 server.py"
+    assert len(inferred) == 1
+
+    storages.app["run.sh"] = "python3 server.py"
+    assert resolve_run_command(storages) == "sh ./run.sh"
+    assert len(inferred) == 1
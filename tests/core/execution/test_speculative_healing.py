@@ -0,0 +1,93 @@
+import time
+
+from gpt_all_star.core.diagnostics import Diagnostic
+from gpt_all_star.core.execution.speculative_healing import SpeculativeHealing
+from gpt_all_star.core.storage import Storage, Storages
+
+
+class FakeCopilot:
+    def __init__(self, storages):
+        self.storages = storages
+        self.debug_mode = False
+
+    def fork(self, storages):
+        return FakeCopilot(storages)
+
+    def run_command(self, command, display=True):
+        return "http://localhost:3000"
+
+
+class FakeTeam:
+    def __init__(self):
+        self.cancelled = None
+        self.last_plan = []
+        self.saw_cancel = False
+        self.diagnostics = None
+
+    def fork(self, copilot):
+        return FakeTeam()
+
+    def run(self, healing):
+        self.diagnostics = healing.diagnostics
+        app = healing.copilot.storages.app
+        if healing.approach.startswith("Make the smallest change"):
+            app["src/App.jsx"] = "fixed"
+            return
+        # A slow candidate keeps writing until it is told to stop.
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and not self.cancelled.is_set():
+            app["src/Slow.jsx"] = str(time.monotonic())
+            time.sleep(0.01)
+        self.saw_cancel = self.cancelled.is_set()
+
+
+def test_losing_candidates_stop_and_are_discarded_after_they_finish(tmp_path):
+    storages = Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(tmp_path / "app"),
+        archive=Storage(tmp_path / ".archive"),
+    )
+    storages.app["src/App.jsx"] = "broken"
+    healing = SpeculativeHealing(
+        FakeTeam(),
+        FakeCopilot(storages),
+        Exception({"stderr": "SyntaxError"}),
+        "npm start",
+        candidates=2,
+        preflight=False,
+    )
+    started = time.monotonic()
+
+    winner = healing.run()
+
+    assert time.monotonic() - started < 5
+    assert winner.number == 1
+    assert storages.app["src/App.jsx"] == "fixed"
+    assert "src/Slow.jsx" not in storages.app
+    assert healing.candidates[1].team.saw_cancel
+    for candidate in healing.candidates:
+        assert not candidate.workspace.path.exists()
+
+
+def test_candidates_heal_with_the_given_diagnostics(tmp_path):
+    storages = Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(tmp_path / "app"),
+        archive=Storage(tmp_path / ".archive"),
+    )
+    advisory = Diagnostic("syntax", "Unexpected 'with'", "src/data.js", 1, 30)
+    healing = SpeculativeHealing(
+        FakeTeam(),
+        FakeCopilot(storages),
+        Exception({"stderr": "SyntaxError"}),
+        "npm start",
+        candidates=1,
+        preflight=False,
+        diagnostics=[advisory],
+    )
+
+    healing.run()
+
+    assert healing.candidates[0].team.diagnostics == [advisory]
@@ -0,0 +1,70 @@
+import os
+
+from gpt_all_star.core.execution.workspace import WORKSPACE_DIR, Workspace
+from gpt_all_star.core.storage import Storage, Storages
+from gpt_all_star.core.tools.llama_index_tool import get_code_index
+
+
+def _storages(tmp_path):
+    return Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(tmp_path / "app"),
+        archive=Storage(tmp_path / ".archive"),
+    )
+
+
+def test_workspace_is_an_independent_copy(tmp_path):
+    storages = _storages(tmp_path)
+    storages.app["src/App.jsx"] = "old"
+    storages.app["node_modules/react/index.js"] = "react"
+
+    workspace = Workspace(storages)
+
+    assert workspace.path.parent == tmp_path / WORKSPACE_DIR
+    assert workspace.storages.app.path == workspace.path
+    assert workspace.storages.root is storages.root
+    assert os.path.samefile(
+        workspace.path / "node_modules/react/index.js",
+        storages.app.path / "node_modules/react/index.js",
+    )
+    workspace.storages.app["src/App.jsx"] = "new"
+    assert storages.app["src/App.jsx"] == "old"
+
+
+def test_promote_applies_changes_and_discard_removes_workspace(tmp_path):
+    storages = _storages(tmp_path)
+    storages.app["src/App.jsx"] = "old"
+    storages.app["src/Old.jsx"] = "old"
+    storages.app["package.json"] = "{}"
+    workspace = Workspace(storages)
+    workspace.storages.app["src/App.jsx"] = "new"
+    workspace.storages.app["src/New.jsx"] = "new"
+    del workspace.storages.app["src/Old.jsx"]
+
+    assert workspace.changes() == (["src/App.jsx", "src/New.jsx"], ["src/Old.jsx"])
+    assert workspace.promote() == ["src/App.jsx", "src/New.jsx", "src/Old.jsx"]
+    assert storages.app["src/App.jsx"] == "new"
+    assert storages.app["src/New.jsx"] == "new"
+    assert "src/Old.jsx" not in storages.app
+
+    workspace.discard()
+    assert not workspace.path.exists()
+
+
+def test_workspace_searches_its_own_copy_of_the_index(tmp_path):
+    storages = _storages(tmp_path)
+    storages.app["src/App.jsx"] = "old"
+    storages.index_dir.mkdir()
+    (storages.index_dir / "manifest.json").write_text("{}")
+
+    workspace = Workspace(storages)
+
+    assert workspace.storages.index_dir == workspace.index_dir
+    assert (workspace.index_dir / "manifest.json").read_text() == "{}"
+    assert get_code_index(storages.app.path, storages.index_dir) is not (
+        get_code_index(workspace.storages.app.path, workspace.storages.index_dir)
+    )
+    workspace.discard()
+    assert not workspace.index_dir.exists()
+    assert storages.index_dir.is_dir()
@@ -0,0 +1,100 @@
+import pytest
+
+from gpt_all_star.core.steps.quality_assurance.review_manifest import (
+    MANIFEST_FILE,
+    ReviewManifest,
+)
+from gpt_all_star.core.storage import Storage, Storages
+
+
+@pytest.fixture
+def storages(tmp_path):
+    app = tmp_path / "app"
+    (app / "src" / "components").mkdir(parents=True)
+    (app / "src" / "main.jsx").write_text('import App from "./App";\n')
+    (app / "src" / "App.jsx").write_text(
+        'import TodoList from "./components/TodoList";\n'
+    )
+    (app / "src" / "components" / "TodoList.jsx").write_text(
+        "export default function TodoList() {}\n"
+    )
+    (app / "src" / "utils.js").write_text("export const id = (x) => x;\n")
+    return Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(app),
+        archive=Storage(tmp_path / ".archive"),
+    )
+
+
+def test_first_review_covers_the_whole_app(storages):
+    assert ReviewManifest.load(storages).review_scope(storages) is None
+
+
+def test_scope_is_changed_files_and_their_importers(storages):
+    manifest = ReviewManifest.load(storages)
+    manifest.record(storages, reviewed=None, plan=[])
+    assert (storages.root.path / MANIFEST_FILE).is_file()
+    assert ReviewManifest.load(storages).review_scope(storages) == []
+
+    (storages.app.path / "src" / "components" / "TodoList.jsx").write_text(
+        "export default function TodoList({ todos }) {}\n"
+    )
+
+    assert ReviewManifest.load(storages).review_scope(storages) == [
+        "src/App.jsx",
+        "src/components/TodoList.jsx",
+    ]
+
+
+def test_findings_are_recorded_per_file(storages):
+    manifest = ReviewManifest.load(storages)
+    manifest.record(
+        storages,
+        reviewed=None,
+        plan=[
+            {
+                "action": "Edit an existing file",
+                "working_directory": "./src/components",
+                "filename": "TodoList.jsx",
+                "context": "Render the todos\nas a list.",
+            },
+            {"action": "Edit an existing file", "context": "Fix src/utils.js"},
+        ],
+    )
+    manifest.record(storages, reviewed=["src/utils.js"], plan=[])
+
+    loaded = ReviewManifest.load(storages)
+    assert loaded.findings == {
+        "src/components/TodoList.jsx": ["Render the todos as a list."]
+    }
+    assert loaded.describe(["src/components/TodoList.jsx", "src/utils.js"]) == (
+        "- ./src/components/TodoList.jsx: Render the todos as a list."
+    )
+
+
+def test_scope_covers_files_the_symbol_index_does_not_parse(storages):
+    (storages.app.path / "src" / "data.json").write_text('{"todos": []}')
+    (storages.app.path / "src" / "Card.vue").write_text("<template></template>\n")
+    (storages.app.path / "src" / "logo.png").write_bytes(b"\x89PNG\r\n\xff\x00")
+    manifest = ReviewManifest.load(storages)
+    manifest.record(storages, reviewed=None, plan=[])
+
+    (storages.app.path / "src" / "data.json").write_text('{"todos": [1]}')
+    (storages.app.path / "src" / "Card.vue").write_text("<template>x</template>\n")
+    (storages.app.path / "src" / "logo.png").write_bytes(b"\x89PNG\r\n\xff\x01")
+
+    assert ReviewManifest.load(storages).review_scope(storages) == [
+        "src/Card.vue",
+        "src/data.json",
+        "src/logo.png",
+    ]
+
+
+def test_deleted_files_bring_their_former_importers_into_scope(storages):
+    manifest = ReviewManifest.load(storages)
+    manifest.record(storages, reviewed=None, plan=[])
+
+    (storages.app.path / "src" / "components" / "TodoList.jsx").unlink()
+
+    assert ReviewManifest.load(storages).review_scope(storages) == ["src/App.jsx"]
@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import time
+import urllib.request
+
+import pytest
+
+from gpt_all_star.core.steps.entrypoint.run_script_template import (
+    build_run_script,
+    is_valid_shell,
+)
+
+
+def _package(path, scripts):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "package.json").write_text(json.dumps({"scripts": scripts}))
+
+
+def test_client_side_layout(tmp_path):
+    _package(tmp_path, {"dev": "vite", "build": "vite build"})
+
+    layout, script = build_run_script(tmp_path)
+
+    assert layout == "client-side"
+    assert script.endswith('cd "."\nnpm install\nexec npm run dev -- --port $PORT\n')
+    assert is_valid_shell(script)
+
+
+def test_full_stack_layout(tmp_path):
+    _package(tmp_path / "frontend", {"start": "react-scripts start"})
+    _package(tmp_path / "backend", {"start": "node index.js"})
+    (tmp_path / "backend" / "yarn.lock").write_text("")
+
+    layout, script = build_run_script(tmp_path)
+
+    assert layout == "full-stack"
+    assert '(cd "backend" && yarn install && env -u PORT yarn start) &' in script
+    assert script.endswith('cd "frontend"\nnpm install\nnpm start\n')
+    assert is_valid_shell(script)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.skipif(shutil.which("npm") is None, reason="requires Node.js")
+def test_full_stack_frontend_reaches_backend_on_its_default_port(tmp_path):
+    backend_port, frontend_port = _free_port(), _free_port()
+    _package(tmp_path / "backend", {"start": "node server.js"})
+    (tmp_path / "backend" / "server.js").write_text(
+        'require("http").createServer((req, res) => res.end("from backend"))'
+        f".listen(process.env.PORT || {backend_port});\n"
+    )
+    # Like a dev server proxy, written for the default port of the backend.
+    _package(tmp_path / "frontend", {"start": "node server.js"})
+    (tmp_path / "frontend" / "server.js").write_text(
+        """const http = require("http");
+http.createServer((req, res) => {
+  http.get("http://localhost:%d/", (api) => api.pipe(res))
+    .on("error", () => { res.statusCode = 502; res.end(); });
+}).listen(process.env.PORT);
+"""
+        % backend_port
+    )
+    _, script = build_run_script(tmp_path)
+    (tmp_path / "run.sh").write_text(script)
+
+    process = subprocess.Popen(
+        ["sh", "run.sh"],
+        cwd=tmp_path,
+        env={
+            **os.environ,
+            "PORT": str(frontend_port),
+            "npm_config_audit": "false",
+            "npm_config_fund": "false",
+            "npm_config_update_notifier": "false",
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    body = None
+    try:
+        for _ in range(60):
+            try:
+                with urllib.request.urlopen(
+                    f"http://localhost:{frontend_port}/", timeout=2
+                ) as response:
+                    body = response.read()
+                break
+            except OSError:
+                time.sleep(0.5)
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
+
+    assert body == b"from backend"
+
+
+def test_unknown_layouts_fall_back_to_agents(tmp_path):
+    assert build_run_script(tmp_path) is None
+    _package(tmp_path, {"test": "jest"})
+    assert build_run_script(tmp_path) is None
+
+
+def test_is_valid_shell_rejects_syntax_errors():
+    assert not is_valid_shell("if true; then\necho missing fi\n")
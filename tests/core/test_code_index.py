@@ -0,0 +1,34 @@
+from gpt_all_star.core.code_index import CodeIndex, tokenize
+
+
+def test_tokenize_splits_identifiers():
+    tokens = tokenize("const todoList = useTodoList(todo_items);")
+
+    assert {"todo", "list", "use", "items"} <= set(tokens)
+    assert "usetodolist" in tokens
+
+
+def test_search_ranks_matching_file_first(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/TodoList.js").write_text(
+        "export function TodoList({ todos }) {\n  return todos.map((todo) => todo.title);\n}\n"
+    )
+    (tmp_path / "src/Header.js").write_text(
+        "export function Header() {\n  return 'My application';\n}\n"
+    )
+    index = CodeIndex(tmp_path)
+
+    results = index.search("Fix rendering of the todo list")
+
+    assert results[0][1].path == "src/TodoList.js"
+
+
+def test_search_picks_up_written_and_deleted_files(tmp_path):
+    index = CodeIndex(tmp_path)
+    assert index.search("counter") == []
+
+    (tmp_path / "Counter.js").write_text("export const counter = 1;\n")
+    assert index.search("counter")[0][1].path == "Counter.js"
+
+    (tmp_path / "Counter.js").unlink()
+    assert index.search("counter") == []
@@ -0,0 +1,59 @@
+from gpt_all_star.core.command_output import (
+    clean_lines,
+    extract_error_blocks,
+    summarize_output,
+)
+
+BUILD_LOG = "\n".join(
+    ["> app@0.1.0 build", "> react-scripts build", ""]
+    + [f"\x1b[32mCompiling module {i}\x1b[0m" for i in range(300)]
+    + ["waiting..."] * 50
+    + [
+        "Failed to compile.",
+        "",
+        "./src/App.jsx",
+        "SyntaxError: /app/src/App.jsx: Unexpected token (12:4)",
+        "  10 |   return (",
+        "> 12 |     <Box>",
+        "",
+        "npm ERR! code ELIFECYCLE",
+        "npm ERR! errno 1",
+        "npm ERR! ",
+    ]
+)
+
+
+def test_clean_lines_strips_escapes_and_collapses_repeats():
+    lines = clean_lines(
+        "\x1b[31mred\x1b[0m\nsame\nsame\nsame\nprogress 1%\rprogress 100%\n"
+    )
+
+    assert lines == [
+        "red",
+        "same",
+        "(previous line repeated 2 more times)",
+        "progress 100%",
+    ]
+
+
+def test_extract_error_blocks():
+    blocks = extract_error_blocks(clean_lines(BUILD_LOG))
+
+    assert blocks == [
+        "Failed to compile.",
+        "SyntaxError: /app/src/App.jsx: Unexpected token (12:4)\n  10 |   return (\n> 12 |     <Box>",
+        "npm ERR! code ELIFECYCLE",
+        "npm ERR! errno 1",
+    ]
+
+
+def test_summarize_output_keeps_head_errors_and_tail_within_cap():
+    summary = summarize_output(BUILD_LOG, max_tokens=400)
+
+    assert len(summary) <= 400 * 4
+    assert summary.startswith("> app@0.1.0 build")
+    assert "lines omitted" in summary
+    assert "Errors:\nFailed to compile." in summary
+    assert summary.rstrip().endswith("npm ERR!")
+    assert "\x1b[" not in summary
+    assert summarize_output("added 1 package\n") == "added 1 package"
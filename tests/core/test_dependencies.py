@@ -0,0 +1,80 @@
+from gpt_all_star.core.dependencies import (
+    DependencyCache,
+    dependency_cache_key,
+    is_install_command,
+)
+from gpt_all_star.core.metrics import metrics
+
+
+def _write_app(path, package_json):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "package.json").write_text(package_json)
+
+
+def test_is_install_command():
+    assert is_install_command("cd app && npm install")
+    assert is_install_command(["yarn"])
+    assert not is_install_command("npm start")
+    assert not is_install_command("yarn start")
+
+
+def test_dependency_cache_key_ignores_order_and_unrelated_fields(tmp_path):
+    _write_app(
+        tmp_path / "a",
+        '{"name": "a", "dependencies": {"react": "^18", "@chakra-ui/react": "^2"}}',
+    )
+    _write_app(
+        tmp_path / "b",
+        '{"name": "b", "dependencies": {"@chakra-ui/react": "^2", "react": "^18"}}',
+    )
+
+    assert dependency_cache_key(tmp_path / "a") == dependency_cache_key(tmp_path / "b")
+
+
+def test_dependency_cache_key_follows_the_lockfile(tmp_path):
+    for name in ["a", "b"]:
+        _write_app(tmp_path / name, '{"dependencies": {"react": "^18"}}')
+    (tmp_path / "a" / "package-lock.json").write_text('{"react": "18.2.0"}')
+    (tmp_path / "b" / "package-lock.json").write_text('{"react": "18.3.1"}')
+
+    assert dependency_cache_key(tmp_path / "a") != dependency_cache_key(tmp_path / "b")
+
+
+def test_dependency_cache_shares_installs_between_projects(tmp_path):
+    metrics.reset()
+    cache = DependencyCache(tmp_path / ".cache")
+    first, second = tmp_path / "first", tmp_path / "second"
+    _write_app(first, '{"dependencies": {"react": "^18"}}')
+    _write_app(second, '{"dependencies": {"react": "^18"}}')
+
+    assert cache.prepare(first).startswith("Dependency cache miss")
+    (first / "node_modules/react").mkdir(parents=True)
+    (first / "node_modules/react/index.js").write_text("module.exports = {};")
+    assert cache.save(first).startswith("Stored node_modules")
+
+    assert cache.prepare(second).startswith("Dependency cache hit")
+    assert (second / "node_modules/react/index.js").read_text() == (
+        "module.exports = {};"
+    )
+    assert metrics.get("dependency_cache.hits") == 1
+    assert metrics.get("dependency_cache.misses") == 1
+
+
+def test_dependency_cache_drops_entries_changed_through_a_link(tmp_path):
+    metrics.reset()
+    cache = DependencyCache(tmp_path / ".cache")
+    first, second, third = tmp_path / "first", tmp_path / "second", tmp_path / "third"
+    for app in [first, second, third]:
+        _write_app(app, '{"dependencies": {"react": "^18"}}')
+    cache.prepare(first)
+    (first / "node_modules/react").mkdir(parents=True)
+    (first / "node_modules/react/index.js").write_text("module.exports = {};")
+    cache.save(first)
+    cache.prepare(second)
+
+    # Like patch-package, writing to the linked file in place.
+    (second / "node_modules/react/index.js").write_text("module.exports = 1;")
+
+    assert cache.prepare(third).startswith("Dependency cache miss")
+    assert not (third / "node_modules").exists()
+    assert metrics.get("dependency_cache.invalidated") == 1
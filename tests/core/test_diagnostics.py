@@ -0,0 +1,91 @@
+from gpt_all_star.core.diagnostics import (
+    Diagnostic,
+    diagnosed_files,
+    error_signature,
+    error_text,
+    normalize_error,
+    parse_diagnostics,
+)
+
+FILES = ["src/App.jsx", "src/components/TodoList.tsx", "src/index.js", "package.json"]
+LOG = """Failed to compile.
+
+SyntaxError: /tmp/app/src/App.jsx: Unexpected token (12:4)
+  10 |   return (
+
+ERROR in ./src/index.js 3:0-24
+Module not found: Error: Can't resolve './Missing' in '/tmp/app/src'
+
+src/components/TodoList.tsx(8,7): error TS2322: Type 'string' is not assignable to type 'number'.
+
+/tmp/app/src/index.js
+  5:10  error  'foo' is not defined  no-undef
+
+[plugin:vite:import-analysis] Failed to resolve import "./Foo" from "src/App.jsx". Does the file exist?
+http://localhost:3000/src/components/TodoList.tsx?t=1 14:3 "Uncaught TypeError: x is undefined"
+    at TodoList (http://localhost:3000/static/js/bundle.js:120:5)
+npm ERR! code ELIFECYCLE
+npm ERR! errno 1
+"""
+
+
+def test_parse_diagnostics_maps_errors_to_app_files():
+    diagnostics = parse_diagnostics(LOG, "/tmp/app", FILES)
+
+    assert diagnostics == [
+        Diagnostic("babel", "SyntaxError: Unexpected token", "src/App.jsx", 12, 4),
+        Diagnostic(
+            "webpack",
+            "Module not found: Error: Can't resolve './Missing' in '/tmp/app/src'",
+            "src/index.js",
+            3,
+            0,
+        ),
+        Diagnostic(
+            "typescript",
+            "TS2322: Type 'string' is not assignable to type 'number'.",
+            "src/components/TodoList.tsx",
+            8,
+            7,
+        ),
+        Diagnostic("eslint", "'foo' is not defined  no-undef", "src/index.js", 5, 10),
+        Diagnostic("vite", 'Failed to resolve import "./Foo"', "src/App.jsx"),
+        Diagnostic(
+            "browser",
+            '"Uncaught TypeError: x is undefined"',
+            "src/components/TodoList.tsx",
+            14,
+            3,
+        ),
+        Diagnostic("npm", "npm ERR! code ELIFECYCLE"),
+    ]
+    assert diagnosed_files(diagnostics) == [
+        "src/App.jsx",
+        "src/index.js",
+        "src/components/TodoList.tsx",
+    ]
+    assert str(diagnostics[0]) == (
+        "- ./src/App.jsx:12:4 [babel] SyntaxError: Unexpected token"
+    )
+
+
+def test_error_text_unpacks_run_command_errors():
+    error = Exception({"stdout": "compiled", "stderr": "Error: boom"})
+
+    assert error_text(error) == "[stdout]\ncompiled\n[stderr]\nError: boom"
+    assert error_text("plain") == "plain"
+
+
+def test_error_signature_ignores_volatile_parts():
+    first = """12:01:02 PM Compiling...
+Error: listen EADDRINUSE: address already in use 127.0.0.1:3000
+    at /tmp/run-1/app/server.js:10:5 in 120ms"""
+    second = """12:05:59 PM Compiling...
+Error: listen EADDRINUSE: address already in use 127.0.0.1:3001
+    at /tmp/run-2/app/server.js:12:9 in 98ms"""
+
+    assert error_signature(first) == error_signature(second)
+    assert error_signature(first) != error_signature("Error: Cannot find module 'x'")
+    assert normalize_error("http://localhost:5173/src/App.jsx?t=1712 (12:4)") == (
+        "http://localhost:<port>App.jsx"
+    )
@@ -2,7 +2,7 @@ from unittest.mock import patch
 
 import pytest
 
-from gpt_all_star.core.llm import _create_chat_openai
+from gpt_all_star.core.llm import LLM_TYPE, _create_chat_openai, create_embeddings
 
 
 @pytest.fixture
@@ -40,3 +40,20 @@ def test_create_chat_openai_without_base_url(mock_openai, mock_chat_openai):
         client=mock_openai.chat.completions,
         openai_api_base=None,
     )
+
+
+def test_embeddings_follow_the_azure_endpoint(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+    monkeypatch.setenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME", "embeddings")
+    with patch("gpt_all_star.core.llm.AzureOpenAIEmbeddings") as mock:
+        create_embeddings(LLM_TYPE.AZURE)
+
+    assert (
+        mock.call_args.kwargs["azure_endpoint"] == "https://example.openai.azure.com/"
+    )
+    assert mock.call_args.kwargs["azure_deployment"] == "embeddings"
+
+
+def test_anthropic_has_no_embeddings():
+    with pytest.raises(ValueError):
+        create_embeddings(LLM_TYPE.ANTHROPIC)
@@ -0,0 +1,46 @@
+from rich.console import Console
+
+from gpt_all_star.core.output_buffer import (
+    ConsoleBatcher,
+    OutputBuffer,
+    failure_report,
+)
+
+
+def test_buffer_keeps_the_tail_within_line_and_byte_caps():
+    buffer = OutputBuffer(max_lines=3, max_bytes=1000)
+    for index in range(10):
+        buffer.append(f"line {index}")
+
+    assert buffer.lines() == ["line 7", "line 8", "line 9"]
+    assert buffer.tail(2) == "... (8 earlier lines dropped)\nline 8\nline 9"
+
+    buffer = OutputBuffer(max_lines=100, max_bytes=10)
+    buffer.append("12345")
+    buffer.append("67890")
+    assert buffer.lines() == ["67890"]
+
+
+def test_buffer_keeps_evicted_errors_and_spills_every_line(tmp_path):
+    spill_path = tmp_path / "run.log"
+    buffer = OutputBuffer(max_lines=2, spill_path=spill_path)
+    for line in ["Error: first", "ok", "ok again", "TypeError: second", "  at App"]:
+        buffer.append(line)
+    buffer.close()
+
+    assert buffer.errors() == ["Error: first", "TypeError: second\n  at App"]
+    assert spill_path.read_text().splitlines()[0] == "Error: first"
+    assert failure_report({"stderr": buffer}) == {
+        "stderr": "... (3 earlier lines dropped)\nTypeError: second\n  at App",
+        "errors": "Error: first\nTypeError: second\n  at App",
+    }
+
+
+def test_console_batcher_renders_pending_lines_on_close():
+    console = Console(record=True, width=40)
+    batcher = ConsoleBatcher(console, interval=60)
+    batcher.write("[bold]not markup", "green")
+    batcher.write("second", "red")
+    batcher.close()
+
+    assert console.export_text() == "[bold]not markup\nsecond\n"
@@ -0,0 +1,63 @@
+import os
+import signal
+import socket
+import subprocess
+
+import pytest
+
+from gpt_all_star.core import ports as ports_module
+from gpt_all_star.core.ports import (
+    PortRegistry,
+    PortsExhaustedError,
+    parse_port_range,
+)
+
+
+def _free_range(size):
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        start = sock.getsockname()[1]
+    return range(start, start + size)
+
+
+def test_parse_port_range():
+    assert parse_port_range("3000-3002") == range(3000, 3003)
+    assert parse_port_range("8080") == range(8080, 8081)
+
+
+def test_leases_distinct_ports_and_skips_bound_ones():
+    ports = _free_range(3)
+    registry = PortRegistry(ports)
+    with socket.socket() as sock:
+        sock.bind(("localhost", ports[0]))
+        first = registry.lease()
+        second = registry.lease()
+        with pytest.raises(PortsExhaustedError):
+            registry.lease()
+    assert {first, second} == {ports[1], ports[2]}
+
+    registry.release(first)
+    assert registry.lease() == ports[0]
+    assert registry.lease() == first
+
+
+def test_backend_default_ports_are_leased_last(monkeypatch):
+    ports = _free_range(3)
+    monkeypatch.setattr(ports_module, "BACKEND_DEFAULT_PORTS", [ports[0]])
+    registry = PortRegistry(ports)
+
+    assert [registry.lease() for _ in ports] == [ports[1], ports[2], ports[0]]
+
+
+def test_frees_ports_when_process_group_exits():
+    registry = PortRegistry(_free_range(1))
+    port = registry.lease()
+    process = subprocess.Popen(["sleep", "30"], preexec_fn=os.setsid)
+    registry.attach(port, process.pid)
+    assert registry.leased() == {port: process.pid}
+
+    os.killpg(process.pid, signal.SIGTERM)
+    process.wait()
+
+    assert registry.leased() == {}
+    assert registry.lease() == port
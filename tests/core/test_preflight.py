@@ -0,0 +1,148 @@
+import json
+
+import pytest
+
+from gpt_all_star.core.execution.execution import Execution
+from gpt_all_star.core.preflight import (
+    PreflightError,
+    blocking,
+    package_name,
+    run_preflight,
+)
+from gpt_all_star.core.storage import Storage, Storages
+
+
+@pytest.fixture
+def storages(tmp_path):
+    app = tmp_path / "app"
+    (app / "src" / "components").mkdir(parents=True)
+    (app / "src" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff\xfe")
+    (app / "package.json").write_text(
+        json.dumps(
+            {
+                "dependencies": {"react": "^18.2.0"},
+                "devDependencies": {"@vitejs/plugin-react": "^4.0.0"},
+            }
+        )
+    )
+    (app / "src" / "App.jsx").write_text(
+        """import React from "react";
+import fs from "node:fs";
+import logo from "./logo.png";
+import Header from "./components/Header";
+import "@/styles.css";
+
+export default function App() {
+  return <Header logo={logo} />;
+}
+"""
+    )
+    (app / "src" / "components" / "Header.jsx").write_text(
+        """export default function Header({ logo }) {
+  return <img src={logo} />;
+}
+"""
+    )
+    return Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(app),
+        archive=Storage(tmp_path / ".archive"),
+    )
+
+
+def test_package_name():
+    assert package_name("react-dom/client") == "react-dom"
+    assert package_name("@mui/material/Button") == "@mui/material"
+    assert package_name("path") is None
+    assert package_name("node:fs") is None
+    assert package_name("./App") is None
+    assert package_name("~/utils") is None
+    for builtin in ["module", "async_hooks", "tty", "inspector", "repl", "fs/promises"]:
+        assert package_name(builtin) is None
+
+
+def test_clean_app_has_no_problems(storages):
+    assert run_preflight(storages) == []
+
+
+def test_reports_syntax_import_dependency_and_export_problems(storages):
+    (storages.app.path / "src" / "components" / "Header.jsx").write_text(
+        """import axios from "axios";
+import { useTodos } from "../hooks/useTodos";
+
+export default function Header() {
+  return <div>;
+}
+"""
+    )
+    (storages.app.path / "src" / "index.js").write_text(
+        """const a = 1;
+export default a;
+export { a as default };
+"""
+    )
+
+    problems = {(d.source, d.file) for d in run_preflight(storages)}
+
+    assert problems == {
+        ("syntax", "src/components/Header.jsx"),
+        ("dependency", "src/components/Header.jsx"),
+        ("import", "src/components/Header.jsx"),
+        ("export", "src/index.js"),
+    }
+
+
+def test_preflight_error_carries_diagnostics(storages):
+    (storages.app.path / "src" / "App.jsx").write_text("import x from './missing';\n")
+    diagnostics = run_preflight(storages)
+
+    error = PreflightError(diagnostics)
+
+    assert error.diagnostics == diagnostics
+    assert (
+        "./src/App.jsx:1 [import] Cannot resolve './missing'"
+        in error.args[0]["preflight"]
+    )
+
+
+class FakeCopilot:
+    def __init__(self, storages):
+        self.storages = storages
+        self.states = []
+
+    def state(self, text):
+        self.states.append(text)
+
+
+def _execution(storages):
+    execution = Execution.__new__(Execution)
+    execution.copilot = FakeCopilot(storages)
+    execution.preflight = True
+    execution._preflight_signature = None
+    execution._ = lambda message: message
+    return execution
+
+
+def test_syntax_findings_do_not_stop_the_app(storages):
+    (storages.app.path / "src" / "data.js").write_text(
+        "import data from './data.json' with { type: 'json' };\nexport default data;\n"
+    )
+    (storages.app.path / "src" / "data.json").write_text("{}")
+
+    diagnostics = _execution(storages)._check_before_running()
+
+    assert [d.source for d in diagnostics] == ["syntax"]
+    assert blocking(diagnostics) == []
+
+
+def test_problems_a_heal_left_unchanged_no_longer_block(storages):
+    (storages.app.path / "src" / "api.js").write_text("import axios from 'axios';\n")
+    execution = _execution(storages)
+
+    with pytest.raises(PreflightError):
+        execution._check_before_running()
+    diagnostics = execution._check_before_running()
+
+    assert [d.source for d in diagnostics] == ["dependency"]
+    assert "running the application anyway" in execution.copilot.states[-1]
@@ -0,0 +1,82 @@
+import os
+import time
+
+import pytest
+
+from gpt_all_star.core.process_supervisor import (
+    ProcessLostError,
+    ProcessSupervisor,
+    ResourceLimits,
+)
+
+
+def test_run_returns_output_and_usage(tmp_path):
+    supervisor = ProcessSupervisor(ResourceLimits())
+
+    result = supervisor.run("echo out; echo err >&2; exit 3", tmp_path)
+
+    assert (result.returncode, result.stdout, result.stderr) == (3, "out\n", "err\n")
+    assert result.usage.peak_rss_bytes > 0
+    assert result.usage.cpu_seconds >= 0
+
+
+def test_applies_resource_limits(tmp_path):
+    supervisor = ProcessSupervisor(ResourceLimits(cpu_seconds=60, open_files=64))
+
+    result = supervisor.run("ulimit -n; ulimit -t", tmp_path)
+
+    assert result.stdout.split() == ["64", "60"]
+
+
+def test_app_processes_get_no_cpu_limit_by_default(tmp_path, monkeypatch):
+    monkeypatch.delenv("APP_MAX_CPU_SECONDS", raising=False)
+    supervisor = ProcessSupervisor(ResourceLimits(cpu_seconds=60))
+
+    process = supervisor.spawn("ulimit -t", tmp_path, limits=supervisor.app_limits)
+    process.wait(5)
+
+    assert supervisor.app_limits.cpu_seconds is None
+    assert process.stdout.read().strip() == "unlimited"
+
+
+def test_unknown_exit_status_is_not_success(tmp_path):
+    supervisor = ProcessSupervisor(ResourceLimits())
+    process = supervisor.spawn("exit 0", tmp_path)
+    os.waitpid(process.pid, 0)
+
+    with pytest.raises(ProcessLostError):
+        process.wait(5)
+
+    assert process.returncode is None
+    assert process.terminate() is None
+    assert supervisor.running() == []
+
+
+def test_timeout_stops_the_process_tree(tmp_path):
+    supervisor = ProcessSupervisor(ResourceLimits())
+    started = time.monotonic()
+
+    result = supervisor.run(
+        "sleep 30 & echo $! > child.pid; sleep 30", tmp_path, timeout=0.5
+    )
+
+    assert result.returncode is None
+    assert time.monotonic() - started < 10
+    child = int((tmp_path / "child.pid").read_text())
+    time.sleep(0.1)
+    assert (
+        not os.path.exists(f"/proc/{child}")
+        or "Z" in open(f"/proc/{child}/stat").read().split()[2]
+    )
+
+
+def test_terminate_stops_a_spawned_process(tmp_path):
+    supervisor = ProcessSupervisor(ResourceLimits())
+    process = supervisor.spawn("sleep 30", tmp_path)
+    assert supervisor.running() == [process]
+
+    process.terminate()
+
+    assert process.returncode is not None
+    assert process.usage is not None
+    assert supervisor.running() == []
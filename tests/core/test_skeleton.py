@@ -0,0 +1,60 @@
+from gpt_all_star.core.skeleton import skeletonize
+
+COMPONENT = """import React, { useState } from "react";
+import PropTypes from "prop-types";
+
+type Props = { title: string; items: Item[] };
+
+export const TodoList = ({ title, items }: Props) => {
+  const [count, setCount] = useState(0);
+  return <ul>{items.map((item) => <li key={item.id}>{item.title}</li>)}</ul>;
+};
+
+TodoList.propTypes = { title: PropTypes.string.isRequired, items: PropTypes.arrayOf(PropTypes.object).isRequired };
+
+export const add = (a, b) => a + b;
+export default class Store {
+  load(id: string): Promise<Item> {
+    return fetch(`/api/${id}`).then((response) => response.json());
+  }
+}
+"""
+
+
+def test_skeletonize_keeps_api_surface_of_component():
+    skeleton = skeletonize("src/TodoList.tsx", COMPONENT)
+
+    assert 'import React, { useState } from "react";' in skeleton
+    assert "type Props = { title: string; items: Item[] };" in skeleton
+    assert "export const TodoList = ({ title, items }: Props) => { ... };" in skeleton
+    assert "PropTypes.string.isRequired" in skeleton
+    assert "export const add = (a, b) => a + b;" in skeleton
+    assert "load(id: string): Promise<Item> { ... }" in skeleton
+    assert "useState(0)" not in skeleton
+
+
+def test_skeletonize_python_and_css():
+    python = (
+        "class Service:\n    def get(self, key: str) -> int:\n        return int(key)\n"
+    )
+    assert skeletonize("service.py", python) == (
+        "class Service:\n    def get(self, key: str) -> int:\n        ...\n"
+    )
+    assert skeletonize("App.css", ".app { color: red; }\n") == ".app { ... }\n"
+
+
+def test_skeletonize_elides_long_literals():
+    skeleton = skeletonize(
+        "data.js", f"export const ITEMS = [{', '.join(['1'] * 100)}];\n"
+    )
+
+    assert skeleton == "export const ITEMS = [...];\n"
+
+
+def test_skeletonize_falls_back_to_first_lines():
+    text = "\n".join(f"line {i}" for i in range(100))
+
+    skeleton = skeletonize("README.md", text)
+
+    assert skeleton.splitlines()[-1] == "... (20 more lines)"
+    assert skeletonize("broken.js", "const = (;\n") == "const = (;\n"
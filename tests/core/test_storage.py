@@ -0,0 +1,102 @@
+import pytest
+
+from gpt_all_star.core import storage as storage_module
+from gpt_all_star.core.storage import Storage, Storages
+
+
+@pytest.fixture
+def storages(tmp_path):
+    return Storages(
+        root=Storage(tmp_path),
+        docs=Storage(tmp_path / "docs"),
+        app=Storage(tmp_path / "app"),
+        archive=Storage(tmp_path / ".archive"),
+    )
+
+
+def _install(storages, package_json='{"dependencies": {"react": "^18.2.0"}}'):
+    storages.app["package.json"] = package_json
+    storages.app["node_modules/react/index.js"] = "module.exports = {};"
+
+
+def test_restore_dependencies_from_matching_archive(storages):
+    _install(storages)
+    storages.archive_storage()
+    storages.app["package.json"] = '{"dependencies": {"react": "^18.2.0"}}'
+
+    decision = storages.restore_dependencies()
+
+    assert decision.startswith("Restored node_modules")
+    restored = storages.app.path / "node_modules/react/index.js"
+    assert restored.read_text() == "module.exports = {};"
+
+
+def test_archive_keeps_the_vector_index(storages):
+    (storages.root.path / ".llama_index").mkdir()
+    (storages.root.path / ".llama_index" / "manifest.json").write_text("{}")
+    storages.app["index.js"] = "console.log('hello');"
+
+    storages.archive_storage()
+
+    assert (storages.root.path / ".llama_index" / "manifest.json").is_file()
+    assert "index.js" not in storages.app
+
+
+def test_restore_dependencies_skips_changed_manifest(storages):
+    _install(storages)
+    storages.archive_storage()
+    storages.app["package.json"] = '{"dependencies": {"vue": "^3.0.0"}}'
+
+    decision = storages.restore_dependencies()
+
+    assert decision.startswith("No archived node_modules")
+    assert not (storages.app.path / "node_modules").exists()
+
+
+def test_restore_dependencies_respects_clean_install(storages):
+    _install(storages)
+    storages.archive_storage()
+    storages.app["package.json"] = '{"dependencies": {"react": "^18.2.0"}}'
+    storages.clean_install = True
+
+    decision = storages.restore_dependencies()
+
+    assert decision.startswith("Clean install requested")
+    assert not (storages.app.path / "node_modules").exists()
+
+
+def test_relevant_source_code_follows_import_graph_of_target(storages):
+    storages.app["src/App.jsx"] = 'import Header from "./Header";\n'
+    storages.app["src/Header.jsx"] = "export default function Header() {}\n"
+    storages.app["src/Unrelated.jsx"] = "export const Unrelated = 1;\n"
+
+    source_code = storages.relevant_source_code(
+        "Add a title", target="Read and Overwrite an existing file: ./src/Header.jsx"
+    )
+
+    assert "export default function Header() {}" in source_code
+    assert 'import Header from "./Header";' in source_code
+    assert "- ./src/Unrelated.jsx: exports Unrelated" in source_code
+    assert "export const Unrelated = 1;" not in source_code
+
+
+def test_current_source_code_renders_skeletons(storages):
+    storages.app["src/App.jsx"] = "export default function App() {\n  return null;\n}\n"
+
+    source_code = storages.current_source_code(skeleton=True)
+
+    assert "./src/App.jsx (skeleton" in source_code
+    assert "export default function App() { ... }" in source_code
+    assert "return null;" not in source_code
+
+
+def test_overview_falls_back_to_skeletons_for_large_apps(storages, monkeypatch):
+    storages.app["src/App.jsx"] = "export default function App() {\n  return null;\n}\n"
+    assert "return null;" in storages.overview_source_code()
+
+    monkeypatch.setattr(storage_module, "FULL_SOURCE_CODE_LIMIT", 10)
+    source_code = storages.overview_source_code()
+
+    assert source_code.startswith("The application is too large to show in full")
+    assert "export default function App() { ... }" in source_code
+    assert "return null;" not in source_code
@@ -0,0 +1,90 @@
+import pytest
+
+from gpt_all_star.core.symbol_index import SymbolIndex
+
+
+@pytest.fixture
+def app(tmp_path):
+    (tmp_path / "src/components").mkdir(parents=True)
+    (tmp_path / "src/hooks").mkdir()
+    (tmp_path / "src/App.jsx").write_text(
+        """import React from "react";
+import { Route, Routes } from "react-router-dom";
+import TodoList from "./components/TodoList";
+
+export default function App() {
+  return (
+    <Routes>
+      <Route path="/todos" element={<TodoList />} />
+    </Routes>
+  );
+}
+"""
+    )
+    (tmp_path / "src/components/TodoList.jsx").write_text(
+        """import { useTodos } from "../hooks/useTodos";
+
+const TodoList = () => {
+  const todos = useTodos();
+  return <ul>{todos.map((todo) => <li key={todo.id}>{todo.title}</li>)}</ul>;
+};
+
+export default TodoList;
+"""
+    )
+    (tmp_path / "src/hooks/useTodos.ts").write_text(
+        "export const useTodos = (): Todo[] => [];\n"
+    )
+    return tmp_path
+
+
+def test_import_graph(app):
+    index = SymbolIndex(app)
+
+    assert index.imports_of("src/App.jsx") == {"src/components/TodoList.jsx"}
+    assert index.importers_of("src/hooks/useTodos.ts") == {
+        "src/components/TodoList.jsx"
+    }
+
+
+def test_find_reports_definition_imports_and_usages(app):
+    result = SymbolIndex(app).find("TodoList")
+
+    assert "./src/components/TodoList.jsx:3 (exported)" in result
+    assert "./src/App.jsx:3 from ./src/components/TodoList.jsx" in result
+    assert "Rendered in:\n- ./src/App.jsx:8" in result
+
+
+def test_find_route_and_refresh_after_write(app):
+    index = SymbolIndex(app)
+    assert "Route declared in:\n- ./src/App.jsx:8" in index.find("/todos")
+    assert "was not found" in index.find("useTodoFilter")
+
+    (app / "src/hooks/useTodoFilter.js").write_text(
+        "export function useTodoFilter() {}\n"
+    )
+
+    assert "./src/hooks/useTodoFilter.js:1 (exported)" in index.find("useTodoFilter")
+
+
+def test_mentioned_files_and_neighbourhood(app):
+    (app / "package.json").write_text('{"name": "todo"}')
+    (app / "src/components/Footer.jsx").write_text(
+        "export const Footer = () => null;\n"
+    )
+    index = SymbolIndex(app)
+
+    targets = index.mentioned_files(
+        "Read and Overwrite an existing file: ./src/components/TodoList.jsx"
+    )
+    assert targets == ["src/components/TodoList.jsx"]
+    assert index.mentioned_files("useTodos.ts(a directory follows)") == [
+        "src/hooks/useTodos.ts"
+    ]
+
+    assert index.neighbourhood(targets) == [
+        "src/components/TodoList.jsx",
+        "src/hooks/useTodos.ts",
+        "src/App.jsx",
+        "package.json",
+    ]
@@ -0,0 +1,75 @@
+import pytest
+from langchain_core.documents import Document
+
+from gpt_all_star.core.tools.document_chunker import CodeSplitter, DocumentChunker
+
+FUNCTIONS = "\n\n".join(
+    f"def function_{i}():\n    return '{'x' * 40}'" for i in range(20)
+)
+
+
+def test_split_text_covers_the_whole_file_without_overlap():
+    splitter = CodeSplitter(language="python", chunk_lines_overlap=0, max_chars=200)
+
+    chunks = splitter.split_text(FUNCTIONS)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert "".join(chunks).replace("\n", "") == FUNCTIONS.replace("\n", "")
+
+
+def test_split_text_with_lines_prepends_overlapping_lines():
+    splitter = CodeSplitter(language="python", chunk_lines_overlap=2, max_chars=200)
+
+    chunks = splitter.split_text_with_lines(FUNCTIONS)
+
+    first_end_line, second_start_line = chunks[0][1], chunks[1][0]
+    assert second_start_line <= first_end_line
+    previous_lines = FUNCTIONS.splitlines()[second_start_line - 1 : first_end_line]
+    assert chunks[1][2].startswith("\n".join(previous_lines))
+
+
+def test_split_text_handles_multibyte_characters():
+    code = "\n\n".join(f"const label{i} = 'こんにちは{i}';" for i in range(50))
+    splitter = CodeSplitter(language="javascript", chunk_lines_overlap=0, max_chars=300)
+
+    chunks = splitter.split_text(code)
+
+    assert "".join(chunks).replace("\n", "") == code.replace("\n", "")
+
+
+def test_chunk_documents_only_returns_code_files():
+    documents = [
+        Document(page_content=FUNCTIONS, metadata={"filename": "app.py"}),
+        Document(page_content="# Title", metadata={"filename": "README.md"}),
+    ]
+
+    chunks = DocumentChunker.chunk_documents(documents)
+
+    assert chunks
+    assert all(chunk.metadata["filename"] == "app.py" for chunk in chunks)
+
+
+@pytest.mark.parametrize(
+    "filename, code",
+    [
+        ("App.jsx", "export default function App() {\n  return <Box>Hi</Box>;\n}\n"),
+        (
+            "api.ts",
+            "export const get = (id: number): Promise<Todo> => fetch(`/${id}`);\n",
+        ),
+        (
+            "Todo.tsx",
+            "export const Todo = ({ title }: Props) => <Text>{title}</Text>;\n",
+        ),
+        ("index.css", "body {\n  margin: 0;\n}\n"),
+        ("index.html", "<html><body><div id='root'></div></body></html>\n"),
+    ],
+)
+def test_chunk_documents_splits_web_languages(filename, code):
+    documents = [Document(page_content=code, metadata={"filename": filename})]
+
+    chunks = DocumentChunker.chunk_documents(documents)
+
+    assert [chunk.page_content for chunk in chunks] == [code.strip()]
+    assert chunks[0].metadata["is_code"] is True
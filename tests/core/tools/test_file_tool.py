@@ -0,0 +1,138 @@
+import pytest
+
+from gpt_all_star.core.tools.file_tool import (
+    EditFileTool,
+    GrepTool,
+    ReadFilesTool,
+    TreeTool,
+)
+
+APP = """import React from "react";
+
+export default function App() {
+  return (
+    <div>
+      <h1>Todo</h1>
+    </div>
+  );
+}
+"""
+
+
+@pytest.fixture
+def tool(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/App.jsx").write_text(APP)
+    (tmp_path / "src/index.js").write_text('import App from "./App";\n')
+    return EditFileTool(root_dir=str(tmp_path))
+
+
+def test_search_replace_tolerates_indentation(tool, tmp_path):
+    result = tool.run(
+        {
+            "edits": [
+                {
+                    "file_path": "src/App.jsx",
+                    "search": "<h1>Todo</h1>",
+                    "replace": "<h1>Todo</h1>\n<p>Things to do</p>",
+                }
+            ]
+        }
+    )
+
+    assert result == "Edited src/App.jsx"
+    assert (
+        "      <h1>Todo</h1>\n      <p>Things to do</p>\n"
+        in (tmp_path / "src/App.jsx").read_text()
+    )
+
+
+def test_unified_diff_across_files_with_fuzzy_context(tool, tmp_path):
+    diff = """--- a/src/App.jsx
++++ b/src/App.jsx
+@@ -4,3 +4,3 @@
+   return (
+     <div>
+-      <h1>Todos</h1>
++      <h1>My Todo</h1>
+--- /dev/null
++++ b/src/components/Footer.jsx
+@@ -0,0 +1 @@
++export const Footer = () => null;
+"""
+
+    result = tool.run({"diff": diff})
+
+    assert result == "Edited src/App.jsx\nEdited src/components/Footer.jsx"
+    assert "<h1>My Todo</h1>" in (tmp_path / "src/App.jsx").read_text()
+    assert (tmp_path / "src/components/Footer.jsx").read_text() == (
+        "export const Footer = () => null;\n"
+    )
+
+
+def test_conflict_changes_no_file(tool, tmp_path):
+    result = tool.run(
+        {
+            "edits": [
+                {"file_path": "src/index.js", "search": "./App", "replace": "./Main"},
+                {
+                    "file_path": "src/App.jsx",
+                    "search": "<section>",
+                    "replace": "<main>",
+                },
+            ]
+        }
+    )
+
+    assert result.startswith("Error: no file was changed, src/App.jsx")
+    assert "closest lines" in result
+    assert (tmp_path / "src/index.js").read_text() == 'import App from "./App";\n'
+
+
+def test_ambiguous_block_is_reported(tool):
+    result = tool.run(
+        {"edits": [{"file_path": "src/App.jsx", "search": "    </div>\n  );\n}\n"}]}
+    )
+    assert result == "Edited src/App.jsx"
+
+    result = tool.run({"edits": [{"file_path": "src/App.jsx", "search": "  )"}]})
+    assert "Error" in result
+
+    result = tool.run({"edits": [{"file_path": "../outside.js", "replace": "x"}]})
+    assert result.startswith("Error: Path ../outside.js is outside")
+
+
+def test_read_files_tree_and_grep(tool, tmp_path):
+    for artifact in ["node_modules/react", ".workspaces/1a2b3c4d/src", ".logs"]:
+        (tmp_path / artifact).mkdir(parents=True)
+        (tmp_path / artifact / "index.js").write_text("import App from './App';\n")
+    read_files = ReadFilesTool(root_dir=str(tmp_path))
+    tree = TreeTool(root_dir=str(tmp_path))
+    grep = GrepTool(root_dir=str(tmp_path))
+
+    result = read_files.run({"file_paths": ["src/App.jsx", "src/missing.js"]})
+    assert "<h1>Todo</h1>" in result
+    assert "Error: src/missing.js" in result
+
+    assert tree.run({}) == (
+        f"src/\n  App.jsx ({len(APP)} bytes)\n  index.js (25 bytes)"
+    )
+
+    result = grep.run({"pattern": r"App\b", "context": 1})
+    assert result == (
+        "src/App.jsx-2- \n"
+        "src/App.jsx:3: export default function App() {\n"
+        "src/App.jsx-4-   return (\n"
+        "--\n"
+        'src/index.js:1: import App from "./App";'
+    )
+    assert grep.run({"pattern": "("}).startswith("Error: invalid pattern")
+
+
+def test_tree_reflects_new_files(tool, tmp_path):
+    tree = TreeTool(root_dir=str(tmp_path))
+    assert "Footer.jsx" not in tree.run({})
+
+    (tmp_path / "src/Footer.jsx").write_text("export const Footer = () => null;\n")
+
+    assert "Footer.jsx (34 bytes)" in tree.run({"dir_path": "src"})
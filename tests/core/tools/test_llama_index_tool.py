@@ -0,0 +1,73 @@
+from llama_index.core.embeddings import MockEmbedding
+
+from gpt_all_star.core.tools import llama_index_tool
+from gpt_all_star.core.tools.llama_index_tool import (
+    PersistentCodeIndex,
+    embeddings_available,
+)
+
+EMBEDDED: list[str] = []
+
+
+class RecordingEmbedding(MockEmbedding):
+    def _get_text_embedding(self, text: str) -> list[float]:
+        EMBEDDED.append(text)
+        return super()._get_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        EMBEDDED.extend(texts)
+        return super()._get_text_embeddings(texts)
+
+
+def _index(tmp_path):
+    return PersistentCodeIndex(
+        tmp_path / "app",
+        tmp_path / ".llama_index",
+        embed_model=RecordingEmbedding(embed_dim=8),
+    )
+
+
+def _indexed_files(index):
+    return set(index._index.ref_doc_info)
+
+
+def test_only_changed_files_are_embedded(tmp_path):
+    app = tmp_path / "app"
+    app.mkdir()
+    (app / "App.js").write_text("export const App = () => 'todo';\n")
+    (app / "api.js").write_text("export const fetchTodos = () => [];\n")
+    EMBEDDED.clear()
+
+    assert _index(tmp_path).refresh() == 2
+    assert any("fetchTodos" in text for text in EMBEDDED)
+
+    # A new index loads the persisted one and embeds nothing unchanged.
+    EMBEDDED.clear()
+    index = _index(tmp_path)
+    assert index.refresh() == 0
+    assert EMBEDDED == []
+
+    (app / "App.js").write_text("export const App = () => 'done';\n")
+    assert index.refresh() == 1
+    assert EMBEDDED and all("done" in text for text in EMBEDDED)
+
+    (app / "api.js").unlink()
+    assert index.refresh() == 1
+    assert _indexed_files(index) == {"App.js"}
+    reloaded = _index(tmp_path)
+    assert reloaded.refresh() == 0
+    assert _indexed_files(reloaded) == {"App.js"}
+
+
+def test_offline_embeddings_need_the_huggingface_package(monkeypatch):
+    monkeypatch.setenv("LLAMA_INDEX_EMBED_MODEL", "default")
+    monkeypatch.setenv("ENDPOINT", "OPENAI")
+    assert embeddings_available()
+
+    monkeypatch.setenv("ENDPOINT", "ANTHROPIC")
+    monkeypatch.setattr(llama_index_tool, "LOCAL_EMBEDDINGS_MODULE", "json")
+    assert embeddings_available()
+    monkeypatch.setattr(
+        llama_index_tool, "LOCAL_EMBEDDINGS_MODULE", "llama_index.missing.package"
+    )
+    assert not embeddings_available()
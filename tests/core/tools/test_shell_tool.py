@@ -0,0 +1,31 @@
+from gpt_all_star.core.tools.shell_tool import ShellTool
+
+
+def test_failed_command_returns_summary_and_log_path(tmp_path):
+    tool = ShellTool(root_dir=str(tmp_path))
+
+    result = tool.run({"commands": ["echo compiling; echo 'Error: boom' >&2; exit 2"]})
+
+    assert result.startswith("Command failed with exit code 2.")
+    assert "Error: boom" in result
+    log_path = result.rsplit("Full log: ", 1)[1]
+    assert log_path.startswith(str(tmp_path / ".logs"))
+    assert "[stderr]\nError: boom" in open(log_path).read()
+
+
+def test_successful_command_returns_output(tmp_path):
+    tool = ShellTool(root_dir=str(tmp_path))
+
+    assert tool.run({"commands": ["echo hello"]}) == "hello\n"
+    assert not (tmp_path / ".logs").exists()
+
+
+def test_cleaned_output_is_not_reported_as_shortened(tmp_path):
+    tool = ShellTool(root_dir=str(tmp_path))
+
+    result = tool.run(
+        {"commands": ["printf '\\033[32mok\\033[0m\\nstep\\nstep\\nstep\\n'"]}
+    )
+
+    assert result == "ok\nstep\n(previous line repeated 2 more times)"
+    assert not (tmp_path / ".logs").exists()
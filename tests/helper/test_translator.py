@@ -0,0 +1,32 @@
+import ast
+import gettext
+from pathlib import Path
+
+LOCALE_DIR = Path(__file__).parents[2] / "gpt_all_star" / "locales" / "ja_JP"
+
+
+def _msgids(po: Path) -> list[str]:
+    msgids = []
+    in_msgid = False
+    for line in po.read_text(encoding="utf-8").splitlines():
+        if line.startswith("msgid "):
+            msgids.append(ast.literal_eval(line[len("msgid ") :]))
+            in_msgid = True
+        elif line.startswith('"') and in_msgid:
+            msgids[-1] += ast.literal_eval(line)
+        else:
+            in_msgid = False
+    return [msgid for msgid in msgids if msgid]
+
+
+def test_compiled_catalog_is_up_to_date():
+    with open(LOCALE_DIR / "LC_MESSAGES" / "messages.mo", "rb") as file:
+        catalog = gettext.GNUTranslations(file)
+
+    untranslated = [
+        msgid
+        for msgid in _msgids(LOCALE_DIR / "ja.po")
+        if catalog.gettext(msgid) == msgid
+    ]
+
+    assert untranslated == []